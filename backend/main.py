@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from backend.routes.upload import router as upload_router
@@ -7,8 +8,20 @@ from backend.routes.auto_dashboard import router as auto_router
 from backend.routes.quickchart import router as qc_router
 from backend.routes.summary import router as summary_router
 from backend.routes.tts import router as tts_router
+from backend.routes.system import router as system_router
+from backend.routes.jobs import router as jobs_router
+from backend.utils.executors import shutdown_pools
+from backend.utils.job_queue import job_queue
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Stop the job workers and CPU / I/O pools with the server
+    job_queue.shutdown()
+    shutdown_pools()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # CORS FIX
 app.add_middleware(
@@ -30,6 +43,9 @@ app.include_router(auto_router, prefix="/api")
 app.include_router(qc_router, prefix="/api")
 app.include_router(summary_router, prefix="/api")
 app.include_router(tts_router, prefix="/api")
+app.include_router(system_router, prefix="/api")
+app.include_router(jobs_router, prefix="/api")
+
 
 @app.get("/")
 def home():
@@ -6,6 +6,8 @@ from backend.utils.quickchart_builder import build_quickchart_url
 from backend.utils.dashboard_composer import compose_dashboard_from_urls
 from backend.utils.pdf_exporter import export_pdf
 from backend.utils.bi_exporter import export_csv_from_preview, powerbi_theme_json
+from backend.utils.dataset_store import dataset_store, resolve_frame
+from backend.utils.job_queue import job_queue, track_stage
 import json
 import os
 import base64
@@ -13,16 +15,25 @@ import base64
 router = APIRouter()
 
 class AutoRequest(BaseModel):
-    preview: List[Dict[str, Any]]
+    preview: Optional[List[Dict[str, Any]]] = None
+    dataset_id: Optional[str] = None
     theme_id: str = "minimal_white"
     title: str = "Insightify Auto Dashboard"
     user_id: Optional[str] = None
+    async_job: bool = False
 
-@router.post("/auto-dashboard")
-def auto_dashboard(req: AutoRequest):
-    try:
+
+AUTO_DASHBOARD_STAGES = ["plan_charts", "compose", "pdf", "exports"]
+
+
+def build_auto_dashboard(ctx, df, req: AutoRequest) -> Dict[str, Any]:
+    """
+    Charts → dashboard PNG → PDF → CSV / Power BI exports.
+    `ctx` is the job context in background mode, None otherwise.
+    """
+    with track_stage(ctx, "plan_charts"):
         # 1. Plan charts
-        plan = plan_charts_from_preview(req.preview, max_charts=4)
+        plan = plan_charts_from_preview(df, max_charts=4, profile=dataset_store.get_profile(req.dataset_id))
 
         # 2. Load theme file
         themes_file = os.path.join(os.path.dirname(__file__), "../themes/themes.json")
@@ -57,15 +68,21 @@ def auto_dashboard(req: AutoRequest):
                 chart_urls.append(url)
                 charts_meta.append({"url": url, "spec": item, "type": item.get("chart_type"), "title": item.get("description")})
 
+    with track_stage(ctx, "compose"):
         # 3. Compose dashboard image
         dashboard_buf = compose_dashboard_from_urls(chart_urls, title=req.title)
 
+    with track_stage(ctx, "pdf"):
         # 4. PDF export
         summary_text = "Auto-generated by Insightify"
         pdf_buf = export_pdf(req.title, summary_text, chart_urls, dashboard_buf)
 
+    with track_stage(ctx, "exports"):
         # 5. CSV export
-        csv_bytes = export_csv_from_preview(req.preview)
+        if req.dataset_id:
+            csv_bytes = df.to_csv(index=False).encode("utf-8") if not df.empty else None
+        else:
+            csv_bytes = export_csv_from_preview(req.preview)
 
         # 6. Power BI theme JSON
         theme_json = powerbi_theme_json(theme)
@@ -75,14 +92,30 @@ def auto_dashboard(req: AutoRequest):
         pdf_b64 = base64.b64encode(pdf_buf.getvalue()).decode("utf-8")
         csv_b64 = base64.b64encode(csv_bytes).decode("utf-8") if csv_bytes else None
 
-        return {
-            "theme": theme,
-            "charts": charts_meta,
-            "dashboard_png_b64": dash_b64,
-            "pdf_b64": pdf_b64,
-            "csv_b64": csv_b64,
-            "powerbi_theme_json": theme_json,
-        }
+    return {
+        "theme": theme,
+        "charts": charts_meta,
+        "dashboard_png_b64": dash_b64,
+        "pdf_b64": pdf_b64,
+        "csv_b64": csv_b64,
+        "powerbi_theme_json": theme_json,
+    }
+
+
+@router.post("/auto-dashboard")
+def auto_dashboard(req: AutoRequest):
+    try:
+        try:
+            df = resolve_frame(req.dataset_id, req.preview)
+        except KeyError:
+            return {"error": True, "message": "Unknown dataset_id. Please upload the dataset again."}
+
+        if req.async_job:
+            # Poll /api/jobs/{job_id}; the result has the same shape as below
+            job = job_queue.submit("auto_dashboard", AUTO_DASHBOARD_STAGES, build_auto_dashboard, df, req)
+            return {"job_id": job.id, "status": job.status, "stages": AUTO_DASHBOARD_STAGES}
+
+        return build_auto_dashboard(None, df, req)
 
     except Exception as e:
         return {"error": True, "message": str(e)}
@@ -3,25 +3,38 @@ from backend.utils.ai_chat_engine import answer_query
 from backend.utils.voice_synthesis import generate_speech
 from backend.utils.chart_planner import plan_charts_from_preview
 from backend.utils.quickchart_builder import build_quickchart_url
-import pandas as pd
-import numpy as np
+from backend.utils.dataset_store import dataset_store, resolve_frame, is_valid_dataset_id
+from backend.utils.column_profile import profile_for
+from backend.utils.executors import run_cpu, run_io
+from backend.utils.query_engine import route_question
+from backend.utils.answer_cache import answer_cache
 import json
 import os
 
 router = APIRouter()
 
-# Keywords that indicate user wants charts
-CHART_KEYWORDS = [
-    "chart", "graph", "plot", "bar chart", "pie chart", "line chart",
-    "dashboard", "visualize", "visualization", "show me", "create a",
-    "generate", "make a", "build a"
-]
+def _dataset_id_only(payload: dict):
+    """
+    `/suggest` takes the column dict itself as its body, so a
+    stored dataset is requested as `{"dataset_id": "<id>"}`.
+    """
+    if len(payload) == 1 and is_valid_dataset_id(payload.get("dataset_id")):
+        return payload["dataset_id"]
+    return None
+
 
 @router.post("/suggest")
 async def suggest(df_json: dict):
-    df = pd.DataFrame(df_json)
-    numeric = df.select_dtypes(include=[np.number]).columns.tolist()
-    non_numeric = df.select_dtypes(exclude=[np.number]).columns.tolist()
+    dataset_id = _dataset_id_only(df_json)
+    try:
+        # May read a spilled dataset back from disk
+        df = await run_io(resolve_frame, dataset_id, None if dataset_id else df_json)
+    except KeyError:
+        return {"error": "Unknown dataset_id. Please upload the dataset again."}
+
+    profile = profile_for(df, dataset_store.get_profile(dataset_id))
+    numeric = profile["numeric_columns"]
+    non_numeric = profile["categorical_columns"]
 
     suggestions = []
     if numeric and non_numeric:
@@ -41,14 +54,25 @@ async def suggest(df_json: dict):
 async def ask_ai(data: dict):
     question = data.get("question")
     df_json = data.get("df")
+    dataset_id = data.get("dataset_id")
 
-    if not question or not df_json:
+    if not question or not (df_json or dataset_id):
         return {"error": "Missing question or dataset"}
 
-    # Check if user is asking for charts/visualizations
-    is_chart_request = any(keyword in question.lower() for keyword in CHART_KEYWORDS)
+    try:
+        df = await run_io(resolve_frame, dataset_id, df_json)
+    except KeyError:
+        return {"error": "Unknown dataset_id. Please upload the dataset again."}
+
+    # Stored with the dataset at upload; None for inline rows
+    profile = dataset_store.get_profile(dataset_id)
+
+    # Charts, a local data question, a summary or the LLM
+    # (CHART_KEYWORDS and the summary keywords live in query_engine);
+    # parsing may profile inline rows, so it runs off the event loop
+    intent = await run_io(route_question, question, df, profile)
 
-    if is_chart_request:
+    if intent.kind == "chart":
         try:
             # Load default theme
             themes_file = os.path.join(os.path.dirname(__file__), "../themes/themes.json")
@@ -56,8 +80,10 @@ async def ask_ai(data: dict):
                 themes = json.load(f)
             theme = themes[0]  # Use first theme as default
 
-            # Plan charts from data preview
-            plan = plan_charts_from_preview(df_json, max_charts=3)
+            # Plan charts from the data; a stored frame is planned in
+            # this process (see below), inline rows in a worker
+            run = run_io if dataset_id else run_cpu
+            plan = await run(plan_charts_from_preview, df, max_charts=3, profile=profile)
 
             chart_urls = []
             for item in plan:
@@ -80,17 +106,31 @@ async def ask_ai(data: dict):
         except Exception as e:
             return {"error": f"Chart generation failed: {str(e)}"}
 
-    # Regular AI response for non-chart requests
-    answer = answer_query(question, df_json)
-
-    # Generate speech from the summary text
+    # Regular AI response for non-chart requests. A stored frame stays
+    # in this process, where its memos (profile, aggregates, fingerprint,
+    # summary cache) are warm; pickling it to a worker would start cold
+    # every time. Local answers and Groq calls run in the thread pool.
+    mode = data.get("mode", "exact")
+    if intent.kind == "summary" and not dataset_id:
+        # Inline rows have nothing to reuse: the analyzers use a worker
+        answer = await run_cpu(answer_query, question, df, profile, mode, intent)
+    else:
+        answer = await run_io(answer_query, question, df, profile, mode, intent)
+
+    # Generate speech from the summary text (blocking Murf call)
     summary_text = answer.get("summary", "")
     audio_url = None
     if summary_text:
-        audio_url = generate_speech(summary_text)
+        audio_url = await run_io(generate_speech, summary_text)
 
     # Add audio to the response
     if audio_url:
         answer["audio"] = audio_url
 
     return {"response": answer}
+
+
+@router.get("/ask/cache")
+def answer_cache_stats():
+    """Hit rate, size and evictions of the LLM answer cache."""
+    return answer_cache.stats()
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, HTTPException
+from backend.utils.job_queue import job_queue
+
+router = APIRouter()
+
+
+@router.get("/jobs")
+def jobs_overview():
+    """Counts of queued / running / finished background jobs."""
+    return job_queue.stats()
+
+
+@router.get("/jobs/{job_id}")
+def job_status(job_id: str):
+    """
+    Status, per-stage progress and (once done) the result of a
+    background upload or auto-dashboard job.
+    """
+    job = job_queue.describe(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job id")
+    return job
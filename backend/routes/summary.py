@@ -1,16 +1,26 @@
-from fastapi import APIRouter
+import json
+import time
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
-import pandas as pd
+from typing import List, Dict, Any, Literal, Optional
 
-from backend.utils.ai_chat_engine import generate_logical_summary
+from backend.utils.Config import BATCH_SUMMARY_MAX_ITEMS
+from backend.utils.ai_chat_engine import logical_summary
+from backend.utils.batch_summary import stream_batch_summaries
+from backend.utils.dataset_store import dataset_store, resolve_frame
+from backend.utils.summary_cache import summary_cache
 
 router = APIRouter()
 
 
 class SummaryRequest(BaseModel):
-    preview: List[Dict[str, Any]]
+    preview: Optional[List[Dict[str, Any]]] = None
+    dataset_id: Optional[str] = None
     user_id: Optional[str] = None
+    # "fast": stratified sample, numbers carry their estimated error
+    mode: Literal["exact", "fast"] = "exact"
 
 
 @router.post("/summary")
@@ -18,10 +28,15 @@ def summary(req: SummaryRequest):
     """
     Generate a deterministic, dataset-aware summary.
     No generative AI is used here — logic only.
+    Prefer `dataset_id` (full cleaned dataset kept at upload)
+    over posting the preview rows back.
+    `mode="fast"` trades accuracy for latency on large datasets.
     """
 
-    # Convert preview data to DataFrame
-    df = pd.DataFrame(req.preview)
+    try:
+        df = resolve_frame(req.dataset_id, req.preview)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Unknown dataset_id. Please upload the dataset again.")
 
     # ✅ Guard: empty dataset
     if df.empty:
@@ -34,11 +49,20 @@ def summary(req: SummaryRequest):
 
     try:
         # ✅ Correct variable usage
-        summary_text = generate_logical_summary(df)
+        profile = dataset_store.get_profile(req.dataset_id)
+        # Same data + same summarizer code → cached text
+        summary_text, info = logical_summary(df, profile, req.mode)
 
-        return {
-            "summary": summary_text
-        }
+        response = {"summary": summary_text, "mode": info["mode"]}
+        if "sample" in info:
+            # Summarized from a stratified sample; "±" marks estimated numbers
+            response["approximate"] = True
+            response["sample"] = info["sample"]
+        if profile and profile.get("approximate"):
+            # Large / streamed datasets: cardinality, quartiles and top-k are sketch estimates
+            response["approximate"] = True
+            response["error_bounds"] = profile["error_bounds"]
+        return response
 
     except Exception as e:
         # Safe fallback
@@ -49,3 +73,54 @@ def summary(req: SummaryRequest):
                 f"Summary generation failed due to an internal error: {str(e)}"
             )
         }
+
+
+class BatchSummaryRequest(BaseModel):
+    datasets: List[SummaryRequest]
+    stream: bool = False
+
+
+@router.post("/summary/batch")
+async def summary_batch(req: BatchSummaryRequest):
+    """
+    Summaries of many datasets, computed in parallel in the CPU
+    process pool. Each result carries its `index` in `datasets`,
+    `ok`, `summary` or `error`, and `seconds`.
+    With `stream: true` results are sent as NDJSON lines as they
+    complete, followed by a {"done": true, ...} line.
+    Batch summaries are always exact (`mode` is ignored).
+    """
+    if len(req.datasets) > BATCH_SUMMARY_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {BATCH_SUMMARY_MAX_ITEMS} datasets per batch.",
+        )
+    items = [d.model_dump(include={"dataset_id", "preview"}) for d in req.datasets]
+    start = time.perf_counter()
+
+    def _totals(failed: int) -> Dict[str, Any]:
+        return {
+            "count": len(items),
+            "failed": failed,
+            "seconds": round(time.perf_counter() - start, 4),
+        }
+
+    if req.stream:
+        async def lines():
+            failed = 0
+            async for result in stream_batch_summaries(items):
+                failed += not result["ok"]
+                yield json.dumps(result, default=str) + "\n"
+            yield json.dumps({"done": True, **_totals(failed)}) + "\n"
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    results = [result async for result in stream_batch_summaries(items)]
+    results.sort(key=lambda r: r["index"])
+    return {"results": results, **_totals(sum(not r["ok"] for r in results))}
+
+
+@router.get("/summary/cache")
+def summary_cache_stats():
+    """Hit rate, size and evictions of the summary cache."""
+    return summary_cache.stats()
@@ -0,0 +1,13 @@
+from fastapi import APIRouter
+from backend.utils.executors import pool_stats
+
+router = APIRouter()
+
+
+@router.get("/system/pools")
+def worker_pools():
+    """
+    Sizes and live counters of the CPU process pool and the
+    I/O thread pool used by the async routes.
+    """
+    return pool_stats()
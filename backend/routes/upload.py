@@ -6,25 +6,62 @@ INSIGHTIFY – DATASET UPLOAD & PREPROCESSING ROUTE
 ====================================================
 
 Responsibilities of this file:
-✔ Accept dataset uploads (CSV, Excel, JSON, XML)
+✔ Accept dataset uploads (CSV, Excel, JSON, NDJSON, XML)
 ✔ Enforce size & row limits
+✔ Optional streaming mode (chunked CSV/JSON/XML, no 10k-row cap)
 ✔ Convert dataset → pandas DataFrame
 ✔ Apply SAFE data cleaning (no NaT corruption)
-✔ Send CLEAN preview data to frontend
+✔ Parse + clean in the CPU process pool (never on the event loop)
+✔ Optional background job mode for large files
+  (live parse / clean / profile / store / preview stages)
+✔ Keep the cleaned frame in the dataset store
+✔ Skip parsing for re-uploads of identical files
+✔ Send CLEAN preview data + dataset_id to frontend
 ✔ NEVER alter datatypes incorrectly
 
 This file is the ONLY gateway for raw data.
 ====================================================
 """
 
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, UploadFile, File, HTTPException, Query
 import pandas as pd
 import numpy as np
-from ..utils.data_cleaner import clean_dataset
+from ..utils.data_cleaner import clean_dataset, clean_dataset_streaming
+from ..utils.column_profile import build_profile
+from ..utils.sketches import DatasetSketch
+from ..utils.ingestion import (
+    concat_chunks,
+    excel_engine,
+    iter_json_array_chunks,
+    iter_ndjson_chunks,
+    iter_xml_chunks,
+    json_top_level,
+    list_excel_sheets,
+    open_text,
+    read_excel_sheet,
+    read_excel_sheets,
+    read_xml,
+    rewind,
+    source_size,
+)
+from ..utils.Config import (
+    EXCEL_PARALLEL_MIN_BYTES,
+    STREAM_MAX_FILE_SIZE,
+    STREAM_CHUNK_ROWS,
+    STREAM_MAX_ROWS,
+    UPLOAD_SPOOL_MAX_BYTES,
+)
+from ..utils.executors import run_cpu, run_io, stage_channel, submit_cpu
+from ..utils.job_queue import job_queue
+from ..utils.dataset_store import dataset_store
+from ..utils.upload_cache import upload_cache
+import asyncio
 import tempfile
+import hashlib
+import io
 import os
 import json
-import xml.etree.ElementTree as ET
+import time
 
 
 def to_json_safe(obj):
@@ -52,122 +89,342 @@ def to_json_safe(obj):
 
     return obj
 
-router = APIRouter()
+SUPPORTED_SUFFIXES = [".csv", ".xlsx", ".xls", ".json", ".jsonl", ".ndjson", ".xml"]
 
 
-@router.post("/upload")
-async def upload_file(file: UploadFile = File(...)):
+def _table(
+    cleaned_df: pd.DataFrame, cleaning_report: dict, name=None, engine=None, parse_seconds=None, sketch=None
+) -> dict:
+    # Column profile is built once here and stored with the dataset;
+    # streamed uploads reuse the sketches built while ingesting
+    start = time.perf_counter()
+    profile = build_profile(cleaned_df, sketch=sketch)
+    cleaning_report["profile_seconds"] = round(time.perf_counter() - start, 4)
+
+    return {
+        "name": name,
+        "engine": engine,
+        "parse_seconds": parse_seconds,
+        "cleaned_df": cleaned_df,
+        "cleaning_report": to_json_safe(cleaning_report),
+        "profile": profile,
+    }
+
+
+def load_and_clean_sheet(source, sheet_name: str, max_rows, engine: str) -> dict:
+    """Parse + clean one Excel sheet (CPU-pool task)."""
+    sheet = read_excel_sheet(source, sheet_name, max_rows, engine)
+    cleaned_df, cleaning_report = clean_dataset(sheet["df"])
+    return _table(cleaned_df, cleaning_report, sheet["name"], sheet["engine"], sheet["parse_seconds"])
+
+
+def _enter_stage(stages, name: str) -> None:
+    if stages is not None:
+        stages.put(name)
+
+
+def load_and_clean(source, suffix: str, stream: bool, filename: str, stages=None) -> list:
     """
-    Upload and preprocess dataset safely.
-    Supported formats: CSV, XLSX, XLS, JSON, XML
-    Max file size: 20MB
-    Max rows processed: 10,000
+    Parse + clean + profile one upload. Runs in the CPU process pool,
+    so it only takes / returns picklable values and raises ValueError
+    rather than HTTPException.
+
+    `stages` (executors.stage_channel) receives "parse", "clean" and
+    "profile" as each step starts, for the background job's progress.
+    Streamed uploads clean every chunk as it is parsed, so there
+    "parse" includes the per-chunk cleaning and "clean" is the
+    whole-column pass at the end (fills, dtype compaction).
+
+    Returns a list of tables: one per sheet for Excel workbooks,
+    otherwise a single table.
     """
+    on_disk = isinstance(source, str)
+    _enter_stage(stages, "parse")
 
-    # -------------------------------
-    # 1️⃣ Save uploaded file temporarily
-    # -------------------------------
-    suffix = os.path.splitext(file.filename)[1].lower()
-    file_size = 0
-    chunk_size = 1024 * 1024  # 1MB
-    tmp_path = None
+    if suffix in [".xlsx", ".xls"]:
+        # Every sheet is its own table; the first one is the primary dataset
+        sheets = read_excel_sheets(
+            source, max_rows=STREAM_MAX_ROWS if stream else 10000, max_workers=1, filename=filename
+        )
+        _enter_stage(stages, "clean")
+        cleaned = [clean_dataset(sheet["df"]) for sheet in sheets]
+        _enter_stage(stages, "profile")
+        return [
+            _table(cleaned_df, cleaning_report, sheet["name"], sheet["engine"], sheet["parse_seconds"])
+            for sheet, (cleaned_df, cleaning_report) in zip(sheets, cleaned)
+        ]
+
+    df = None
+    cleaned_df = None
+    sketch = DatasetSketch() if stream else None
+
+    def parsed():
+        # Streaming: the chunks are read (and cleaned); the final pass follows
+        _enter_stage(stages, "clean")
+
+    if suffix == ".csv" and stream:
+        # Parse + clean chunk by chunk; the raw file is never
+        # held in memory as a whole
+        with pd.read_csv(rewind(source), chunksize=STREAM_CHUNK_ROWS, memory_map=on_disk) as reader:
+            cleaned_df, cleaning_report = clean_dataset_streaming(
+                reader, max_rows=STREAM_MAX_ROWS, sketch=sketch, on_parsed=parsed
+            )
+
+    elif suffix == ".csv":
+        df = pd.read_csv(rewind(source), nrows=10000, memory_map=on_disk)
+
+    elif suffix in [".jsonl", ".ndjson"]:
+        # One record per line; parsing stops at the row limit
+        if stream:
+            cleaned_df, cleaning_report = clean_dataset_streaming(
+                iter_ndjson_chunks(source, STREAM_CHUNK_ROWS), max_rows=STREAM_MAX_ROWS,
+                sketch=sketch, on_parsed=parsed,
+            )
+        else:
+            df = concat_chunks(iter_ndjson_chunks(source, max_rows=10000))
+
+    elif suffix == ".json" and json_top_level(source) == "[":
+        # list-of-dicts: decode element by element into column arrays
+        if stream:
+            cleaned_df, cleaning_report = clean_dataset_streaming(
+                iter_json_array_chunks(source, STREAM_CHUNK_ROWS), max_rows=STREAM_MAX_ROWS,
+                sketch=sketch, on_parsed=parsed,
+            )
+        else:
+            df = concat_chunks(iter_json_array_chunks(source, max_rows=10000))
+
+    elif suffix == ".json":
+        with open_text(source) as f:
+            data = json.load(f)
+
+        # dict-of-lists / dict-of-records
+        if isinstance(data, dict):
+            df = pd.DataFrame.from_dict(data, orient="index").reset_index().head(10000)
+        else:
+            raise ValueError("Unsupported JSON structure")
+
+    elif suffix == ".xml" and stream:
+        cleaned_df, cleaning_report = clean_dataset_streaming(
+            iter_xml_chunks(source, STREAM_CHUNK_ROWS), max_rows=STREAM_MAX_ROWS,
+            sketch=sketch, on_parsed=parsed,
+        )
+
+    elif suffix == ".xml":
+        # iterparse + columnar buffers instead of a full ET tree
+        df = read_xml(source, max_rows=10000)
+
+    else:
+        raise ValueError("Unsupported file format")
+
+    # SAFE data cleaning
+    if cleaned_df is None:
+        _enter_stage(stages, "clean")
+        cleaned_df, cleaning_report = clean_dataset(df)
+        sketch = None
+
+    _enter_stage(stages, "profile")
+    return [_table(cleaned_df, cleaning_report, sketch=sketch)]
+
+
+def serialize_df(df: pd.DataFrame):
+    df = df.copy()
+
+    # Convert datetime columns
+    for col in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = df[col].dt.strftime("%Y-%m-%d")
+
+    # Convert numpy types → python types
+    return json.loads(
+        df.to_json(orient="records", date_format="iso")
+    )
+
+
+def store_tables(tables: list, filename: str) -> list:
+    """
+    Keep the full cleaned frames server-side so analysis routes
+    can take a dataset_id instead of the rows.
+    """
+    sheets_report = []
+    for table in tables:
+        meta = {
+            "filename": filename,
+            "cleaning_report": table["cleaning_report"],
+            "profile": table["profile"],
+        }
+        if table["name"] is not None:
+            meta["sheet"] = table["name"]
+        dataset_id = dataset_store.put(table["cleaned_df"], meta)
+        sheets_report.append(_sheet_entry(table, dataset_id))
+    return sheets_report
 
+
+def build_upload_response(tables: list, sheets_report: list, filename: str, suffix: str) -> dict:
+    # The first (or only) table is the primary dataset
+    cleaned_df = tables[0]["cleaned_df"]
+
+    # Full preview for small datasets, otherwise top 20 rows
+    preview_df = (
+        cleaned_df if len(cleaned_df) <= 100 else cleaned_df.head(20)
+    )
+
+    response = {
+        "dataset_id": sheets_report[0]["dataset_id"],
+        "filename": filename,
+        "rows": int(len(cleaned_df)),
+        "columns": cleaned_df.columns.tolist(),
+        "preview": serialize_df(preview_df),
+        "cleaning_report": tables[0]["cleaning_report"],
+        "status": "File cleaned and processed"
+    }
+    if suffix in [".xlsx", ".xls"]:
+        response["sheets"] = sheets_report
+    return response
+
+
+UPLOAD_JOB_STAGES = ["parse", "clean", "profile", "store", "preview"]
+
+
+def run_upload_job(ctx, source, suffix: str, stream: bool, filename: str, cache_key: str) -> dict:
+    """
+    Background version of the upload route (?async_job=true).
+    Runs in a job worker thread; CPU work still goes to the process pool,
+    which reports the parse / clean / profile stages as it reaches them.
+    """
     try:
-        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
-            tmp_path = tmp.name
+        channel = stage_channel()
+        tables = ctx.follow(submit_cpu(load_and_clean, source, suffix, stream, filename, channel), channel)
+        if not tables:
+            raise ValueError("Workbook contains no sheets")
 
-            while True:
-                chunk = await file.read(chunk_size)
-                if not chunk:
-                    break
+        with ctx.stage("store"):
+            sheets_report = store_tables(tables, filename)
 
-                tmp.write(chunk)
-                file_size += len(chunk)
+        with ctx.stage("preview"):
+            response = build_upload_response(tables, sheets_report, filename, suffix)
 
-                # Enforce 20MB limit
-                if file_size > 20 * 1024 * 1024:
-                    raise HTTPException(
-                        status_code=400,
-                        detail="File too large. Maximum size allowed is 20MB."
-                    )
+        upload_cache.put(cache_key, response)
+        return response
 
-        # -------------------------------
-        # 2️⃣ Load file into DataFrame
-        # -------------------------------
-        if suffix == ".csv":
-            df = pd.read_csv(tmp_path, nrows=10000)
+    finally:
+        if isinstance(source, str) and os.path.exists(source):
+            os.remove(source)
 
-        elif suffix in [".xlsx", ".xls"]:
-            df = pd.read_excel(tmp_path, nrows=10000)
 
-        elif suffix == ".json":
-            with open(tmp_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+def _sheet_entry(sheet: dict, dataset_id: str) -> dict:
+    """Per-table line of the upload response (listed for Excel only)."""
+    return {
+        "name": sheet["name"],
+        "dataset_id": dataset_id,
+        "rows": int(len(sheet["cleaned_df"])),
+        "columns": sheet["cleaned_df"].columns.tolist(),
+        "engine": sheet["engine"],
+        "parse_seconds": sheet["parse_seconds"],
+    }
 
-            # JSON can be list-of-dicts or dict-of-lists
-            if isinstance(data, list):
-                df = pd.DataFrame(data[:10000])
-            elif isinstance(data, dict):
-                df = pd.DataFrame.from_dict(data, orient="index").reset_index().head(10000)
-            else:
-                raise HTTPException(status_code=400, detail="Unsupported JSON structure")
 
-        elif suffix == ".xml":
-            tree = ET.parse(tmp_path)
-            root = tree.getroot()
+router = APIRouter()
 
-            rows = []
-            for i, record in enumerate(root):
-                if i >= 10000:
-                    break
-                row = {child.tag: child.text for child in record}
-                rows.append(row)
 
-            df = pd.DataFrame(rows)
+@router.post("/upload")
+async def upload_file(
+    file: UploadFile = File(...),
+    stream: bool = Query(False, description="Chunked ingestion without the 10k-row cap (CSV, JSON, NDJSON, XML)"),
+    async_job: bool = Query(False, description="Return a job id now; poll /api/jobs/{id} for the result"),
+):
+    """
+    Upload and preprocess dataset safely.
+    Supported formats: CSV, XLSX, XLS, JSON, JSONL/NDJSON, XML
+    Max file size: 20MB (STREAM_MAX_FILE_SIZE in streaming mode)
+    Max rows processed: 10,000 (STREAM_MAX_ROWS in streaming mode)
+    """
 
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported file format")
+    # -------------------------------
+    # 1️⃣ Receive the upload
+    # -------------------------------
+    # Small files stay in memory and are parsed from the buffer;
+    # past UPLOAD_SPOOL_MAX_BYTES they spill to a temp file that
+    # the parsers read in place (CSV via memory_map)
+    suffix = os.path.splitext(file.filename)[1].lower()
+    file_size = 0
+    chunk_size = 1024 * 1024  # 1MB
+    max_file_size = STREAM_MAX_FILE_SIZE if stream else 20 * 1024 * 1024
+    hasher = hashlib.blake2b(digest_size=20)
+    buffer = io.BytesIO()
+    tmp = None
+    tmp_path = None
 
-        # -------------------------------
-        # 3️⃣ Apply SAFE data cleaning
-        # -------------------------------
-        cleaned_df, cleaning_report = clean_dataset(df)
+    try:
+        while True:
+            chunk = await file.read(chunk_size)
+            if not chunk:
+                break
+
+            if tmp is None and file_size + len(chunk) > UPLOAD_SPOOL_MAX_BYTES:
+                tmp = tempfile.NamedTemporaryFile(suffix=suffix, delete=False)
+                tmp_path = tmp.name
+                tmp.write(buffer.getbuffer())
+                buffer = None
+
+            (tmp or buffer).write(chunk)
+            hasher.update(chunk)
+            file_size += len(chunk)
+
+            # Enforce size limit (20MB unless streaming)
+            if file_size > max_file_size:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"File too large. Maximum size allowed is {max_file_size // (1024 * 1024)}MB."
+                )
+
+        if tmp is not None:
+            tmp.close()
+        source = tmp_path or buffer
+
+        # Same bytes + same parse mode → reuse the earlier result
+        cache_key = f"{suffix}:{int(stream)}:{hasher.hexdigest()}"
+        cached = upload_cache.get(cache_key)
+        if cached is not None:
+            if dataset_store.exists(cached["dataset_id"]):
+                return {**cached, "filename": file.filename, "from_cache": True}
+            upload_cache.invalidate(cache_key)
 
         # -------------------------------
-        # 4️⃣ Prepare preview data
+        # 2️⃣ Parse + 3️⃣ clean off the event loop
         # -------------------------------
-        # Full preview for small datasets, otherwise top 20 rows
-        preview_df = (
-            cleaned_df if len(cleaned_df) <= 100 else cleaned_df.head(20)
-        )
-
-        def serialize_df(df: pd.DataFrame):
-            df = df.copy()
+        if suffix not in SUPPORTED_SUFFIXES:
+            raise HTTPException(status_code=400, detail="Unsupported file format")
 
-            # Convert datetime columns
-            for col in df.columns:
-                if pd.api.types.is_datetime64_any_dtype(df[col]):
-                    df[col] = df[col].dt.strftime("%Y-%m-%d")
+        max_rows = STREAM_MAX_ROWS if stream else 10000
 
-            # Convert numpy types → python types
-            return json.loads(
-                df.to_json(orient="records", date_format="iso")
+        if async_job:
+            # The job owns the spilled temp file from here on
+            job = job_queue.submit(
+                "upload", UPLOAD_JOB_STAGES, run_upload_job,
+                source, suffix, stream, file.filename, cache_key,
             )
+            tmp_path = None
+            return {"job_id": job.id, "status": job.status, "stages": UPLOAD_JOB_STAGES}
+
+        if suffix in [".xlsx", ".xls"] and source_size(source) >= EXCEL_PARALLEL_MIN_BYTES:
+            # Large workbooks: one CPU-pool task per sheet
+            engine = excel_engine(file.filename)
+            sheet_names = await run_io(list_excel_sheets, source, engine)
+            tables = await asyncio.gather(*[
+                run_cpu(load_and_clean_sheet, source, name, max_rows, engine)
+                for name in sheet_names
+            ])
+        else:
+            tables = await run_cpu(load_and_clean, source, suffix, stream, file.filename)
 
-        # -------------------------------
-        # 5️⃣ Send response to frontend
-        # -------------------------------
-        return {
-            "filename": file.filename,
-            "rows": int(len(cleaned_df)),
-            "columns": cleaned_df.columns.tolist(),
-            "preview": serialize_df(preview_df),
-            "cleaning_report": {
-                k: int(v) if isinstance(v, (np.integer,)) else v
-                for k, v in cleaning_report.items()
-            },
-            "status": "File cleaned and processed"
-        }
+        if not tables:
+            raise HTTPException(status_code=400, detail="Workbook contains no sheets")
+
+        sheets_report = await run_io(store_tables, tables, file.filename)
+        response = build_upload_response(tables, sheets_report, file.filename, suffix)
+
+        upload_cache.put(cache_key, response)
+        return response
 
     except HTTPException:
         raise
@@ -182,5 +439,21 @@ async def upload_file(file: UploadFile = File(...)):
         # -------------------------------
         # 6️⃣ Always clean up temp file
         # -------------------------------
+        if tmp is not None and not tmp.closed:
+            tmp.close()
         if tmp_path and os.path.exists(tmp_path):
             os.remove(tmp_path)
+
+
+@router.get("/upload/cache")
+def upload_cache_stats():
+    """Hit / miss counters of the upload de-duplication cache."""
+    return upload_cache.stats()
+
+
+@router.delete("/datasets/{dataset_id}")
+async def delete_dataset(dataset_id: str):
+    """Remove a stored dataset (memory and spill files)."""
+    if not await run_io(dataset_store.delete, dataset_id):
+        raise HTTPException(status_code=404, detail="Unknown dataset_id.")
+    return {"dataset_id": dataset_id, "deleted": True}
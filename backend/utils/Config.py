@@ -1,10 +1,15 @@
 # Configuration file for backend settings
+import os
+import tempfile
 
 # API Keys and Secrets
 OPENAI_API_KEY = "your-openai-api-key-here"
 GROQ_API_KEY = "your-groq-api-key-here"
 MURF_API_KEY = "your-murf-api-key-here"
 
+# Model used for questions the local query engine cannot answer
+GROQ_MODEL = "llama3-8b-8192"
+
 # Database settings (if needed)
 DATABASE_URL = "sqlite:///./insightify.db"
 
@@ -12,6 +17,96 @@ DATABASE_URL = "sqlite:///./insightify.db"
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
 ALLOWED_EXTENSIONS = ['csv', 'xlsx', 'xls']
 
+# Uploads up to this size are parsed straight from memory;
+# larger ones are spooled to a temp file and memory-mapped
+UPLOAD_SPOOL_MAX_BYTES = 8 * 1024 * 1024  # 8MB
+
+# Streaming ingestion (upload with ?stream=true)
+STREAM_MAX_FILE_SIZE = 1024 * 1024 * 1024  # 1GB
+STREAM_CHUNK_ROWS = 50_000  # rows parsed + cleaned per chunk
+STREAM_MAX_ROWS = None  # no row cap; set an int to bound memory further
+
+# Excel ingestion (python-calamine is used automatically when installed)
+EXCEL_SHEET_WORKERS = 4  # processes used to parse multi-sheet workbooks
+EXCEL_PARALLEL_MIN_BYTES = 512 * 1024  # smaller workbooks are parsed in-process
+
+# Date detection during cleaning
+DATE_SAMPLE_ROWS = 200  # values tested before a column is fully parsed
+
+# Duplicate removal (row hashes; verify = compare values on hash matches)
+DEDUP_VERIFY = False
+
+# Compact dtypes after cleaning (text columns with at most this
+# share of distinct values become categoricals)
+DTYPE_CATEGORY_MAX_RATIO = 0.5
+
+# Column profile computed at upload (stored with the dataset)
+PROFILE_TOP_K = 10  # most frequent values kept per column
+PROFILE_EXACT_MAX_ROWS = 1_000_000  # larger frames are profiled with sketches
+
+# Streaming sketches (see utils/sketches.py for error bounds)
+SKETCH_HLL_PRECISION = 12  # 4096 registers, ~1.6% distinct-count error
+SKETCH_QUANTILE_K = 200  # compactor size, ~0.5% rank error
+SKETCH_TOP_K_CAPACITY = 64  # values tracked per column for top-k
+
+# Association engine (correlations / Cramér's V / correlation ratio)
+ASSOCIATION_SAMPLE_ROWS = 100_000  # taller frames are sampled
+ASSOCIATION_MAX_CELLS = 5_000_000  # numeric cells read at most (wide frames get fewer rows)
+ASSOCIATION_MAX_CATEGORIES = 50  # categorical columns with more distinct values are skipped
+ASSOCIATION_TOP_K = 10
+ASSOCIATION_CHART_MIN_STRENGTH = 0.5  # weaker pairs are not charted
+
+# Time-series engine (resampled trend / seasonality / volatility)
+TIME_SERIES_MAX_PERIODS = 2000  # finest resampling frequency with at most this many buckets
+TIME_SERIES_MIN_SEASONALITY = 0.3  # autocorrelation at the dominant cycle to report it
+TIME_SERIES_MAX_TREND_COLUMNS = 3  # strongest trends described in the summary
+
+# Summary engine: per-request time budget; insights left when it
+# runs out are skipped and the partial summary is returned
+SUMMARY_TIME_BUDGET_SECONDS = 2.0
+
+# Fast summary mode: analyzers run on a stratified sample; numbers
+# estimated from it carry a jackknife error over the replicates
+SUMMARY_FAST_SAMPLE_ROWS = 20_000  # smaller frames are summarized exactly
+SUMMARY_FAST_REPLICATES = 8
+SUMMARY_FAST_TIME_BUDGET_SECONDS = 0.2
+
+# Summary cache (dataset fingerprint + summarizer version -> summary text)
+SUMMARY_CACHE_MAX_ENTRIES = 256
+SUMMARY_CACHE_MAX_BYTES = 8 * 1024 * 1024
+SUMMARY_CACHE_TTL_SECONDS = 60 * 60
+
+# LLM answer cache (dataset fingerprint + model + prompt version +
+# normalized question -> answer), kept on disk across restarts
+ANSWER_CACHE_PATH = os.environ.get(
+    "INSIGHTIFY_ANSWER_CACHE", os.path.join(tempfile.gettempdir(), "insightify_answers.sqlite3")
+)
+ANSWER_CACHE_MAX_ENTRIES = 10_000
+ANSWER_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+
+# POST /api/summary/batch: datasets accepted per request
+BATCH_SUMMARY_MAX_ITEMS = 1000
+
+# Server-side dataset store
+DATASET_CACHE_SIZE = 16  # cleaned DataFrames kept in memory (LRU)
+DATASET_SPILL_DIR = os.path.join(tempfile.gettempdir(), "insightify_datasets")
+# Spilled datasets unused for this long are deleted, and the oldest go
+# first past the size cap (checked at startup and on every upload)
+DATASET_SPILL_TTL_SECONDS = 7 * 24 * 60 * 60
+DATASET_SPILL_MAX_BYTES = 2 * 1024 * 1024 * 1024  # 2GB
+
+# Upload de-duplication (content hash -> previous upload response)
+UPLOAD_CACHE_MAX_ENTRIES = 64
+UPLOAD_CACHE_MAX_BYTES = 64 * 1024 * 1024  # 64MB of cached responses
+
+# Worker pools for async routes (0 CPU workers = run CPU work in threads)
+CPU_POOL_WORKERS = int(os.environ.get("INSIGHTIFY_CPU_WORKERS", os.cpu_count() or 1))
+IO_POOL_WORKERS = int(os.environ.get("INSIGHTIFY_IO_WORKERS", 16))
+
+# Background jobs (?async_job=true on upload / auto-dashboard)
+JOB_WORKERS = 2
+JOB_RESULT_TTL_SECONDS = 60 * 60  # finished jobs + artifacts kept for 1h
+
 # Other settings
 DEBUG = True
 SECRET_KEY = "your-secret-key-here"
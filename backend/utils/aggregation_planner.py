@@ -0,0 +1,149 @@
+"""
+====================================================
+INSIGHTIFY – AGGREGATION PLANNER
+====================================================
+
+Summary analyzers declare the aggregates their text
+needs ("Sales sum by Segment", "Salary mean"); the
+planner deduplicates them and scans the data once per
+distinct grouping key, not once per sentence.
+
+✔ Aggregate(measure, func, by) – by may be a column or
+  a lazy time feature ("Order Date.year")
+✔ Ungrouped sum / mean / std / min / max read from the
+  upload-time profile (no scan at all)
+✔ One groupby().agg() call per distinct `by`
+✔ Results memoized per frame (repeat summaries are free)
+====================================================
+"""
+
+import time
+from typing import Any, Callable, Dict, Hashable, Iterable, List, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+from backend.utils.column_profile import stat
+from backend.utils.frame_cache import frame_cache
+from backend.utils.time_features import get_column
+
+
+class Aggregate(NamedTuple):
+    measure: str
+    func: str
+    by: Optional[str] = None
+
+
+# Derived aggregates: (row-wise transform, pandas reduction), so
+# they stay vectorised inside a groupby as well
+CUSTOM_FUNCS: Dict[str, Tuple[Callable[[pd.Series], pd.Series], str]] = {
+    "positive_share": (lambda s: s > 0, "mean"),
+}
+
+PROFILE_FUNCS = {"sum", "mean", "std", "min", "max"}
+
+
+def served_by_profile(agg: Aggregate, profile: Optional[Dict[str, Any]]) -> bool:
+    """Whether the plan reads `agg` from the profile instead of scanning."""
+    return (
+        agg.by is None and agg.func in PROFILE_FUNCS and profile is not None
+        and agg.func in profile["columns"].get(agg.measure, {})
+    )
+
+
+class AggregationPlan:
+    def __init__(self, aggregates: Iterable[Aggregate] = ()):
+        self.aggregates: List[Aggregate] = []
+        self.stats: Dict[str, Any] = {}
+        self.extend(aggregates)
+
+    def add(self, measure: str, func: str, by: Optional[str] = None) -> Aggregate:
+        agg = Aggregate(measure, func, by)
+        if agg not in self.aggregates:
+            self.aggregates.append(agg)
+        return agg
+
+    def extend(self, aggregates: Iterable[Aggregate]) -> None:
+        for agg in aggregates:
+            self.add(*agg)
+
+    def execute(self, df: pd.DataFrame, profile: Optional[Dict[str, Any]] = None) -> Dict[Aggregate, Any]:
+        """
+        {aggregate: value}; grouped aggregates are Series indexed
+        by the group key, the rest are scalars.
+        """
+        start = time.perf_counter()
+        cache = frame_cache(df)
+        results: Dict[Aggregate, Any] = {}
+        from_profile = from_cache = 0
+
+        # measure -> funcs still to compute, per grouping key
+        pending: Dict[Optional[str], Dict[str, List[str]]] = {}
+        for agg in self.aggregates:
+            if ("aggregate", agg) in cache:
+                results[agg] = cache[("aggregate", agg)]
+                from_cache += 1
+            elif served_by_profile(agg, profile):
+                results[agg] = stat(profile, agg.measure, agg.func)
+                from_profile += 1
+            else:
+                funcs = pending.setdefault(agg.by, {}).setdefault(agg.measure, [])
+                funcs.append(agg.func)
+
+        for by, measures in pending.items():
+            computed = _scan(df, by, measures)
+            for agg, value in computed.items():
+                cache[("aggregate", agg)] = value
+            results.update(computed)
+
+        self.stats = {
+            "aggregates": len(self.aggregates),
+            "from_profile": from_profile,
+            "from_cache": from_cache,
+            "passes": len(pending),
+            "seconds": round(time.perf_counter() - start, 4),
+        }
+        return results
+
+
+def _prepare(series: pd.Series, func: str) -> Tuple[pd.Series, str]:
+    if func in CUSTOM_FUNCS:
+        transform, func = CUSTOM_FUNCS[func]
+        series = transform(series)
+    return series, func
+
+
+def _scan(df: pd.DataFrame, by: Optional[str], measures: Dict[str, List[str]]) -> Dict[Aggregate, Any]:
+    """Every pending aggregate of one grouping key in one pass."""
+    aggregates = [Aggregate(m, f, by) for m, funcs in measures.items() for f in funcs]
+    prepared = [_prepare(get_column(df, agg.measure), agg.func) for agg in aggregates]
+
+    if by is None:
+        return {agg: series.agg(func) for agg, (series, func) in zip(aggregates, prepared)}
+
+    keys = get_column(df, by)
+    if len(aggregates) == 1:
+        (series, func), = prepared
+        return {aggregates[0]: series.groupby(keys).agg(func)}
+
+    # One groupby object (group codes computed once) and one
+    # reduction call per distinct function across all its columns
+    frame = pd.DataFrame({i: series for i, (series, _) in enumerate(prepared)})
+    grouped = frame.groupby(keys)
+    columns_by_func: Dict[str, List[int]] = {}
+    for i, (_, func) in enumerate(prepared):
+        columns_by_func.setdefault(func, []).append(i)
+
+    results = {}
+    for func, columns in columns_by_func.items():
+        table = grouped[columns].agg(func)
+        for i in columns:
+            results[aggregates[i]] = table[i].rename(aggregates[i].measure)
+    return results
+
+
+def resolve(
+    needs: Dict[Hashable, Aggregate], df: pd.DataFrame, profile: Optional[Dict[str, Any]] = None
+) -> Dict[Hashable, Any]:
+    """Compute an analyzer's named aggregates: {name: value}."""
+    results = AggregationPlan(needs.values()).execute(df, profile)
+    return {name: results[agg] for name, agg in needs.items()}
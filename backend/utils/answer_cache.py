@@ -0,0 +1,180 @@
+"""
+====================================================
+INSIGHTIFY – LLM ANSWER CACHE
+====================================================
+
+Asking the same question about the same data again
+returns the LLM's earlier answer instead of another
+Groq call (most /ask spend and p95 latency came from
+repeat questions).
+
+Key = dataset fingerprint (summary_cache.dataset_fingerprint)
+    + model + prompt template version
+    + normalized question (case, whitespace and
+      punctuation ignored)
+
+✔ SQLite file on disk: survives restarts, shared by the
+  server's worker processes
+✔ LRU eviction past a maximum entry count
+✔ Entries expire after a TTL
+✔ Hit / miss / eviction / expiry counters
+====================================================
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Any, Dict, Optional
+
+import pandas as pd
+
+from backend.utils.Config import (
+    ANSWER_CACHE_MAX_ENTRIES, ANSWER_CACHE_PATH, ANSWER_CACHE_TTL_SECONDS,
+)
+from backend.utils.summary_cache import dataset_fingerprint
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS answers (
+    key TEXT PRIMARY KEY,
+    answer TEXT NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL
+)
+"""
+
+
+def normalize_question(question: str) -> str:
+    """"What's the  TOTAL sales?" and "whats the total sales" are one question."""
+    text = unicodedata.normalize("NFKC", question).lower()
+    text = re.sub(r"['’`]", "", text)
+    text = re.sub(r"[^\w\s]", " ", text)
+    return " ".join(text.split())
+
+
+def answer_key(df: pd.DataFrame, question: str, model: str, prompt_version: int) -> str:
+    parts = (dataset_fingerprint(df), model, str(prompt_version), normalize_question(question))
+    return hashlib.blake2b("\x1f".join(parts).encode(), digest_size=16).hexdigest()
+
+
+class AnswerCache:
+    def __init__(
+        self,
+        path: str = ANSWER_CACHE_PATH,
+        max_entries: int = ANSWER_CACHE_MAX_ENTRIES,
+        ttl_seconds: int = ANSWER_CACHE_TTL_SECONDS,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        # Set when the cache file cannot be opened; answers then go uncached
+        self.disabled = False
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.errors = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per process (a forked child opens its own)
+        if self.disabled:
+            raise sqlite3.OperationalError(f"answer cache disabled: cannot open {self.path}")
+        if self._conn is None or self._pid != os.getpid():
+            try:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(_SCHEMA)
+                conn.execute("CREATE INDEX IF NOT EXISTS answers_last_used ON answers (last_used)")
+            except (sqlite3.Error, OSError):
+                # Unwritable path or read-only disk: stop trying
+                self.disabled = True
+                raise
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        The cached answer, or None. A cache file that cannot be
+        opened (bad path, read-only disk) is a miss, not an error.
+        """
+        with self._lock:
+            try:
+                conn = self._connection()
+                row = conn.execute("SELECT answer, created FROM answers WHERE key = ?", (key,)).fetchone()
+                now = time.time()
+                if row is not None and now - row[1] > self.ttl_seconds:
+                    conn.execute("DELETE FROM answers WHERE key = ?", (key,))
+                    self.expirations += 1
+                    row = None
+                if row is None:
+                    self.misses += 1
+                    return None
+                conn.execute("UPDATE answers SET last_used = ? WHERE key = ?", (now, key))
+                self.hits += 1
+                return row[0]
+            except (sqlite3.Error, OSError):
+                self.errors += 1
+                self.misses += 1
+                return None
+
+    def put(self, key: str, answer: str) -> None:
+        with self._lock:
+            try:
+                conn = self._connection()
+                now = time.time()
+                conn.execute(
+                    "INSERT OR REPLACE INTO answers (key, answer, created, last_used) VALUES (?, ?, ?, ?)",
+                    (key, answer, now, now),
+                )
+                excess = conn.execute("SELECT COUNT(*) FROM answers").fetchone()[0] - self.max_entries
+                if excess > 0:
+                    # Least recently used first
+                    conn.execute(
+                        "DELETE FROM answers WHERE key IN "
+                        "(SELECT key FROM answers ORDER BY last_used LIMIT ?)",
+                        (excess,),
+                    )
+                    self.evictions += excess
+            except (sqlite3.Error, OSError):
+                self.errors += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            try:
+                self._connection().execute("DELETE FROM answers")
+            except (sqlite3.Error, OSError):
+                self.errors += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            try:
+                entries = self._connection().execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+            except (sqlite3.Error, OSError):
+                entries = None
+            lookups = self.hits + self.misses
+            return {
+                "entries": entries,
+                "path": self.path,
+                "enabled": not self.disabled,
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "errors": self.errors,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+answer_cache = AnswerCache()
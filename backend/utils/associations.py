@@ -0,0 +1,206 @@
+"""
+====================================================
+INSIGHTIFY – ASSOCIATION ENGINE
+====================================================
+
+Strongest column pairs of a dataset, for the summary
+engine and the chart planner.
+
+✔ numeric – numeric      → Pearson r (one matrix product)
+✔ category – category    → Cramér's V (contingency via bincount)
+✔ numeric – category     → correlation ratio η
+✔ Upper triangle only, ranked with argpartition; only
+  category pairs loop (one bincount per pair, not per row)
+✔ Tall data is sampled: at most ASSOCIATION_MAX_CELLS
+  numeric cells are read (r within ≈ ±0.02 at 10k rows)
+====================================================
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.utils.Config import (
+    ASSOCIATION_SAMPLE_ROWS, ASSOCIATION_MAX_CELLS, ASSOCIATION_MAX_CATEGORIES, ASSOCIATION_TOP_K,
+)
+from backend.utils.column_profile import profile_for, stat
+from backend.utils.frame_cache import frame_cache
+
+
+KINDS = ("numeric", "categorical", "mixed")
+
+
+def _sample(df: pd.DataFrame, rows: int) -> pd.DataFrame:
+    if len(df) <= rows:
+        return df
+    # Fixed seed: the same frame always gives the same pairs
+    return df.sample(n=rows, random_state=0)
+
+
+def _pairs(
+    names_a: List[str], names_b: List[str], values: np.ndarray, kind: str, method: str
+) -> List[Dict[str, Any]]:
+    return [
+        {"a": a, "b": b, "kind": kind, "method": method, "value": float(v), "strength": abs(float(v))}
+        for a, b, v in zip(names_a, names_b, values)
+    ]
+
+
+def _top(values: np.ndarray, k: int, min_strength: float) -> np.ndarray:
+    """Indices of the k largest |values| ≥ min_strength, strongest first."""
+    strength = np.abs(values)
+    idx = np.flatnonzero(~np.isnan(strength) & (strength >= min_strength))
+    if len(idx) > k:
+        idx = idx[np.argpartition(-strength[idx], k - 1)[:k]]
+    return idx[np.argsort(-strength[idx], kind="stable")]
+
+
+# ============================
+# NUMERIC – NUMERIC
+# ============================
+def _numeric_matrix(sample: pd.DataFrame, cols: List[str]) -> np.ndarray:
+    return sample[cols].to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def correlation_matrix(X: np.ndarray) -> np.ndarray:
+    """Pearson r of every column pair (pairwise-complete when there are gaps)."""
+    if np.isnan(X).any():
+        return pd.DataFrame(X).corr().to_numpy()
+    centered = X - X.mean(axis=0)
+    norms = np.sqrt((centered ** 2).sum(axis=0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = centered / norms  # constant columns → NaN, dropped later
+        return z.T @ z
+
+
+def _numeric_pairs(X: np.ndarray, cols: List[str], k: int, min_strength: float) -> List[Dict[str, Any]]:
+    if len(cols) < 2:
+        return []
+    iu, ju = np.triu_indices(len(cols), 1)
+    r = correlation_matrix(X)[iu, ju]
+    best = _top(r, k, min_strength)
+    return _pairs([cols[i] for i in iu[best]], [cols[j] for j in ju[best]], r[best], "numeric", "pearson")
+
+
+# ============================
+# CATEGORY – CATEGORY
+# ============================
+def _codes(series: pd.Series) -> Tuple[np.ndarray, int]:
+    """Integer codes with missing values as their own category."""
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    k = len(uniques)
+    if (codes < 0).any():
+        codes = np.where(codes < 0, k, codes)
+        k += 1
+    return codes, k
+
+
+def cramers_v(a: np.ndarray, ka: int, b: np.ndarray, kb: int) -> float:
+    n = len(a)
+    if n == 0 or min(ka, kb) < 2:
+        return float("nan")
+    observed = np.bincount(a * kb + b, minlength=ka * kb).reshape(ka, kb).astype(np.float64)
+    expected = np.outer(observed.sum(axis=1), observed.sum(axis=0)) / n
+    with np.errstate(divide="ignore", invalid="ignore"):
+        chi2 = np.nansum((observed - expected) ** 2 / expected)
+    return float(np.sqrt(chi2 / n / (min(ka, kb) - 1)))
+
+
+def _categorical_pairs(codes: Dict[str, Tuple[np.ndarray, int]], k: int, min_strength: float) -> List[Dict[str, Any]]:
+    cols = list(codes)
+    if len(cols) < 2:
+        return []
+    iu, ju = np.triu_indices(len(cols), 1)
+    v = np.array([cramers_v(*codes[cols[i]], *codes[cols[j]]) for i, j in zip(iu, ju)])
+    best = _top(v, k, min_strength)
+    return _pairs([cols[i] for i in iu[best]], [cols[j] for j in ju[best]], v[best], "categorical", "cramers_v")
+
+
+# ============================
+# NUMERIC – CATEGORY
+# ============================
+def correlation_ratios(X: np.ndarray, codes: np.ndarray, k: int) -> np.ndarray:
+    """
+    η of every numeric column of X against one categorical column:
+    sqrt(between-group sum of squares / total sum of squares).
+    Gaps are filled with the column mean (they add to neither).
+    """
+    means = np.nanmean(X, axis=0)
+    X = np.where(np.isnan(X), means, X)
+    centered = X - means
+
+    one_hot = np.zeros((len(codes), k))
+    one_hot[np.arange(len(codes)), codes] = 1.0
+    group_sums = one_hot.T @ centered
+    group_sizes = one_hot.sum(axis=0)[:, None]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        between = np.nansum(group_sums ** 2 / group_sizes, axis=0)
+        total = (centered ** 2).sum(axis=0)
+        return np.sqrt(between / total)
+
+
+def _mixed_pairs(
+    X: np.ndarray, num_cols: List[str], codes: Dict[str, Tuple[np.ndarray, int]], k: int, min_strength: float
+) -> List[Dict[str, Any]]:
+    if not num_cols or not codes:
+        return []
+    cat_cols = list(codes)
+    eta = np.concatenate([correlation_ratios(X, *codes[c]) for c in cat_cols])
+    cats = np.repeat(np.arange(len(cat_cols)), len(num_cols))
+    nums = np.tile(np.arange(len(num_cols)), len(cat_cols))
+    best = _top(eta, k, min_strength)
+    return _pairs(
+        [num_cols[i] for i in nums[best]], [cat_cols[c] for c in cats[best]], eta[best],
+        "mixed", "correlation_ratio",
+    )
+
+
+# ============================
+# ENTRY POINT
+# ============================
+def find_associations(
+    df: pd.DataFrame,
+    profile: Optional[Dict[str, Any]] = None,
+    top_k: int = ASSOCIATION_TOP_K,
+    min_strength: float = 0.0,
+    kinds: Iterable[str] = KINDS,
+) -> List[Dict[str, Any]]:
+    """
+    Top-k column pairs by strength (|r|, V or η, all in 0..1):
+    [{"a", "b", "kind", "method", "value", "strength"}].
+    For "mixed" pairs `a` is the numeric column, `b` the category.
+    Memoized per frame.
+    """
+    kinds = tuple(k for k in KINDS if k in set(kinds))
+    cache = frame_cache(df)
+    key = ("associations", top_k, min_strength, kinds)
+    if key in cache:
+        return cache[key]
+
+    profile = profile_for(df, profile)
+    num_cols = [c for c in profile["numeric_columns"] if c in df.columns]
+    cat_cols = [
+        c for c in profile["categorical_columns"]
+        if c in df.columns and c not in profile["datetime_columns"]
+        and 2 <= (stat(profile, c, "distinct") or 0) <= ASSOCIATION_MAX_CATEGORIES
+    ]
+
+    # Wide frames get fewer rows, so the numeric sample stays bounded
+    rows = min(ASSOCIATION_SAMPLE_ROWS, max(1000, ASSOCIATION_MAX_CELLS // max(len(num_cols), 1)))
+    sample = _sample(df, rows)
+    X = _numeric_matrix(sample, num_cols) if num_cols and ("numeric" in kinds or "mixed" in kinds) else None
+    codes = {c: _codes(sample[c]) for c in cat_cols} if ("categorical" in kinds or "mixed" in kinds) else {}
+
+    pairs: List[Dict[str, Any]] = []
+    if "numeric" in kinds and X is not None:
+        pairs += _numeric_pairs(X, num_cols, top_k, min_strength)
+    if "categorical" in kinds:
+        pairs += _categorical_pairs(codes, top_k, min_strength)
+    if "mixed" in kinds and X is not None:
+        pairs += _mixed_pairs(X, num_cols, codes, top_k, min_strength)
+
+    pairs.sort(key=lambda p: p["strength"], reverse=True)
+    cache[key] = pairs[:top_k]
+    return cache[key]
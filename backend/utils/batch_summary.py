@@ -0,0 +1,125 @@
+"""
+====================================================
+INSIGHTIFY – BATCH SUMMARIES
+====================================================
+
+Summaries of many datasets in one call (overnight runs
+over hundreds of uploaded extracts), behind
+POST /api/summary/batch.
+
+✔ One task per dataset, fanned out over the CPU process
+  pool (utils/executors.py)
+✔ Workers load stored datasets from the spill directory
+  themselves, so only ids (or inline rows) are pickled
+✔ Results come back as they complete, each with its
+  own timing; a failing dataset only fails its result
+✔ Summaries computed in a worker are added to this
+  process's summary cache too
+====================================================
+"""
+
+import asyncio
+import time
+from concurrent.futures import Future, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from backend.utils.dataset_store import dataset_store, resolve_frame
+from backend.utils.executors import submit_cpu
+from backend.utils.summary_analyzers import summarize
+from backend.utils.summary_cache import summary_cache, summary_key
+
+
+BatchItem = Dict[str, Any]  # {"dataset_id": ...} and / or {"preview": [rows]}
+
+
+def _summary(df: pd.DataFrame, profile: Optional[Dict[str, Any]]) -> Tuple[str, Optional[str], bool]:
+    """(summary, cache key or None when not cacheable, served from cache)."""
+    key = summary_key(df, profile)
+    summary = summary_cache.get(key)
+    if summary is not None:
+        return summary, key, True
+    summary, info = summarize(df, profile)
+    if info["truncated"]:
+        return summary, None, False
+    summary_cache.put(key, summary)
+    return summary, key, False
+
+
+def summarize_item(index: int, item: BatchItem) -> Dict[str, Any]:
+    """
+    Summary of one batch entry; runs in a pool worker.
+    Never raises: failures are reported in the result.
+    """
+    start = time.perf_counter()
+    dataset_id = item.get("dataset_id")
+    result: Dict[str, Any] = {"index": index, "dataset_id": dataset_id, "ok": False}
+    try:
+        df = resolve_frame(dataset_id, item.get("preview"))
+        if df.empty:
+            result["error"] = "Dataset is empty."
+        else:
+            profile = dataset_store.get_profile(dataset_id)
+            summary, key, cached = _summary(df, profile)
+            result.update(ok=True, summary=summary, rows=len(df), cached=cached, cache_key=key)
+            if profile and profile.get("approximate"):
+                result["approximate"] = True
+                result["error_bounds"] = profile["error_bounds"]
+    except KeyError:
+        result["error"] = "Unknown dataset_id. Please upload the dataset again."
+    except Exception as e:
+        result["error"] = f"Summary generation failed: {e}"
+    result["seconds"] = round(time.perf_counter() - start, 4)
+    return result
+
+
+def _failed(index: int, item: BatchItem, error: str) -> Dict[str, Any]:
+    return {"index": index, "dataset_id": item.get("dataset_id"), "ok": False, "error": error, "seconds": None}
+
+
+def _collect(index: int, item: BatchItem, future: Future) -> Dict[str, Any]:
+    """Worker result, or an error result when the task itself failed."""
+    try:
+        result = future.result()
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM-killed); submit_cpu starts a fresh pool
+        result = _failed(index, item, "Summary worker process died.")
+    except Exception as e:
+        # e.g. the item could not be pickled to the worker
+        result = _failed(index, item, f"Summary task failed: {e}")
+
+    key = result.pop("cache_key", None)
+    if key is not None:
+        summary_cache.put(key, result["summary"])
+    return result
+
+
+def _submit_all(items: List[BatchItem]) -> Dict[Future, int]:
+    return {submit_cpu(summarize_item, i, item): i for i, item in enumerate(items)}
+
+
+def iter_batch_summaries(items: List[BatchItem]) -> Iterator[Dict[str, Any]]:
+    """Results in completion order; `index` refers back to `items`."""
+    futures = _submit_all(items)
+    for future in as_completed(futures):
+        index = futures[future]
+        yield _collect(index, items[index], future)
+
+
+def summarize_batch(items: List[BatchItem]) -> List[Dict[str, Any]]:
+    """Python API: every result, in input order."""
+    return sorted(iter_batch_summaries(items), key=lambda r: r["index"])
+
+
+async def stream_batch_summaries(items: List[BatchItem]) -> AsyncIterator[Dict[str, Any]]:
+    """Async counterpart of iter_batch_summaries, for the streaming route."""
+    futures = _submit_all(items)
+    wrapped = {asyncio.wrap_future(f): (f, i) for f, i in futures.items()}
+    pending = set(wrapped)
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            future, index = wrapped[task]
+            yield _collect(index, items[index], future)
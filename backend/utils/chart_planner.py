@@ -1,7 +1,25 @@
-def plan_charts_from_preview(preview, max_charts=4):
+import pandas as pd
+from backend.utils.Config import ASSOCIATION_CHART_MIN_STRENGTH
+from backend.utils.associations import find_associations
+from backend.utils.column_profile import profile_for
+from backend.utils.time_features import feature_name
+
+
+def plan_charts_from_preview(preview, max_charts=4, profile=None):
+    # preview: list of row dicts, or a stored DataFrame (+ its upload profile)
     plans = []
 
-    columns = preview[0].keys()
+    if isinstance(preview, pd.DataFrame):
+        profile = profile_for(preview, profile)
+        columns = list(profile["columns"])
+        # Year of the first date column, computed lazily when charted
+        dates = profile["datetime_columns"]
+        year_column = "Year" if "Year" in columns else (
+            feature_name(dates[0], "year") if dates else None
+        )
+    else:
+        columns = preview[0].keys() if preview else []
+        year_column = "Year" if "Year" in columns else None
 
     if "Sales" in columns and "Segment" in columns:
         plans.append({
@@ -11,10 +29,10 @@ def plan_charts_from_preview(preview, max_charts=4):
             "title": "Sales by Segment"
         })
 
-    if "Sales" in columns and "Year" in columns:
+    if "Sales" in columns and year_column:
         plans.append({
             "chart_type": "line",
-            "x": "Year",
+            "x": year_column,
             "y": "Sales",
             "title": "Sales Trend by Year"
         })
@@ -27,4 +45,37 @@ def plan_charts_from_preview(preview, max_charts=4):
             "title": "Profit by Segment"
         })
 
+    if isinstance(preview, pd.DataFrame) and len(plans) < max_charts:
+        plans += _association_plans(preview, profile, max_charts - len(plans), plans)
+
     return plans[:max_charts]
+
+
+def _association_plans(df, profile, slots, existing):
+    # Strongest numeric pairs as scatters, numeric-by-category as bars
+    charted = {(p["x"], p["y"]) for p in existing}
+    plans = []
+    for pair in find_associations(df, profile, kinds=("numeric", "mixed"),
+                                  min_strength=ASSOCIATION_CHART_MIN_STRENGTH):
+        if len(plans) >= slots:
+            break
+        if pair["kind"] == "numeric":
+            plan = {
+                "chart_type": "scatter",
+                "x": pair["a"],
+                "y": pair["b"],
+                "title": f"{pair['b']} vs {pair['a']}",
+                "description": f"{pair['b']} vs {pair['a']} (r = {pair['value']:.2f})",
+            }
+        else:
+            plan = {
+                "chart_type": "bar",
+                "x": pair["b"],
+                "y": pair["a"],
+                "title": f"{pair['a']} by {pair['b']}",
+                "description": f"{pair['a']} by {pair['b']}",
+            }
+        if (plan["x"], plan["y"]) not in charted:
+            charted.add((plan["x"], plan["y"]))
+            plans.append(plan)
+    return plans
@@ -0,0 +1,252 @@
+"""
+====================================================
+INSIGHTIFY – COLUMN PROFILE
+====================================================
+
+One pass over a cleaned dataset at upload time that
+records what the summary engine, /suggest and the
+chart planner need, so later requests read a small
+JSON document instead of rescanning the frame.
+
+Per column:
+✔ kind (numeric / datetime / text / other) + dtype
+✔ null count, cardinality, memory estimate
+✔ numeric: min / max / mean / std / sum / skew / quartiles
+✔ datetime: min / max
+✔ text / other: top-k values with counts (ties in order
+  of first appearance, whether or not the column is a category)
+
+Frames over PROFILE_EXACT_MAX_ROWS, and streamed uploads
+(which pass the sketch built during ingestion), take
+cardinality, quartiles and top-k from mergeable sketches
+instead; the profile is then flagged "approximate" and
+carries the error bounds from utils/sketches.py.
+====================================================
+"""
+
+import math
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from backend.utils.Config import (
+    PROFILE_TOP_K, PROFILE_EXACT_MAX_ROWS, STREAM_CHUNK_ROWS,
+    SKETCH_HLL_PRECISION, SKETCH_QUANTILE_K, SKETCH_TOP_K_CAPACITY,
+)
+from backend.utils.data_cleaner import column_stats
+from backend.utils.frame_cache import frame_cache
+from backend.utils.sketches import DatasetSketch
+
+
+PROFILE_VERSION = 1
+QUANTILES = [0.25, 0.5, 0.75]
+
+
+def _py(value: Any) -> Any:
+    """numpy / pandas scalar → JSON-safe Python value (NaN → None)."""
+    if value is None or value is pd.NaT:
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    try:
+        if pd.isna(value):
+            return None
+    except (TypeError, ValueError):
+        pass
+    return value if isinstance(value, (bool, int, float, str)) else str(value)
+
+
+def _memory_bytes(series: pd.Series, sample_rows: int = 1000) -> int:
+    # deep=True walks every Python string; estimate from a sample instead
+    if len(series) <= sample_rows or not pd.api.types.is_object_dtype(series):
+        return int(series.memory_usage(deep=True, index=False))
+    sample = series.iloc[np.linspace(0, len(series) - 1, sample_rows).astype(int)]
+    return int(sample.memory_usage(deep=True, index=False) * len(series) / sample_rows)
+
+
+def _sketched_entry(entry: Dict[str, Any], column_sketch, top_k: int) -> None:
+    """Overwrite the expensive exact fields with sketch estimates."""
+    entry["approximate"] = True
+    entry["distinct"] = column_sketch.distinct.estimate()
+    if "quantiles" in entry and column_sketch.quantiles is not None:
+        estimates = column_sketch.quantiles.quantiles(QUANTILES)
+        entry["quantiles"] = {str(q): _py(estimates[q]) for q in QUANTILES}
+    if column_sketch.top is not None and entry["kind"] != "numeric":
+        entry["top"] = [
+            {"value": _py(item["value"]), "count": item["count"]}
+            for item in column_sketch.top.top(top_k)
+        ]
+        entry["top_count_error"] = column_sketch.top.error
+
+
+def build_profile(
+    df: pd.DataFrame, top_k: int = PROFILE_TOP_K, sketch: Optional[DatasetSketch] = None
+) -> Dict[str, Any]:
+    if sketch is None and len(df) > PROFILE_EXACT_MAX_ROWS:
+        sketch = DatasetSketch.from_frame(df, STREAM_CHUNK_ROWS)
+
+    stats = column_stats(df)
+    kinds = stats["kinds"]
+    null_counts = stats["null_counts"]
+    kind_of = {col: kind for kind, cols in kinds.items() for col in cols}
+
+    def sketched(col) -> bool:
+        return sketch is not None and str(col) in sketch.columns
+
+    numeric = kinds["numeric"]
+    if numeric and len(df):
+        aggregates = df[numeric].agg(["min", "max", "mean", "std", "sum", "skew"])
+        exact = [c for c in numeric if not sketched(c)]
+        quartiles = df[exact].quantile(QUANTILES)
+        distinct = df[exact].nunique()
+
+    columns: Dict[str, Dict[str, Any]] = {}
+    for col in df.columns:
+        series = df[col]
+        entry: Dict[str, Any] = {
+            "kind": kind_of[col],
+            "dtype": str(series.dtype),
+            "nulls": int(null_counts[col]),
+            "memory_bytes": _memory_bytes(series),
+        }
+
+        if kind_of[col] == "numeric":
+            if len(df):
+                entry.update({stat: _py(aggregates.at[stat, col]) for stat in aggregates.index})
+                entry["quantiles"] = {}
+                if not sketched(col):
+                    entry["quantiles"] = {str(q): _py(quartiles.at[q, col]) for q in QUANTILES}
+                    entry["distinct"] = int(distinct[col])
+            else:
+                entry["distinct"] = 0
+
+        elif kind_of[col] == "datetime":
+            entry["min"] = _py(series.min())
+            entry["max"] = _py(series.max())
+            if not sketched(col):
+                entry["distinct"] = int(series.nunique())
+
+        elif not sketched(col):
+            try:
+                counts = count_values(series)
+            except TypeError:
+                # Unhashable cells (lists / dicts from JSON uploads)
+                counts = count_values(series.astype(str))
+            entry["distinct"] = int(len(counts))
+            entry["top"] = [
+                {"value": _py(value), "count": int(count)}
+                for value, count in counts.head(top_k).items()
+            ]
+
+        if sketched(col):
+            _sketched_entry(entry, sketch.columns[str(col)], top_k)
+
+        columns[str(col)] = entry
+
+    approximate = any(entry.get("approximate") for entry in columns.values())
+    return {
+        "version": PROFILE_VERSION,
+        "approximate": approximate,
+        "error_bounds": sketch_error_bounds() if approximate else None,
+        "rows": int(len(df)),
+        "columns": columns,
+        "numeric_columns": [str(c) for c in df.columns if kind_of[c] == "numeric"],
+        "categorical_columns": [str(c) for c in df.columns if kind_of[c] != "numeric"],
+        "datetime_columns": [str(c) for c in kinds["datetime"]],
+        "memory_bytes": int(sum(c["memory_bytes"] for c in columns.values())),
+    }
+
+
+def count_values(series: pd.Series) -> pd.Series:
+    """
+    series.value_counts() with ties in order of first appearance
+    for every dtype. A category column would otherwise break ties by
+    category order (and list unused categories), so converting a
+    column to category at cleaning time changed which value a
+    summary named as the most common.
+    """
+    codes, uniques = pd.factorize(series)
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    order = np.argsort(-counts, kind="stable")
+    return pd.Series(counts[order], index=pd.Index(uniques, name=series.name)[order], name="count")
+
+
+def sketch_error_bounds() -> Dict[str, float]:
+    return {
+        # HyperLogLog relative standard error
+        "distinct_relative_error": round(1.04 / (2 ** SKETCH_HLL_PRECISION) ** 0.5, 4),
+        # Typical rank error of a quantile, as a share of rows
+        "quantile_rank_error": round(1 / SKETCH_QUANTILE_K, 4),
+        # Top-k counts are low by at most rows / (capacity + 1)
+        "top_count_error_share": round(1 / (SKETCH_TOP_K_CAPACITY + 1), 4),
+    }
+
+
+def profile_for(df: pd.DataFrame, profile: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    The stored profile when it describes `df`; otherwise one
+    built from the frame (memoized per frame, e.g. preview rows).
+    """
+    if _describes(profile, df):
+        return profile
+
+    cache = frame_cache(df)
+    if "profile" not in cache:
+        cache["profile"] = build_profile(df)
+    return cache["profile"]
+
+
+def is_approximate(df: pd.DataFrame, profile: Optional[Dict[str, Any]] = None) -> bool:
+    """Whether profile_for(df, profile) is sketched, without building it."""
+    if _describes(profile, df):
+        return bool(profile.get("approximate"))
+    built = frame_cache(df).get("profile")
+    if built is not None:
+        return bool(built["approximate"])
+    # build_profile sketches every column of frames this large
+    return len(df) > PROFILE_EXACT_MAX_ROWS and len(df.columns) > 0
+
+
+def _describes(profile: Optional[Dict[str, Any]], df: pd.DataFrame) -> bool:
+    return bool(
+        profile
+        and profile.get("version") == PROFILE_VERSION
+        and profile.get("rows") == len(df)
+        and list(profile.get("columns", {})) == [str(c) for c in df.columns]
+    )
+
+
+# ============================
+# LOOKUP HELPERS
+# ============================
+def stat(profile: Dict[str, Any], column: str, name: str, default: Any = None) -> Any:
+    """e.g. stat(profile, "Sales", "mean")"""
+    return profile["columns"].get(column, {}).get(name, default)
+
+
+def quantile(profile: Dict[str, Any], column: str, q: float) -> Optional[float]:
+    return profile["columns"].get(column, {}).get("quantiles", {}).get(str(q))
+
+
+def top_values(profile: Dict[str, Any], column: str) -> List[Dict[str, Any]]:
+    return profile["columns"].get(column, {}).get("top", [])
+
+
+def non_null(profile: Dict[str, Any], column: str) -> int:
+    return profile["rows"] - stat(profile, column, "nulls", 0)
+
+
+def value_counts(profile: Dict[str, Any], column: str) -> Optional[pd.Series]:
+    """
+    Full value counts from the profile when the top-k list covers
+    every distinct value (low-cardinality columns), else None.
+    """
+    top = top_values(profile, column)
+    if not top or stat(profile, column, "distinct") != len(top):
+        return None
+    return pd.Series({item["value"]: item["count"] for item in top}, dtype="int64")
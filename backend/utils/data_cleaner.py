@@ -1,75 +1,435 @@
+import os
+import time
+import warnings
+from collections import Counter
+
 import pandas as pd
 import numpy as np
-from typing import Tuple, Dict, Any
+from pandas.tseries.api import guess_datetime_format
+from typing import Tuple, Dict, Any, Callable, Iterable, List, Optional
+
+from backend.utils.Config import DATE_SAMPLE_ROWS
+from backend.utils.deduplicator import RowDeduplicator
+from backend.utils.dtype_optimizer import compact_series, memory_report, optimize_dtypes
+from backend.utils.time_features import available_time_features
+
+
+def _is_text_column(series: pd.Series) -> bool:
+    # pandas >= 3 stores text as the "str" dtype rather than object
+    return pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)
+
+
+def _spread_sample(series: pd.Series, size: int) -> pd.Series:
+    """Non-null values taken evenly across the column, not just its head."""
+    values = series.dropna()
+    if len(values) > size:
+        values = values.iloc[np.linspace(0, len(values) - 1, size).astype(int)]
+    return values
+
+
+def _candidate_formats(sample: pd.Series, probes: int) -> List[str]:
+    formats = Counter()
+    with warnings.catch_warnings():
+        # guess_datetime_format warns when a value only fits day-first
+        warnings.simplefilter("ignore", UserWarning)
+        for value in sample.iloc[:probes]:
+            if not isinstance(value, str):
+                continue
+            for dayfirst in (False, True):
+                fmt = guess_datetime_format(value.strip(), dayfirst=dayfirst)
+                if fmt:
+                    formats[fmt] += 1
+    return [fmt for fmt, _ in formats.most_common()]
+
+
+def infer_date_format(sample: pd.Series, probes: int = 20) -> Tuple[str, float]:
+    """
+    Pick the single format that parses most of the sample
+    (month-first and day-first guesses compete), or "mixed"
+    when no value yields a format.
+    Returns (format, share of the sample it parses).
+    """
+    best_fmt, best_rate = "mixed", -1.0
+    for fmt in _candidate_formats(sample, probes) or ["mixed"]:
+        rate = pd.to_datetime(sample, format=fmt, errors="coerce").notna().mean()
+        if rate > best_rate:
+            best_fmt, best_rate = fmt, rate
+        if rate == 1.0:
+            break
+    return best_fmt, best_rate
+
+
+def parse_date_column(
+    series: pd.Series, threshold: float = 0.8, sample_rows: int = DATE_SAMPLE_ROWS
+) -> Tuple[Optional[pd.Series], Optional[str]]:
+    """
+    Detect and parse a date column in one go.
+
+    A sample is parsed first with a single inferred format; only
+    columns whose sample passes `threshold` are parsed in full,
+    once, with that format.
+    Returns (parsed, format), or (None, None) for non-date columns.
+    """
+    if not _is_text_column(series):
+        return None, None
+
+    sample = _spread_sample(series, sample_rows)
+    if sample.empty:
+        return None, None
+
+    fmt, rate = infer_date_format(sample)
+    if rate < threshold:
+        return None, None
+
+    parsed = pd.to_datetime(series, format=fmt, errors="coerce")
+    if parsed.notna().mean() < threshold:
+        return None, None
+    return parsed, fmt
 
 
 def is_probable_date(series: pd.Series, threshold: float = 0.8) -> bool:
     """
     Detect if a column is a real date column.
     """
-    if series.dtype != object:
-        return False
+    return parse_date_column(series, threshold)[0] is not None
+
+
+# ============================
+# CLEANING PIPELINE
+# ============================
+CleaningStep = Tuple[str, Callable[[pd.DataFrame, Dict[str, Any]], pd.DataFrame]]
+
+
+def _rss_bytes() -> int:
+    """Resident memory of this process (0 where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+def column_stats(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Null counts, dtype classes and medians for every column at once:
+    one isna() pass, dtypes read from the frame's block metadata,
+    and a single median() call over the numeric columns with gaps.
+    """
+    null_counts = df.isna().sum()
+    kinds = {"numeric": [], "datetime": [], "text": [], "other": []}
+    for col, dtype in df.dtypes.items():
+        if pd.api.types.is_bool_dtype(dtype):
+            kinds["other"].append(col)
+        elif pd.api.types.is_numeric_dtype(dtype):
+            kinds["numeric"].append(col)
+        elif pd.api.types.is_datetime64_any_dtype(dtype):
+            kinds["datetime"].append(col)
+        elif (
+            pd.api.types.is_object_dtype(dtype)
+            or pd.api.types.is_string_dtype(dtype)
+            or isinstance(dtype, pd.CategoricalDtype)
+        ):
+            kinds["text"].append(col)
+        else:
+            kinds["other"].append(col)
+
+    numeric_gaps = [c for c in kinds["numeric"] if null_counts[c]]
+    medians = df[numeric_gaps].median() if numeric_gaps else pd.Series(dtype=float)
+
+    return {"null_counts": null_counts, "kinds": kinds, "medians": medians}
+
+
+def step_column_names(df: pd.DataFrame, report: Dict[str, Any]) -> pd.DataFrame:
+    df.columns = [str(c).strip() for c in df.columns]
+    return df
+
+
+def step_missing_values(df: pd.DataFrame, report: Dict[str, Any]) -> pd.DataFrame:
+    """Numeric gaps → column median, everything else → "Unknown"."""
+    stats = column_stats(df)
+    null_counts = stats["null_counts"]
+    report["column_types"] = stats["kinds"]
+
+    gaps = null_counts[null_counts > 0]
+    report["missing_filled"] = int(gaps.sum())
+    if gaps.empty:
+        return df
+
+    fill_values = {
+        col: stats["medians"][col] if col in stats["medians"].index else "Unknown"
+        for col in gaps.index
+    }
+    return df.fillna(value=fill_values)
+
+
+def step_duplicates(df: pd.DataFrame, report: Dict[str, Any]) -> pd.DataFrame:
+    dedup = RowDeduplicator()
+    df = dedup.drop_duplicates(df)
+    report["duplicates_removed"] = dedup.duplicates_removed
+    report["deduplication"] = dedup.stats()
+    return df
+
+
+def detect_date_columns(df: pd.DataFrame, report: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Parse the real date columns of `df` in place and record the
+    per-column detection time. Returns {column: format}.
+    """
+    formats = {}
+    for col in list(df.columns):
+        if not _is_text_column(df[col]):
+            continue
+
+        start = time.perf_counter()
+        parsed, fmt = parse_date_column(df[col])
+        report["date_detection"][col] = {
+            "is_date": parsed is not None,
+            "format": fmt,
+            "seconds": round(time.perf_counter() - start, 4),
+        }
+
+        if parsed is not None:
+            df[col] = parsed
+            formats[col] = fmt
+
+    report["date_columns"] = list(formats)
+    return formats
+
+
+def step_dates(df: pd.DataFrame, report: Dict[str, Any]) -> pd.DataFrame:
+    detect_date_columns(df, report)
+    # Year / month etc. are derived lazily on request (time_features)
+    report["time_features"] = available_time_features(df)
+    return df
+
+
+def step_dtypes(df: pd.DataFrame, report: Dict[str, Any]) -> pd.DataFrame:
+    df, report["memory"] = optimize_dtypes(df)
+    return df
+
+
+DEFAULT_STEPS: List[CleaningStep] = [
+    ("column_names", step_column_names),
+    ("missing_values", step_missing_values),
+    ("duplicates", step_duplicates),
+    ("dates", step_dates),
+    ("dtypes", step_dtypes),
+]
+
+
+class CleaningPipeline:
+    """
+    Runs cleaning steps in order. A step is `(name, fn)` where
+    `fn(df, report)` returns the new frame and may add report keys.
 
-    parsed = pd.to_datetime(series, errors="coerce", infer_datetime_format=True)
-    return parsed.notna().mean() >= threshold
+    Every step is timed; `cleaning_report["steps"]` lists its wall
+    time, process memory delta and the row count after it.
+    """
+
+    def __init__(self, steps: Optional[List[CleaningStep]] = None):
+        self.steps = list(DEFAULT_STEPS if steps is None else steps)
+
+    def run(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        df = df.copy()
+
+        report = {
+            "original_rows": len(df),
+            "original_columns": len(df.columns),
+            "missing_filled": 0,
+            "duplicates_removed": 0,
+            "date_columns": [],
+            "date_detection": {},
+            "steps": [],
+        }
+
+        pipeline_start = time.perf_counter()
+        for name, fn in self.steps:
+            start, rss_before = time.perf_counter(), _rss_bytes()
+            df = fn(df, report)
+            report["steps"].append({
+                "name": name,
+                "seconds": round(time.perf_counter() - start, 4),
+                "memory_delta_mb": round((_rss_bytes() - rss_before) / (1024 * 1024), 2),
+                "rows_after": len(df),
+            })
+
+        report["total_seconds"] = round(time.perf_counter() - pipeline_start, 4)
+        report["final_rows"] = len(df)
+        report["final_columns"] = len(df.columns)
+
+        return df, report
 
 
 def clean_dataset(df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, Any]]:
     """
     Clean dataset WITHOUT corrupting categorical columns.
     """
+    return CleaningPipeline().run(df)
 
-    df = df.copy()
 
-    report = {
-        "original_rows": len(df),
-        "original_columns": len(df.columns),
-        "missing_filled": 0,
-        "duplicates_removed": 0,
-        "date_columns": [],
-    }
+class StreamingCleaner:
+    """
+    Incremental version of `clean_dataset` for chunked ingestion.
+
+    Chunks are cleaned as they arrive so the raw file is never
+    fully materialised:
+      - missing values are counted per chunk
+      - text gaps are filled per chunk, numeric gaps are filled
+        with the whole-column median once all chunks are seen
+        (so, unlike `clean_dataset`, a row with a numeric gap is
+        never merged with a row that already held the median)
+      - duplicates are removed across chunks via row hashes
+        (RowDeduplicator)
+      - date columns and their formats are detected on the first
+        chunk; later chunks are parsed with the same format
+      - dtypes are compacted once per whole column (so categories
+        are not re-unified chunk by chunk)
+
+    Memory: parsing holds one raw chunk at a time, but the cleaned
+    rows are all kept (the result is an in-memory frame). They are
+    stored as per-column pieces, and `finish` assembles, fills and
+    compacts one column at a time, releasing its pieces as it goes,
+    so the peak is the cleaned data plus one column's temporaries
+    rather than the chunks plus a full concatenated copy.
+    """
 
-    # -------------------------
-    # 1️⃣ Clean column names
-    # -------------------------
-    df.columns = [c.strip() for c in df.columns]
-
-    # -------------------------
-    # 2️⃣ Handle missing values (SAFE)
-    # -------------------------
-    for col in df.columns:
-        if pd.api.types.is_numeric_dtype(df[col]):
-            missing = df[col].isna().sum()
-            if missing:
-                df[col] = df[col].fillna(df[col].median())
-                report["missing_filled"] += missing
+    def __init__(self, max_rows: Optional[int] = None, sketch=None):
+        self.max_rows = max_rows
+        # Optional DatasetSketch fed with every cleaned chunk
+        self.sketch = sketch
+        # column -> one piece per kept chunk (None where the chunk lacks it)
+        self._pieces: Dict[str, List[Optional[pd.Series]]] = {}
+        self._chunk_rows: List[int] = []
+        self._dedup = RowDeduplicator()
+        self._date_formats: Optional[Dict[str, str]] = None
+        self._kept_rows = 0
+
+        self.report = {
+            "original_rows": 0,
+            "original_columns": 0,
+            "missing_filled": 0,
+            "duplicates_removed": 0,
+            "date_columns": [],
+            "date_detection": {},
+            "chunks_processed": 0,
+        }
+
+    @property
+    def is_full(self) -> bool:
+        return self.max_rows is not None and self._kept_rows >= self.max_rows
+
+    def add_chunk(self, chunk: pd.DataFrame) -> None:
+        if self.is_full or chunk.empty:
+            return
+
+        chunk = chunk.copy()
+        chunk.columns = [str(c).strip() for c in chunk.columns]
+
+        self.report["chunks_processed"] += 1
+        self.report["original_rows"] += len(chunk)
+        self.report["original_columns"] = max(self.report["original_columns"], len(chunk.columns))
+
+        # 1️⃣ Count missing values; text gaps can be filled right away
+        null_counts = chunk.isna().sum()
+        self.report["missing_filled"] += int(null_counts.sum())
+        for col in null_counts[null_counts > 0].index:
+            if not pd.api.types.is_numeric_dtype(chunk[col]):
+                chunk[col] = chunk[col].fillna("Unknown")
+
+        # 2️⃣ Remove duplicates within and across chunks
+        keep = self._dedup.keep_mask(chunk)
+        self.report["duplicates_removed"] += int(len(chunk) - keep.sum())
+        chunk = chunk[keep]
+
+        if self.max_rows is not None:
+            chunk = chunk.head(self.max_rows - self._kept_rows)
+
+        # 3️⃣ Date columns (and their formats) are decided on the first chunk only
+        if self._date_formats is None:
+            self._date_formats = detect_date_columns(chunk, self.report)
         else:
-            missing = df[col].isna().sum()
-            if missing:
-                df[col] = df[col].fillna("Unknown")
-                report["missing_filled"] += missing
-
-    # -------------------------
-    # 3️⃣ Remove duplicates
-    # -------------------------
-    before = len(df)
-    df = df.drop_duplicates()
-    report["duplicates_removed"] = before - len(df)
-
-    # -------------------------
-    # 4️⃣ Convert ONLY real date columns
-    # -------------------------
-    for col in df.columns:
-        if is_probable_date(df[col]):
-            df[col] = pd.to_datetime(df[col], errors="coerce")
-            report["date_columns"].append(col)
-
-            # Derive time features
-            df["Year"] = df[col].dt.year.astype("Int64")
-            df["Month Number"] = df[col].dt.month.astype("Int64")
-            df["Month Name"] = df[col].dt.month_name()
-
-    report["final_rows"] = len(df)
-    report["final_columns"] = len(df.columns)
-
-    return df, report
+            for col, fmt in self._date_formats.items():
+                if col in chunk.columns:
+                    chunk[col] = pd.to_datetime(chunk[col], format=fmt, errors="coerce")
+
+        if self.sketch is not None:
+            self.sketch.update(chunk)
+
+        if chunk.empty:
+            return
+        for col in chunk.columns:
+            pieces = self._pieces.setdefault(col, [None] * len(self._chunk_rows))
+            # Own copy of the column: a view would keep the chunk's
+            # whole 2-D block alive until every column is assembled
+            pieces.append(chunk[col].reset_index(drop=True).copy())
+        for col, pieces in self._pieces.items():
+            if len(pieces) == len(self._chunk_rows):
+                pieces.append(None)
+        self._chunk_rows.append(len(chunk))
+        self._kept_rows += len(chunk)
+
+    def _assemble(self, col: str) -> pd.Series:
+        """One column from its pieces (all-NaN where a chunk lacked it); frees the pieces."""
+        pieces = self._pieces.pop(col)
+        for i, rows in enumerate(self._chunk_rows):
+            if pieces[i] is None:
+                pieces[i] = pd.Series(np.nan, index=pd.RangeIndex(rows), name=col)
+        series = pieces[0] if len(pieces) == 1 else pd.concat(pieces, ignore_index=True)
+        pieces.clear()
+        return series.rename(col)
+
+    def finish(self) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        self.report["deduplication"] = self._dedup.stats()
+
+        columns: Dict[str, pd.Series] = {}
+        before = after = 0
+        changes: Dict[str, Dict[str, str]] = {}
+        for col in list(self._pieces):
+            series = self._assemble(col)
+            # Numeric medians need the whole column, so fill them last.
+            # Columns whose dtype changed between chunks end up as text.
+            if series.hasnans:
+                if pd.api.types.is_numeric_dtype(series):
+                    series = series.fillna(series.median())
+                elif col not in (self._date_formats or {}):
+                    series = series.fillna("Unknown")
+
+            compact = compact_series(series)
+            before += int(series.memory_usage(deep=True, index=False))
+            after += int(compact.memory_usage(deep=True, index=False))
+            if compact.dtype != series.dtype:
+                changes[str(col)] = {"from": str(series.dtype), "to": str(compact.dtype)}
+            columns[col] = compact
+            del series, compact
+        self._chunk_rows = []
+
+        df = pd.DataFrame(columns, copy=False) if columns else pd.DataFrame()
+        self.report["memory"] = memory_report(before, after, changes)
+
+        self.report["time_features"] = available_time_features(df)
+        self.report["final_rows"] = len(df)
+        self.report["final_columns"] = len(df.columns)
+
+        return df, self.report
+
+
+def clean_dataset_streaming(
+    chunks: Iterable[pd.DataFrame], max_rows: Optional[int] = None, sketch=None,
+    on_parsed: Optional[Callable[[], None]] = None,
+) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Clean an iterable of DataFrame chunks. Raw parsing memory is
+    bounded by the chunk size; the cleaned rows are held in full
+    (see StreamingCleaner for the peak during `finish`).
+    Stops pulling chunks once `max_rows` cleaned rows are kept.
+    `sketch` (a DatasetSketch) is updated with every cleaned chunk.
+    `on_parsed` is called once the last chunk is in, before `finish`.
+    """
+    cleaner = StreamingCleaner(max_rows=max_rows, sketch=sketch)
+    for chunk in chunks:
+        cleaner.add_chunk(chunk)
+        if cleaner.is_full:
+            break
+    if on_parsed is not None:
+        on_parsed()
+    return cleaner.finish()
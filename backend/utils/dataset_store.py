@@ -0,0 +1,298 @@
+"""
+====================================================
+INSIGHTIFY – SERVER-SIDE DATASET STORE
+====================================================
+
+Keeps cleaned DataFrames on the server so analysis
+routes can work from a `dataset_id` instead of the
+client POSTing rows back on every request.
+
+✔ In-process LRU of recently used frames
+✔ Write-through on-disk spill (Parquet, pickle fallback)
+✔ Evicted datasets reload transparently from disk
+✔ Spill pruned by last use (TTL) and total size, at
+  startup and on every put; DELETE /api/datasets/{id}
+✔ Thread-safe (routes run in FastAPI's threadpool)
+====================================================
+"""
+
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Union
+
+import pandas as pd
+
+from backend.utils.Config import (
+    DATASET_CACHE_SIZE, DATASET_SPILL_DIR, DATASET_SPILL_MAX_BYTES, DATASET_SPILL_TTL_SECONDS,
+)
+
+
+_DATASET_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+_SPILL_FILE_RE = re.compile(r"^([0-9a-f]{32})\.(parquet|pkl|json)$")
+
+
+def is_valid_dataset_id(dataset_id: Any) -> bool:
+    """
+    Dataset ids double as file names in the spill directory,
+    so only accept the exact shape we generate.
+    """
+    return isinstance(dataset_id, str) and bool(_DATASET_ID_RE.match(dataset_id))
+
+
+class DatasetStore:
+    """
+    LRU cache of cleaned DataFrames backed by an on-disk spill.
+
+    Every dataset is written to disk when it is stored, so an
+    LRU eviction only drops the in-memory copy; the next `get`
+    reads it back from the spill directory.
+    """
+
+    def __init__(
+        self,
+        max_items: int = DATASET_CACHE_SIZE,
+        spill_dir: str = DATASET_SPILL_DIR,
+        ttl_seconds: int = DATASET_SPILL_TTL_SECONDS,
+        max_bytes: int = DATASET_SPILL_MAX_BYTES,
+    ):
+        self.max_items = max(1, int(max_items))
+        self.spill_dir = spill_dir
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._frames: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+        self._meta: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.disk_loads = 0
+        self.misses = 0
+        self.pruned = 0
+        os.makedirs(self.spill_dir, exist_ok=True)
+        # Left over from earlier runs
+        self.prune()
+
+    # ----------------------------
+    # Spill helpers
+    # ----------------------------
+    def _path(self, dataset_id: str, ext: str) -> str:
+        return os.path.join(self.spill_dir, f"{dataset_id}.{ext}")
+
+    def _spill(self, dataset_id: str, df: pd.DataFrame, meta: Dict[str, Any]) -> None:
+        try:
+            df.to_parquet(self._path(dataset_id, "parquet"), index=False)
+        except Exception:
+            # Mixed-type object columns (common in JSON/XML uploads)
+            # are not Arrow-representable; pickle keeps them intact.
+            df.to_pickle(self._path(dataset_id, "pkl"))
+
+        with open(self._path(dataset_id, "json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, default=str)
+
+    def _load_spilled(self, dataset_id: str) -> Optional[pd.DataFrame]:
+        parquet_path = self._path(dataset_id, "parquet")
+        pickle_path = self._path(dataset_id, "pkl")
+
+        if os.path.exists(parquet_path):
+            return pd.read_parquet(parquet_path)
+        if os.path.exists(pickle_path):
+            return pd.read_pickle(pickle_path)
+        return None
+
+    def _load_spilled_meta(self, dataset_id: str) -> Dict[str, Any]:
+        meta_path = self._path(dataset_id, "json")
+        if not os.path.exists(meta_path):
+            return {}
+        with open(meta_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _touch(self, dataset_id: str) -> None:
+        """Mark a dataset as used: its meta file's mtime is its last use."""
+        try:
+            os.utime(self._path(dataset_id, "json"))
+        except OSError:
+            pass
+
+    def _remember(self, dataset_id: str, df: pd.DataFrame) -> None:
+        self._frames[dataset_id] = df
+        self._frames.move_to_end(dataset_id)
+        while len(self._frames) > self.max_items:
+            evicted_id, _ = self._frames.popitem(last=False)
+            self._meta.pop(evicted_id, None)
+
+    # ----------------------------
+    # Public API
+    # ----------------------------
+    def put(self, df: pd.DataFrame, meta: Optional[Dict[str, Any]] = None) -> str:
+        dataset_id = uuid.uuid4().hex
+        meta = dict(meta or {})
+        meta.setdefault("rows", int(len(df)))
+        meta.setdefault("columns", [str(c) for c in df.columns])
+
+        self._spill(dataset_id, df, meta)
+
+        with self._lock:
+            self._meta[dataset_id] = meta
+            self._remember(dataset_id, df)
+
+        self.prune(keep=dataset_id)
+        return dataset_id
+
+    def get(self, dataset_id: str) -> Optional[pd.DataFrame]:
+        if not is_valid_dataset_id(dataset_id):
+            return None
+
+        with self._lock:
+            df = self._frames.get(dataset_id)
+            if df is not None:
+                self._frames.move_to_end(dataset_id)
+                self.hits += 1
+        if df is not None:
+            self._touch(dataset_id)
+            return df
+
+        df = self._load_spilled(dataset_id)
+
+        with self._lock:
+            if df is None:
+                self.misses += 1
+                return None
+            self.disk_loads += 1
+            self._remember(dataset_id, df)
+        self._touch(dataset_id)
+        return df
+
+    def exists(self, dataset_id: str) -> bool:
+        """Cheap check that does not load a spilled frame."""
+        if not is_valid_dataset_id(dataset_id):
+            return False
+        with self._lock:
+            if dataset_id in self._frames:
+                return True
+        return any(
+            os.path.exists(self._path(dataset_id, ext)) for ext in ("parquet", "pkl")
+        )
+
+    def get_meta(self, dataset_id: str) -> Dict[str, Any]:
+        if not is_valid_dataset_id(dataset_id):
+            return {}
+
+        with self._lock:
+            if dataset_id in self._meta:
+                return self._meta[dataset_id]
+
+        meta = self._load_spilled_meta(dataset_id)
+        with self._lock:
+            if dataset_id in self._frames:
+                self._meta[dataset_id] = meta
+        return meta
+
+    def get_profile(self, dataset_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Column profile computed at upload (None for unknown ids)."""
+        if not dataset_id:
+            return None
+        return self.get_meta(dataset_id).get("profile")
+
+    def delete(self, dataset_id: str) -> bool:
+        """Drop a dataset from memory and disk; False when it did not exist."""
+        if not is_valid_dataset_id(dataset_id):
+            return False
+
+        with self._lock:
+            found = self._frames.pop(dataset_id, None) is not None
+            self._meta.pop(dataset_id, None)
+
+        for ext in ("parquet", "pkl", "json"):
+            path = self._path(dataset_id, ext)
+            try:
+                os.remove(path)
+                found = True
+            except FileNotFoundError:
+                pass
+        return found
+
+    def prune(self, keep: Optional[str] = None) -> int:
+        """
+        Delete spilled datasets unused for `ttl_seconds`, then the
+        least recently used ones until the spill fits in `max_bytes`
+        (`keep`, the dataset just stored, always stays).
+        Returns the number of datasets deleted.
+        """
+        sizes: Dict[str, int] = {}
+        last_used: Dict[str, float] = {}
+        try:
+            entries = list(os.scandir(self.spill_dir))
+        except OSError:
+            return 0
+        for entry in entries:
+            match = _SPILL_FILE_RE.match(entry.name)
+            if not match:
+                continue
+            try:
+                info = entry.stat()
+            except OSError:
+                continue  # deleted meanwhile
+            dataset_id = match.group(1)
+            sizes[dataset_id] = sizes.get(dataset_id, 0) + info.st_size
+            last_used[dataset_id] = max(last_used.get(dataset_id, 0.0), info.st_mtime)
+
+        now = time.time()
+        total = sum(sizes.values())
+        doomed = []
+        for dataset_id in sorted(last_used, key=last_used.get):
+            if dataset_id == keep:
+                continue
+            if now - last_used[dataset_id] > self.ttl_seconds or total > self.max_bytes:
+                doomed.append(dataset_id)
+                total -= sizes[dataset_id]
+
+        for dataset_id in doomed:
+            self.delete(dataset_id)
+        with self._lock:
+            self.pruned += len(doomed)
+        return len(doomed)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "in_memory": len(self._frames),
+                "max_items": self.max_items,
+                "hits": self.hits,
+                "disk_loads": self.disk_loads,
+                "misses": self.misses,
+                "pruned": self.pruned,
+            }
+
+
+# ============================
+# DEFAULT STORE
+# ============================
+dataset_store = DatasetStore()
+
+
+def resolve_frame(
+    dataset_id: Optional[str] = None,
+    rows: Optional[Union[List[Dict[str, Any]], Dict[str, Any], pd.DataFrame]] = None,
+) -> pd.DataFrame:
+    """
+    Return the DataFrame an analysis route should work on.
+
+    A `dataset_id` wins over inline rows; inline rows are still
+    accepted so existing clients keep working, and are used as a
+    fallback when the id is unknown.
+    Raises KeyError when the id is unknown and no rows were sent.
+    """
+    if dataset_id:
+        df = dataset_store.get(dataset_id)
+        if df is not None:
+            return df
+        if rows is None or len(rows) == 0:
+            raise KeyError(dataset_id)
+
+    if isinstance(rows, pd.DataFrame):
+        return rows
+
+    return pd.DataFrame(rows or [])
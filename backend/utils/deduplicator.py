@@ -0,0 +1,201 @@
+"""
+====================================================
+INSIGHTIFY – ROW-HASH DEDUPLICATOR
+====================================================
+
+Duplicate removal that works chunk by chunk:
+every row is reduced to a 64-bit hash, and the hashes
+of kept rows are held in one sorted uint64 array
+(8 bytes per distinct row) instead of the rows.
+
+✔ Same result as drop_duplicates(keep="first")
+✔ Dtype-stable hashes: 1 and "1" differ, an int column
+  hashes like the same column read as float in another chunk
+✔ Works across streaming chunks in bounded memory
+✔ Optional exact verification against hash collisions
+✔ Counts rows examined / removed / collisions
+====================================================
+"""
+
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.utils.Config import DEDUP_VERIFY
+
+
+def _same_value(x: Any, y: Any) -> bool:
+    try:
+        if x == y:
+            return True
+    except (TypeError, ValueError):
+        pass
+    # NaN equals NaN here, as in drop_duplicates
+    try:
+        return bool(pd.isna(x)) and bool(pd.isna(y))
+    except (TypeError, ValueError):
+        return False
+
+
+def _same_row(a: Tuple, b: Tuple) -> bool:
+    return len(a) == len(b) and all(_same_value(x, y) for x, y in zip(a, b))
+
+
+# ============================
+# ROW HASHES
+# ============================
+# pd.util.hash_pandas_object hashes object columns by string form
+# (1 and "1" collide) and numbers by their dtype's bytes (int 1 and
+# float 1.0 differ), so a column that is int64 in one chunk and
+# float64 in the next (one NaN is enough) would hide duplicates.
+# Each column is hashed in one domain per kind of value instead:
+# numbers as float64, strings as strings, anything else as a
+# type-tagged string, missing values as one constant.
+_NA_HASH = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+def _float_hashes(values: np.ndarray) -> np.ndarray:
+    values = values.astype(np.float64) + 0.0  # -0.0 → 0.0
+    hashes = pd.util.hash_array(values)
+    hashes[np.isnan(values)] = _NA_HASH
+    return hashes
+
+
+def _factorized_hashes(series: pd.Series) -> np.ndarray:
+    """Hash each distinct value once (missing values → the NA hash)."""
+    codes, uniques = pd.factorize(series)
+    lookup = np.append(pd.util.hash_array(np.asarray(uniques, dtype=object)), _NA_HASH)
+    return lookup[codes]
+
+
+def _object_hashes(values: np.ndarray) -> np.ndarray:
+    hashes = np.full(len(values), _NA_HASH, dtype=np.uint64)
+    present = ~pd.isna(values)
+    kind = pd.api.types.infer_dtype(values, skipna=True)
+
+    if kind in ("string", "empty"):
+        return _factorized_hashes(pd.Series(values, dtype=object))
+    if kind in ("integer", "floating", "mixed-integer-float", "boolean", "decimal"):
+        return _float_hashes(pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(np.float64))
+
+    # Mixed: numbers, strings and the rest each hashed in their own domain
+    is_number = np.fromiter(
+        (isinstance(v, (int, float, np.number, np.bool_)) for v in values), dtype=bool, count=len(values)
+    ) & present
+    is_text = np.fromiter((isinstance(v, str) for v in values), dtype=bool, count=len(values))
+    other = present & ~is_number & ~is_text
+    if is_number.any():
+        hashes[is_number] = _float_hashes(values[is_number].astype(np.float64))
+    if is_text.any():
+        hashes[is_text] = pd.util.hash_array(values[is_text])
+    if other.any():
+        tagged = np.array([f"\x1f{type(v).__name__}:{v!s}" for v in values[other]], dtype=object)
+        hashes[other] = pd.util.hash_array(tagged)
+    return hashes
+
+
+def _column_hashes(series: pd.Series) -> np.ndarray:
+    dtype = series.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        # Hash the categories once, then look them up by code
+        # (code -1, a missing value, takes the appended NA slot)
+        lookup = np.append(_column_hashes(pd.Series(dtype.categories)), _NA_HASH)
+        return lookup[series.cat.codes.to_numpy()]
+    if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_numeric_dtype(dtype):
+        return _float_hashes(series.to_numpy(dtype=np.float64, na_value=np.nan))
+    if isinstance(dtype, pd.StringDtype):
+        return _factorized_hashes(series)
+    if dtype == object:
+        return _object_hashes(series.to_numpy(dtype=object, na_value=None))
+    # Datetimes, timedeltas, periods ...: their own hashing is stable
+    return pd.util.hash_pandas_object(series, index=False, categorize=False).to_numpy(dtype=np.uint64)
+
+
+def row_hashes(df: pd.DataFrame) -> np.ndarray:
+    """One uint64 per row, independent of how each chunk's dtypes came out."""
+    # Column hashes combined in order, as hash_pandas_object does
+    hashes = np.full(len(df), 0x345678, dtype=np.uint64)
+    multiplier = 1000003
+    width = df.shape[1]
+    for i in range(width):
+        hashes ^= _column_hashes(df.iloc[:, i])
+        hashes *= np.uint64(multiplier)
+        multiplier = (multiplier + 82520 + 2 * (width - i)) & 0xFFFFFFFFFFFFFFFF
+    return hashes + np.uint64(97531)
+
+
+class RowDeduplicator:
+    """
+    Call `keep_mask(chunk)` for each chunk in order; it returns a
+    boolean mask of the rows that were not seen before.
+
+    With `verify=True` rows whose hash was already seen are compared
+    value by value with the kept rows of that hash, so a collision
+    never drops a distinct row. This keeps the kept rows' values
+    in memory, so it is off by default (DEDUP_VERIFY).
+    """
+
+    def __init__(self, verify: bool = DEDUP_VERIFY):
+        self.verify = verify
+        self._hashes = np.empty(0, dtype=np.uint64)
+        self._kept_rows: Dict[int, List[Tuple]] = {}
+        self.rows_examined = 0
+        self.duplicates_removed = 0
+        self.hash_collisions = 0
+
+    def _seen(self, hashes: np.ndarray) -> np.ndarray:
+        if not len(self._hashes):
+            return np.zeros(len(hashes), dtype=bool)
+        pos = np.searchsorted(self._hashes, hashes)
+        pos[pos == len(self._hashes)] = 0
+        return self._hashes[pos] == hashes
+
+    def _merge(self, new_hashes: np.ndarray) -> None:
+        # Two sorted runs: the stable (tim)sort merges them in linear time
+        merged = np.concatenate([self._hashes, np.sort(new_hashes)])
+        merged.sort(kind="stable")
+        self._hashes = merged
+
+    def keep_mask(self, chunk: pd.DataFrame) -> np.ndarray:
+        hashes = row_hashes(chunk)
+        self.rows_examined += len(hashes)
+
+        # First occurrence within the chunk, and not seen in earlier chunks
+        keep = ~pd.Series(hashes).duplicated().to_numpy()
+        keep &= ~self._seen(hashes)
+
+        if self.verify:
+            keep = self._verify(chunk, hashes, keep)
+
+        self._merge(hashes[keep])
+        self.duplicates_removed += int(len(hashes) - keep.sum())
+        return keep
+
+    def _verify(self, chunk: pd.DataFrame, hashes: np.ndarray, keep: np.ndarray) -> np.ndarray:
+        keep = keep.copy()
+        rows = chunk.itertuples(index=False, name=None)
+
+        for i, (h, row) in enumerate(zip(hashes.tolist(), rows)):
+            kept = self._kept_rows.setdefault(h, [])
+            if keep[i]:
+                kept.append(row)
+            elif not any(_same_row(row, other) for other in kept):
+                # Same hash, different values: a collision, not a duplicate
+                keep[i] = True
+                kept.append(row)
+                self.hash_collisions += 1
+        return keep
+
+    def drop_duplicates(self, df: pd.DataFrame) -> pd.DataFrame:
+        return df[self.keep_mask(df)]
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {
+            "rows_examined": self.rows_examined,
+            "duplicates_removed": self.duplicates_removed,
+            "distinct_hashes": int(len(self._hashes)),
+        }
+        if self.verify:
+            stats["hash_collisions"] = self.hash_collisions
+        return stats
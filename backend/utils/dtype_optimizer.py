@@ -0,0 +1,108 @@
+"""
+====================================================
+INSIGHTIFY – DTYPE OPTIMIZER
+====================================================
+
+Last cleaning stage: stores the cleaned frame in the
+smallest dtypes that hold its values exactly, so the
+DataFrames kept by the dataset store take less RSS.
+
+✔ int64 → int8 / int16 / int32 when the range allows
+✔ float64 → float32 only when every value round-trips
+✔ Repeated strings (Segment, Country, ...) → category
+✔ memory_usage(deep=True) before / after in the report
+====================================================
+"""
+
+from typing import Any, Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.utils.Config import DTYPE_CATEGORY_MAX_RATIO
+
+
+def _memory_bytes(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(deep=True, index=False).sum())
+
+
+def _downcast_integer(series: pd.Series) -> pd.Series:
+    # Smallest signed type that holds min..max; sum() / mean() still
+    # accumulate in 64-bit, so aggregates are unchanged
+    return pd.to_numeric(series, downcast="integer")
+
+
+def _downcast_float(series: pd.Series) -> pd.Series:
+    values = series.to_numpy()
+    narrow = values.astype(np.float32)
+    with np.errstate(over="ignore", invalid="ignore"):
+        exact = np.array_equal(narrow.astype(np.float64), values, equal_nan=True)
+    return pd.Series(narrow, index=series.index, name=series.name) if exact else series
+
+
+def _is_repeated_text(series: pd.Series, max_ratio: float) -> bool:
+    if pd.api.types.is_object_dtype(series):
+        # Only pure-string columns: mixed objects stay as they are
+        if pd.api.types.infer_dtype(series, skipna=True) != "string":
+            return False
+    elif not pd.api.types.is_string_dtype(series):
+        return False
+
+    if not len(series):
+        return False
+    try:
+        distinct = series.nunique()
+    except TypeError:
+        return False
+    return distinct <= max_ratio * len(series)
+
+
+def compact_series(series: pd.Series, category_max_ratio: float = DTYPE_CATEGORY_MAX_RATIO) -> pd.Series:
+    """`series` in the smallest exact dtype (the same object when none fits)."""
+    dtype = series.dtype
+    if pd.api.types.is_bool_dtype(dtype):
+        return series
+    if isinstance(dtype, np.dtype) and dtype.kind in "iu" and dtype.itemsize > 1:
+        return _downcast_integer(series)
+    if isinstance(dtype, np.dtype) and dtype == np.float64:
+        return _downcast_float(series)
+    if _is_repeated_text(series, category_max_ratio):
+        return series.astype("category")
+    return series
+
+
+def memory_report(before: int, after: int, changes: Dict[str, Dict[str, str]]) -> Dict[str, Any]:
+    return {
+        "memory_before_bytes": before,
+        "memory_after_bytes": after,
+        "saved_bytes": before - after,
+        "columns": changes,
+    }
+
+
+def optimize_dtypes(
+    df: pd.DataFrame, category_max_ratio: float = DTYPE_CATEGORY_MAX_RATIO
+) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Returns the frame with compact dtypes and a report of
+    {memory_before_bytes, memory_after_bytes, saved_bytes, columns}
+    where `columns` maps each changed column to {"from", "to"}.
+    """
+    before = _memory_bytes(df)
+    converted: Dict[str, pd.Series] = {}
+
+    for col in df.columns:
+        new = compact_series(df[col], category_max_ratio)
+        if new.dtype != df[col].dtype:
+            converted[col] = new
+
+    changes = {
+        str(col): {"from": str(df[col].dtype), "to": str(new.dtype)}
+        for col, new in converted.items()
+    }
+    if converted:
+        df = df.copy(deep=False)
+        for col, new in converted.items():
+            df[col] = new
+
+    return df, memory_report(before, _memory_bytes(df), changes)
@@ -0,0 +1,186 @@
+"""
+====================================================
+INSIGHTIFY – WORKER POOLS FOR ASYNC ROUTES
+====================================================
+
+Async routes must not run pandas or blocking HTTP
+calls on the event loop, otherwise one large upload
+stalls every other request on that worker.
+
+✔ run_cpu → bounded process pool (parsing, cleaning, summaries)
+✔ run_io  → bounded thread pool (Groq / Murf calls, disk I/O)
+✔ Sizes come from Config (CPU_POOL_WORKERS, IO_POOL_WORKERS)
+✔ stage_channel() → queue a CPU task can report progress on
+✔ pool_stats() feeds GET /api/system/pools
+====================================================
+"""
+
+import asyncio
+import functools
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+from backend.utils.Config import CPU_POOL_WORKERS, IO_POOL_WORKERS
+
+
+class _PoolCounters:
+    def __init__(self, kind: str, workers: int):
+        self.kind = kind
+        self.workers = workers
+        self.submitted = 0
+        self.active = 0
+        self.completed = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+
+    def started(self) -> None:
+        with self._lock:
+            self.submitted += 1
+            self.active += 1
+
+    def finished(self, future: Future) -> None:
+        with self._lock:
+            self.active -= 1
+            if future.cancelled() or future.exception() is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "kind": self.kind,
+                "workers": self.workers,
+                "submitted": self.submitted,
+                "active": self.active,
+                "completed": self.completed,
+                "failed": self.failed,
+            }
+
+
+_lock = threading.Lock()
+_cpu_pool: Optional[Executor] = None
+_io_pool: Optional[ThreadPoolExecutor] = None
+_manager = None
+_cpu_counters = (
+    _PoolCounters("process", CPU_POOL_WORKERS)
+    if CPU_POOL_WORKERS > 0
+    else _PoolCounters("thread (shared with io)", IO_POOL_WORKERS)
+)
+_io_counters = _PoolCounters("thread", IO_POOL_WORKERS)
+
+
+def get_io_pool() -> ThreadPoolExecutor:
+    global _io_pool
+    with _lock:
+        if _io_pool is None:
+            _io_pool = ThreadPoolExecutor(max_workers=IO_POOL_WORKERS, thread_name_prefix="insightify-io")
+        return _io_pool
+
+
+def get_cpu_pool() -> Executor:
+    """
+    Process pool for CPU-bound work. CPU_POOL_WORKERS = 0 keeps
+    everything in-process (CPU work then shares the I/O threads).
+    """
+    global _cpu_pool
+    if CPU_POOL_WORKERS <= 0:
+        return get_io_pool()
+
+    with _lock:
+        if _cpu_pool is None:
+            # spawn: forking a threaded server process can deadlock
+            _cpu_pool = ProcessPoolExecutor(
+                max_workers=CPU_POOL_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _cpu_pool
+
+
+def stage_channel():
+    """
+    Queue a submit_cpu task can `put` progress messages on while the
+    caller reads them. Process workers cannot share a plain queue, so
+    with a process pool this is a Manager queue (one manager process,
+    started on first use).
+    """
+    global _manager
+    if CPU_POOL_WORKERS <= 0:
+        return queue.Queue()
+
+    with _lock:
+        if _manager is None:
+            _manager = multiprocessing.get_context("spawn").Manager()
+        return _manager.Queue()
+
+
+def _submit(executor: Executor, counters: _PoolCounters, fn: Callable, *args, **kwargs) -> Future:
+    counters.started()
+    future = executor.submit(functools.partial(fn, *args, **kwargs))
+    future.add_done_callback(counters.finished)
+    return future
+
+
+def submit_cpu(fn: Callable, *args, **kwargs) -> Future:
+    """Blocking-code counterpart of run_cpu (e.g. background jobs)."""
+    pool = get_cpu_pool()
+    future = _submit(pool, _cpu_counters, fn, *args, **kwargs)
+    future.add_done_callback(lambda f: _discard_if_broken(pool, f))
+    return future
+
+
+async def run_cpu(fn: Callable, *args, **kwargs) -> Any:
+    """
+    Run a CPU-heavy function in the process pool.
+    `fn` and its arguments must be picklable (module-level functions,
+    DataFrames, buffers), and so must its return value.
+    """
+    pool = get_cpu_pool()
+    try:
+        return await asyncio.wrap_future(_submit(pool, _cpu_counters, fn, *args, **kwargs))
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM-killed); start a fresh pool next time
+        _discard_cpu_pool(pool)
+        raise
+
+
+def _discard_if_broken(pool: Executor, future: Future) -> None:
+    if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+        _discard_cpu_pool(pool)
+
+
+def _discard_cpu_pool(pool: Executor) -> None:
+    global _cpu_pool
+    with _lock:
+        if _cpu_pool is pool:
+            _cpu_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def run_io(fn: Callable, *args, **kwargs) -> Any:
+    """Run a blocking I/O call (HTTP, disk) in the thread pool."""
+    return await asyncio.wrap_future(_submit(get_io_pool(), _io_counters, fn, *args, **kwargs))
+
+
+def pool_stats() -> Dict[str, Any]:
+    return {
+        "cpu": _cpu_counters.as_dict(),
+        "io": _io_counters.as_dict(),
+    }
+
+
+def shutdown_pools() -> None:
+    global _cpu_pool, _io_pool, _manager
+    with _lock:
+        for pool in (_cpu_pool, _io_pool):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        if _manager is not None:
+            _manager.shutdown()
+        _cpu_pool = None
+        _io_pool = None
+        _manager = None
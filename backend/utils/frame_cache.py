@@ -0,0 +1,35 @@
+"""
+====================================================
+INSIGHTIFY – PER-FRAME MEMO
+====================================================
+
+Small per-DataFrame cache for values derived from a
+frame (lazy time features, column profiles).
+
+DataFrames are unhashable, so entries are keyed on
+id(frame) and removed by a weakref finalizer when the
+frame is garbage collected; a recycled id can never
+see a stale entry.
+====================================================
+"""
+
+import threading
+import weakref
+from typing import Any, Dict
+
+import pandas as pd
+
+
+_lock = threading.Lock()
+_cache: Dict[int, Dict[Any, Any]] = {}
+
+
+def frame_cache(df: pd.DataFrame) -> Dict[Any, Any]:
+    """The memo dict of `df` (created on first use)."""
+    key = id(df)
+    with _lock:
+        entry = _cache.get(key)
+        if entry is None:
+            entry = _cache[key] = {}
+            weakref.finalize(df, _cache.pop, key, None)
+        return entry
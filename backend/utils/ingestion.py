@@ -0,0 +1,390 @@
+"""
+====================================================
+INSIGHTIFY – STREAMING FILE READERS
+====================================================
+
+Incremental readers used by the upload route.
+Records are parsed one at a time and collected into
+columnar buffers, so peak memory is one chunk of rows
+rather than the whole document tree / object graph.
+
+Every reader takes a "source": either a file path
+(large uploads spooled to disk) or a binary buffer
+(small uploads kept in memory).
+====================================================
+"""
+
+import importlib.util
+import io
+import itertools
+import json
+import os
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, IO, Iterator, List, Optional, Union
+
+import pandas as pd
+
+from backend.utils.Config import STREAM_CHUNK_ROWS, EXCEL_SHEET_WORKERS, EXCEL_PARALLEL_MIN_BYTES
+
+
+Source = Union[str, IO[bytes]]
+
+
+# ============================
+# SOURCES
+# ============================
+def rewind(source: Source) -> Source:
+    """Buffers are read several times (sniffing, then parsing)."""
+    if not isinstance(source, str):
+        source.seek(0)
+    return source
+
+
+def source_size(source: Source) -> int:
+    if isinstance(source, str):
+        return os.path.getsize(source)
+    return source.getbuffer().nbytes if isinstance(source, io.BytesIO) else 0
+
+
+@contextmanager
+def open_text(source: Source) -> Iterator[IO[str]]:
+    if isinstance(source, str):
+        with open(source, "r", encoding="utf-8") as f:
+            yield f
+        return
+
+    wrapper = io.TextIOWrapper(rewind(source), encoding="utf-8")
+    try:
+        yield wrapper
+    finally:
+        # Leave the caller's buffer open
+        wrapper.detach()
+
+
+# ============================
+# COLUMNAR BUFFER
+# ============================
+class ColumnBuffer:
+    """
+    Collects row dicts straight into per-column lists.
+    Columns first seen mid-chunk are back-filled with None.
+    """
+
+    def __init__(self):
+        self.columns: Dict[str, List[Any]] = {}
+        self.rows = 0
+
+    def append(self, row: Dict[str, Any]) -> None:
+        for key, value in row.items():
+            column = self.columns.get(key)
+            if column is None:
+                column = self.columns[key] = [None] * self.rows
+            column.append(value)
+
+        self.rows += 1
+        for column in self.columns.values():
+            if len(column) < self.rows:
+                column.append(None)
+
+    def flush(self) -> pd.DataFrame:
+        df = pd.DataFrame(self.columns)
+        self.columns = {}
+        self.rows = 0
+        return df
+
+
+# ============================
+# XML
+# ============================
+def iter_xml_chunks(
+    source: Source, chunk_rows: int = STREAM_CHUNK_ROWS, max_rows: Optional[int] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream `<root><record><field>..</field></record>..</root>`
+    documents with iterparse. Each finished record is turned
+    into a row and then cleared, so the tree never grows past
+    the record being parsed.
+    """
+    buffer = ColumnBuffer()
+    total = 0
+    depth = 0
+    root = None
+
+    for event, elem in ET.iterparse(rewind(source), events=("start", "end")):
+        if event == "start":
+            depth += 1
+            if root is None:
+                root = elem
+            continue
+
+        depth -= 1
+        if depth != 1:
+            # Field elements are read from their record on its "end"
+            continue
+
+        buffer.append({child.tag: child.text for child in elem})
+        total += 1
+
+        # Drop the finished record and the root's reference to it
+        elem.clear()
+        root.clear()
+
+        if buffer.rows >= chunk_rows:
+            yield buffer.flush()
+        if max_rows is not None and total >= max_rows:
+            break
+
+    if buffer.rows:
+        yield buffer.flush()
+
+
+def read_xml(source: Source, max_rows: Optional[int] = 10000) -> pd.DataFrame:
+    return concat_chunks(iter_xml_chunks(source, max_rows=max_rows))
+
+
+# ============================
+# JSON / NDJSON
+# ============================
+def _rows_to_chunks(
+    rows: Iterator[Any], chunk_rows: int, max_rows: Optional[int]
+) -> Iterator[pd.DataFrame]:
+    buffer = ColumnBuffer()
+    total = 0
+
+    for row in rows:
+        if not isinstance(row, dict):
+            raise ValueError("Unsupported JSON structure: records must be objects")
+
+        buffer.append(row)
+        total += 1
+
+        if buffer.rows >= chunk_rows:
+            yield buffer.flush()
+        if max_rows is not None and total >= max_rows:
+            break
+
+    if buffer.rows:
+        yield buffer.flush()
+
+
+def _iter_ndjson_records(f: IO[str]) -> Iterator[Any]:
+    for line_no, line in enumerate(f, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON on line {line_no}: {e.msg}")
+
+
+def _iter_json_array_records(f: IO[str], block_size: int = 64 * 1024) -> Iterator[Any]:
+    """
+    Decode the elements of a top-level JSON array one at a time,
+    reading the file in blocks instead of building the whole list.
+    """
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    eof = False
+    state = "open"  # open -> first -> (value -> separator)*
+
+    while True:
+        while pos < len(buf) and buf[pos].isspace():
+            pos += 1
+
+        need_more = pos >= len(buf)
+        if not need_more and state in ("first", "value") and not (state == "first" and buf[pos] == "]"):
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+                # A number/literal at the buffer edge may continue in the next block
+                need_more = end >= len(buf) and not eof
+            except json.JSONDecodeError as e:
+                if eof:
+                    raise ValueError(f"Invalid JSON: {e.msg}")
+                need_more = True
+
+        if need_more:
+            if eof:
+                raise ValueError("Unexpected end of JSON array")
+            block = f.read(block_size)
+            eof = not block
+            buf = buf[pos:] + block
+            pos = 0
+            continue
+
+        if state == "open":
+            if buf[pos] != "[":
+                raise ValueError("Unsupported JSON structure: expected a top-level array")
+            pos += 1
+            state = "first"
+
+        elif state == "separator":
+            if buf[pos] == "]":
+                return
+            if buf[pos] != ",":
+                raise ValueError("Invalid JSON: expected ',' or ']' in array")
+            pos += 1
+            state = "value"
+
+        elif buf[pos] == "]":
+            # Empty array
+            return
+
+        else:
+            pos = end
+            state = "separator"
+            yield value
+
+
+def iter_ndjson_chunks(
+    source: Source, chunk_rows: int = STREAM_CHUNK_ROWS, max_rows: Optional[int] = None
+) -> Iterator[pd.DataFrame]:
+    """One JSON object per line (.jsonl / .ndjson)."""
+    with open_text(source) as f:
+        yield from _rows_to_chunks(_iter_ndjson_records(f), chunk_rows, max_rows)
+
+
+def iter_json_array_chunks(
+    source: Source, chunk_rows: int = STREAM_CHUNK_ROWS, max_rows: Optional[int] = None
+) -> Iterator[pd.DataFrame]:
+    """Top-level `[{...}, {...}]` arrays, parsed element by element."""
+    with open_text(source) as f:
+        yield from _rows_to_chunks(_iter_json_array_records(f), chunk_rows, max_rows)
+
+
+def json_top_level(source: Source) -> str:
+    """Return the first non-whitespace character of a JSON document."""
+    with open_text(source) as f:
+        while True:
+            block = f.read(4096)
+            if not block:
+                return ""
+            stripped = block.lstrip()
+            if stripped:
+                return stripped[0]
+
+
+def concat_chunks(chunks: Iterator[pd.DataFrame]) -> pd.DataFrame:
+    chunks = list(chunks)
+    if not chunks:
+        return pd.DataFrame()
+    return pd.concat(chunks, ignore_index=True)
+
+
+# ============================
+# EXCEL
+# ============================
+def excel_engine(filename: str) -> str:
+    """
+    Prefer the Rust-based calamine reader when it is installed;
+    otherwise openpyxl (read-only streaming) for .xlsx, xlrd for .xls.
+    """
+    if importlib.util.find_spec("python_calamine") is not None:
+        return "calamine"
+    return "xlrd" if filename.lower().endswith(".xls") else "openpyxl"
+
+
+def list_excel_sheets(source: Source, engine: str) -> List[str]:
+    if engine == "openpyxl":
+        from openpyxl import load_workbook
+
+        wb = load_workbook(rewind(source), read_only=True)
+        try:
+            return wb.sheetnames
+        finally:
+            wb.close()
+
+    with pd.ExcelFile(rewind(source), engine=engine) as xl:
+        return [str(name) for name in xl.sheet_names]
+
+
+def _header_names(header: tuple) -> List[str]:
+    # Same naming pandas uses for blank / repeated header cells
+    names, seen = [], {}
+    for i, value in enumerate(header):
+        name = f"Unnamed: {i}" if value is None else str(value)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def _read_sheet_openpyxl(source: Source, sheet_name: str, max_rows: Optional[int]) -> pd.DataFrame:
+    from openpyxl import load_workbook
+
+    wb = load_workbook(rewind(source), read_only=True, data_only=True, keep_links=False)
+    try:
+        ws = wb[sheet_name]
+        # Some writers store bogus dimensions; read-only mode trusts them
+        ws.reset_dimensions()
+
+        rows = ws.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame()
+
+        records = (r for r in rows if any(v is not None for v in r))
+        records = list(itertools.islice(records, max_rows))
+        return pd.DataFrame.from_records(records, columns=_header_names(header))
+    finally:
+        wb.close()
+
+
+def read_excel_sheet(
+    source: Source, sheet_name: str, max_rows: Optional[int], engine: str
+) -> Dict[str, Any]:
+    """
+    Parse one sheet. Module-level so it can run in a worker process.
+    """
+    start = time.perf_counter()
+
+    if engine == "openpyxl":
+        df = _read_sheet_openpyxl(source, sheet_name, max_rows)
+    else:
+        df = pd.read_excel(rewind(source), sheet_name=sheet_name, nrows=max_rows, engine=engine)
+
+    return {
+        "name": sheet_name,
+        "df": df,
+        "engine": engine,
+        "parse_seconds": round(time.perf_counter() - start, 4),
+    }
+
+
+def read_excel_sheets(
+    source: Source,
+    max_rows: Optional[int] = 10000,
+    max_workers: int = EXCEL_SHEET_WORKERS,
+    filename: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Read every sheet of a workbook as its own table, in sheet order.
+    Multi-sheet workbooks above EXCEL_PARALLEL_MIN_BYTES are parsed
+    in a process pool (one sheet per task).
+    `filename` picks the .xls reader when the source is a buffer.
+    """
+    engine = excel_engine(filename or (source if isinstance(source, str) else ".xlsx"))
+    sheet_names = list_excel_sheets(source, engine)
+
+    max_workers = min(max_workers, os.cpu_count() or 1, len(sheet_names))
+    parallel = (
+        max_workers > 1
+        and source_size(source) >= EXCEL_PARALLEL_MIN_BYTES
+    )
+    if not parallel:
+        return [read_excel_sheet(source, name, max_rows, engine) for name in sheet_names]
+
+    # In-memory buffers are pickled to the workers
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = [
+            pool.submit(read_excel_sheet, source, name, max_rows, engine)
+            for name in sheet_names
+        ]
+        return [f.result() for f in futures]
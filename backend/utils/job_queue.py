@@ -0,0 +1,183 @@
+"""
+====================================================
+INSIGHTIFY – BACKGROUND JOB QUEUE
+====================================================
+
+Runs long uploads / dashboard builds outside the HTTP
+request so large files don't hit proxy timeouts.
+
+✔ Request returns a job id immediately
+✔ Local worker threads run the job's stages in order
+✔ Per-stage status, progress and timing
+✔ Stages can also be reported from inside a CPU-pool task
+✔ Finished jobs (and their artifacts) expire after a TTL
+====================================================
+"""
+
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager, nullcontext
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from backend.utils.Config import JOB_WORKERS, JOB_RESULT_TTL_SECONDS
+
+
+class Job:
+    def __init__(self, kind: str, stage_names: List[str]):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = "queued"
+        self.stages = [
+            {"name": name, "status": "pending", "seconds": None} for name in stage_names
+        ]
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def progress(self) -> float:
+        done = sum(1 for s in self.stages if s["status"] == "done")
+        return round(done / len(self.stages), 3) if self.stages else 0.0
+
+    def as_dict(self, include_result: bool = True) -> Dict[str, Any]:
+        data = {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "progress": self.progress,
+            "stages": [dict(s) for s in self.stages],
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+        }
+        if include_result and self.status == "done":
+            data["result"] = self.result
+        return data
+
+
+class JobContext:
+    """Handed to the job function so it can report stage progress."""
+
+    def __init__(self, job: Job, lock: threading.Lock):
+        self._job = job
+        self._lock = lock
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        entry = next((s for s in self._job.stages if s["name"] == name), None)
+        if entry is None:
+            entry = {"name": name, "status": "pending", "seconds": None}
+            with self._lock:
+                self._job.stages.append(entry)
+
+        start = time.perf_counter()
+        with self._lock:
+            entry["status"] = "running"
+        try:
+            yield
+        except Exception:
+            with self._lock:
+                entry["status"] = "failed"
+                entry["seconds"] = round(time.perf_counter() - start, 4)
+            raise
+        with self._lock:
+            entry["status"] = "done"
+            entry["seconds"] = round(time.perf_counter() - start, 4)
+
+    def follow(self, future: Future, channel) -> Any:
+        """
+        Wait for a CPU-pool task that `put`s stage names on `channel`
+        (executors.stage_channel) as it goes. Each name starts that
+        stage and finishes the previous one, so progress is live even
+        though the work runs in another process. Returns the task's
+        result; if it raises, the stage it was in is marked failed.
+        """
+        # The task's own puts all happen before it finishes, so this
+        # end marker is always read last
+        future.add_done_callback(lambda _: channel.put(None))
+        with ExitStack() as current:
+            for name in iter(channel.get, None):
+                current.close()
+                current.enter_context(self.stage(name))
+            return future.result()
+
+
+def track_stage(ctx: Optional[JobContext], name: str):
+    """`with track_stage(ctx, "pdf"):` — a no-op outside of jobs."""
+    return ctx.stage(name) if ctx is not None else nullcontext()
+
+
+class JobQueue:
+    def __init__(self, max_workers: int = JOB_WORKERS, ttl_seconds: int = JOB_RESULT_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="insightify-job")
+
+    def submit(self, kind: str, stage_names: List[str], fn: Callable, *args, **kwargs) -> Job:
+        """
+        Queue `fn(ctx, *args, **kwargs)`; its return value becomes
+        the job result (kept until the TTL expires).
+        """
+        self._expire()
+
+        job = Job(kind, stage_names)
+        with self._lock:
+            self._jobs[job.id] = job
+
+        self._pool.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def _run(self, job: Job, fn: Callable, args: tuple, kwargs: dict) -> None:
+        with self._lock:
+            job.status = "running"
+            job.started_at = time.time()
+        try:
+            result = fn(JobContext(job, self._lock), *args, **kwargs)
+            with self._lock:
+                job.result = result
+                job.status = "done"
+                job.finished_at = time.time()
+        except Exception as e:
+            traceback.print_exc()
+            with self._lock:
+                job.error = str(e)
+                job.status = "failed"
+                job.finished_at = time.time()
+
+    def describe(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Consistent snapshot of a job for the status endpoint."""
+        self._expire()
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.as_dict() if job is not None else None
+
+    def _expire(self) -> None:
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job.finished_at is not None and job.finished_at < cutoff
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+
+    def stats(self) -> Dict[str, Any]:
+        self._expire()
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+            return {"jobs": len(self._jobs), "by_status": counts, "ttl_seconds": self.ttl_seconds}
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+job_queue = JobQueue()
@@ -0,0 +1,484 @@
+"""
+====================================================
+INSIGHTIFY – LOCAL QUESTION ANSWERING
+====================================================
+
+Common analytical questions ("Which Segment made the
+highest Sales?", "Show me the top 5 Country by Profit",
+"What is the total Sales?", "Compare Sales and Profit")
+are answered from the data itself, in milliseconds; only
+questions that do not parse go to the LLM.
+
+✔ One compiled intent router (chart / summary / query /
+  llm) replaces the separate keyword scans
+✔ Column names and category values of the dataset are
+  recognised in the question (matchers memoized per
+  column set)
+✔ Families: top-k / bottom-k, highest / lowest, totals,
+  averages, counts, group-bys, comparisons, filters
+✔ Unfiltered aggregates go through the aggregation
+  planner (profile first, then memoized per frame)
+====================================================
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.utils.aggregation_planner import Aggregate, resolve
+from backend.utils.column_profile import profile_for, value_counts
+from backend.utils.frame_cache import frame_cache
+
+
+# ============================
+# INTENT ROUTER
+# ============================
+# Keywords that indicate user wants charts
+CHART_KEYWORDS = [
+    "chart", "graph", "plot", "bar chart", "pie chart", "line chart",
+    "dashboard", "visualize", "visualization", "show me", "create a",
+    "generate", "make a", "build a"
+]
+# Only a chart request when the question is not an analytical one
+# ("Show me the top 5 Country by Sales" is answered from the data)
+WEAK_CHART_KEYWORDS = ["show me", "create a", "generate", "make a", "build a"]
+
+SUMMARY_KEYWORDS = [
+    "summary", "summarize", "overview", "analyze", "analysis", "insights",
+    "explain", "describe", "tell me about", "what is in the data",
+    "detailed summary", "comprehensive"
+]
+
+# Whole words only: "max" must not fire inside "maximize"
+OPERATION_KEYWORDS = {
+    "top": ["top", "highest", "most", "largest", "biggest", "best", "maximum", "max"],
+    "bottom": ["bottom", "lowest", "least", "smallest", "worst", "minimum", "min"],
+    "total": ["total", "sum", "overall"],
+    "average": ["average", "mean", "avg"],
+    "count": ["how many", "count", "number of"],
+    "compare": ["compare", "comparison", "versus", "vs", "difference between"],
+    "group": ["by", "per", "for each", "each", "breakdown", "split"],
+}
+
+
+def _alternation(words: List[str]) -> str:
+    return "|".join(re.escape(w) for w in sorted(words, key=len, reverse=True))
+
+
+def _compile_router() -> "re.Pattern[str]":
+    strong_chart = [k for k in CHART_KEYWORDS if k not in WEAK_CHART_KEYWORDS]
+    groups = [
+        # Substrings, as before ("charts", "plotting" still count)
+        f"(?P<chart>{_alternation(strong_chart)})",
+        f"(?P<weak_chart>{_alternation(WEAK_CHART_KEYWORDS)})",
+        f"(?P<summary>{_alternation(SUMMARY_KEYWORDS)})",
+    ]
+    groups += [f"(?P<{op}>\\b(?:{_alternation(words)})\\b)" for op, words in OPERATION_KEYWORDS.items()]
+    # Zero-width, so overlapping keywords are all seen
+    return re.compile(f"(?=(?:{'|'.join(groups)}))")
+
+
+_ROUTER = _compile_router()
+
+
+@lru_cache(maxsize=1024)
+def keyword_intents(question: str) -> Set[str]:
+    """Router groups present in the question ("chart", "summary", "top", ...)."""
+    return {m.lastgroup for m in _ROUTER.finditer(question.lower())}
+
+
+class Query(NamedTuple):
+    op: str  # top | bottom | extreme | aggregate | group | compare
+    func: str  # sum | mean | count | max | min
+    measures: Tuple[str, ...]
+    dimension: Optional[str]
+    k: int
+    filters: Tuple[Tuple[str, Tuple[Any, ...]], ...]  # ((column, values), ...)
+
+
+class Intent(NamedTuple):
+    kind: str  # chart | summary | query | llm
+    query: Optional[Query] = None
+
+
+def route_question(
+    question: str, df: Optional[pd.DataFrame] = None, profile: Optional[Dict[str, Any]] = None
+) -> Intent:
+    """
+    Explicit chart words win; then a question that parses into a
+    local query; then summary words; then the weak chart phrases;
+    everything else goes to the LLM.
+    """
+    found = keyword_intents(question)
+    if "chart" in found:
+        return Intent("chart")
+    if df is not None and not df.empty:
+        query = parse_query(question, df, profile, found)
+        if query is not None:
+            return Intent("query", query)
+    if "summary" in found:
+        return Intent("summary")
+    if "weak_chart" in found:
+        return Intent("chart")
+    return Intent("llm")
+
+
+# ============================
+# PARSER
+# ============================
+def _normalize(text: str) -> str:
+    return re.sub(r"[\s_]+", " ", text.lower()).strip()
+
+
+@lru_cache(maxsize=256)
+def _name_matcher(names: Tuple[str, ...]) -> Optional["re.Pattern[str]"]:
+    """Longest names first, so "Unit Price" wins over "Price"."""
+    if not names:
+        return None
+    ordered = sorted(set(names), key=len, reverse=True)
+    return re.compile(rf"(?<!\w)(?:{_alternation(ordered)})(?!\w)")
+
+
+def _find(names: List[str], text: str) -> List[str]:
+    """`names` mentioned in `text` (normalized), in order of appearance."""
+    normalized = {_normalize(str(n)): n for n in names}
+    matcher = _name_matcher(tuple(k for k in normalized if k))
+    if matcher is None:
+        return []
+    found = []
+    for m in matcher.finditer(text):
+        name = normalized[m.group()]
+        if name not in found:
+            found.append(name)
+    return found
+
+
+def _category_values(profile: Dict[str, Any], column: str) -> List[Any]:
+    """Every value of a low-cardinality column ([] when the profile lacks some)."""
+    counts = value_counts(profile, column)
+    return [] if counts is None else list(counts.index)
+
+
+_K_NUMBER = re.compile(r"\b(?:top|bottom|first|last|best|worst)\s+(\d+)\b")
+
+_KEYWORDS = re.compile(
+    rf"\b(?:{_alternation([w for words in OPERATION_KEYWORDS.values() for w in words])})\b"
+)
+
+# Values that read as ordinary words; like numbers, they are only
+# filters right after a filter word or their own column's name
+# ("where Churn is No", "Quarter = 3", "in Quarter 2")
+AMBIGUOUS_VALUES = {"no", "yes", "all", "none", "true", "false", "other", "null", "unknown", "na", "n/a"}
+_AFTER_FILTER_WORD = re.compile(r"(?:\b(?:in|for|where|is|equals)|=)\s*$")
+
+_NEGATION = re.compile(r"\b(?:no|not|without|never|except|excluding)\b")
+
+# Conditions the parser cannot express; left over after parsing they
+# mean the question is not the whole-frame answer, so it goes to the LLM
+_MONTHS = (
+    "january|february|march|april|june|july|august|september|october|november|december"
+    "|jan|feb|mar|apr|jun|jul|aug|sep|sept|oct|nov|dec"
+)
+_UNPARSED = re.compile(
+    r"\d"  # years, dates, thresholds, any other number
+    r"|[<>]|\b(?:above|below|over|under|between|exceeding|more than|less than|greater than"
+    r"|fewer than|at least|at most|before|after|since|until)\b"
+    rf"|\b(?:{_MONTHS})\b|\b(?:in|for|during|of)\s+may\b"
+    r"|\b(?:days?|daily|weeks?|weekly|months?|monthly|quarters?|quarterly|years?|yearly|annual(?:ly)?)\b"
+)
+_RELATIVE_TIME = re.compile(
+    r"\b(?:last|this|next|past|previous|current)\s+(?:\d+\s+)?(?:days?|weeks?|months?|quarters?|years?)\b"
+    r"|\b(?:yesterday|today|tomorrow|ytd|mtd|qtd|year to date|month to date)\b"
+)
+
+
+def _take_k(text: str, default: int) -> int:
+    m = _K_NUMBER.search(text)
+    return int(m.group(1)) if m else default
+
+
+def _blank(text: str, pattern: Optional["re.Pattern[str]"]) -> str:
+    """`text` with every match of `pattern` spaced out (positions kept)."""
+    if pattern is None:
+        return text
+    return pattern.sub(lambda m: " " * len(m.group()), text)
+
+
+def _is_ambiguous(value: Any) -> bool:
+    name = _normalize(str(value))
+    return name in AMBIGUOUS_VALUES or re.fullmatch(r"[\d.,\-]+", name) is not None
+
+
+def _find_values(
+    column: str, values: List[Any], text: str, original: str
+) -> List[Tuple[Any, Tuple[int, int]]]:
+    """
+    (value, span) of each `column` value named in `text`, in order
+    of appearance; `original` is `text` before blanking, for the
+    filter word check.
+    """
+    own_name = re.compile(rf"(?<!\w){re.escape(_normalize(str(column)))}\s*$")
+    by_name = {_normalize(str(v)): v for v in values if str(v).strip()}
+    matcher = _name_matcher(tuple(by_name))
+    if matcher is None:
+        return []
+    found: List[Tuple[Any, Tuple[int, int]]] = []
+    for m in matcher.finditer(text):
+        value = by_name[m.group()]
+        before = original[:m.start()]
+        if _is_ambiguous(value) and not (_AFTER_FILTER_WORD.search(before) or own_name.search(before)):
+            continue
+        if all(value != v for v, _ in found):
+            found.append((value, m.span()))
+    return found
+
+
+def parse_query(
+    question: str, df: pd.DataFrame, profile: Optional[Dict[str, Any]] = None, found: Optional[Set[str]] = None
+) -> Optional[Query]:
+    """The question as a local Query, or None when it does not parse."""
+    profile = profile_for(df, profile)
+    found = keyword_intents(question) if found is None else found
+    text = _normalize(question)
+
+    numeric = [c for c in profile["numeric_columns"] if c in df.columns]
+    dimensions = [
+        c for c in profile["categorical_columns"]
+        if c in df.columns and c not in profile["datetime_columns"]
+    ]
+    mentioned = _find(numeric + dimensions, text)
+    measures = tuple(c for c in mentioned if c in numeric)
+    dims = [c for c in mentioned if c in dimensions]
+
+    # Category values named in the question become filters
+    # ("... for Consumer", "compare France and Spain"), matched on
+    # what is left once column names, k and keywords are taken
+    rest = _blank(text, _name_matcher(tuple(_normalize(str(c)) for c in mentioned)))
+    rest = _blank(rest, _K_NUMBER)
+    rest = _blank(rest, _KEYWORDS)
+    filters: Dict[str, List[Any]] = {}
+    for col in dimensions:
+        hits = _find_values(col, _category_values(profile, col), rest, text)
+        if hits:
+            filters[col] = [v for v, _ in hits]
+            for _, span in hits:
+                rest = rest[:span[0]] + " " * (span[1] - span[0]) + rest[span[1]:]
+    # "no", "not", "without", "in 2020", "above 500", "last month" ...
+    # are conditions this parser cannot express; answering over every
+    # row would give a confident wrong number
+    if _NEGATION.search(rest) or _UNPARSED.search(rest) or _RELATIVE_TIME.search(text):
+        return None
+
+    if not measures and not dims and not filters:
+        return None
+    # "where Quarter = 3" names Quarter to filter it, not to group by it
+    dims = [c for c in dims if len(filters.get(c, ())) != 1]
+
+    if "count" in found and measures and not {"total", "average"} & found:
+        return None  # "how many ... Sales": a condition on Sales, not its total
+    func = "mean" if "average" in found else "count" if "count" in found else "sum"
+    dimension = dims[0] if dims else None
+
+    if "compare" in found:
+        if len(measures) >= 2:
+            return Query("compare", func, measures, None, 0, _frozen(filters))
+        compared = next((c for c, v in filters.items() if len(v) >= 2), None)
+        if not measures and func != "count":
+            return None  # nothing to compare the values on
+        if compared is not None:
+            # Filter to the compared values, grouped by their column
+            others = {c: v for c, v in filters.items() if c != compared}
+            return Query("group", func, measures[:1], compared, len(filters[compared]),
+                         _frozen({**others, compared: filters[compared]}))
+        if measures and dimension:
+            return Query("group", func, measures[:1], dimension, 0, _frozen(filters))
+        return None
+
+    if _K_NUMBER.search(text) and (dimension is None or not {"top", "bottom"} & found):
+        return None  # "average Sales of the top 10 orders": not a ranking over a column
+
+    for direction in ("top", "bottom"):
+        if direction not in found:
+            continue
+        if dimension is not None and (measures or func == "count"):
+            k = _take_k(text, 1 if re.search(r"\b(?:which|what|who)\b", text) else 5)
+            return Query(direction, func, measures[:1], dimension, k, _frozen(filters))
+        if measures and func == "sum" and "total" not in found:
+            # "What is the highest Sales?" – a single value
+            return Query("extreme", "max" if direction == "top" else "min", measures[:1], None, 1, _frozen(filters))
+
+    if measures or func == "count":
+        grouped = dimension is not None and ("group" in found or {"total", "average", "count"} & found)
+        if grouped:
+            return Query("group", func, measures[:1], dimension, 0, _frozen(filters))
+        if {"total", "average", "count"} & found:
+            return Query("aggregate", func, measures[:1], None, 0, _frozen(filters))
+    return None
+
+
+def _frozen(filters: Dict[str, List[Any]]) -> Tuple[Tuple[str, Tuple[Any, ...]], ...]:
+    return tuple((c, tuple(v)) for c, v in filters.items())
+
+
+# ============================
+# EXECUTOR
+# ============================
+FUNC_LABELS = {"sum": "total", "mean": "average", "count": "number of rows", "max": "highest", "min": "lowest"}
+
+
+def _fmt(value: Any) -> str:
+    if isinstance(value, (int, float)) or hasattr(value, "dtype"):
+        value = float(value)
+        if value.is_integer() and abs(value) < 1e15:
+            return f"{int(value):,}"
+        return f"{value:,.2f}"
+    return str(value)
+
+
+def _json_value(value: Any) -> Any:
+    """JSON-safe scalar for the `data` records."""
+    if hasattr(value, "item"):
+        value = value.item()
+    return value
+
+
+def _describe_filters(filters) -> str:
+    if not filters:
+        return ""
+    parts = [f"{c} = {' or '.join(map(str, v))}" for c, v in filters]
+    return " where " + " and ".join(parts)
+
+
+def _codes(df: pd.DataFrame, column: str) -> Tuple[np.ndarray, pd.Index]:
+    """Factorized column, memoized per frame: filters become integer lookups."""
+    cache = frame_cache(df)
+    key = ("query_codes", column)
+    if key not in cache:
+        cache[key] = pd.factorize(df[column])
+    return cache[key]
+
+
+def _apply_filters(df: pd.DataFrame, filters, columns: List[str]) -> pd.DataFrame:
+    """
+    Rows matching every filter, `columns` only. Categorical columns
+    are rebuilt from their memoized codes rather than copied.
+    """
+    if not filters:
+        return df
+    mask = np.ones(len(df), dtype=bool)
+    for col, values in filters:
+        codes, uniques = _codes(df, col)
+        # Code -1 (missing) reads the last, always-False slot
+        wanted = np.zeros(len(uniques) + 1, dtype=bool)
+        wanted[uniques.get_indexer(list(values))] = True
+        wanted[-1] = False
+        mask &= wanted[codes]
+    subset = {}
+    for col in columns:
+        if pd.api.types.is_numeric_dtype(df[col]):
+            subset[col] = df[col].to_numpy()[mask]
+        else:
+            codes, uniques = _codes(df, col)
+            # Plain labels: a CategoricalIndex here would be re-sorted
+            # into its categories' order and no longer match the codes
+            subset[col] = pd.Categorical.from_codes(codes[mask], categories=np.asarray(uniques))
+    return pd.DataFrame(subset, index=pd.RangeIndex(int(mask.sum())))
+
+
+def _grouped(frame: pd.DataFrame, profile: Optional[Dict[str, Any]], query: Query) -> pd.Series:
+    if query.func == "count":
+        codes, uniques = _codes(frame, query.dimension)
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        return pd.Series(counts, index=uniques).loc[lambda s: s > 0]
+    agg = Aggregate(query.measures[0], query.func, query.dimension)
+    return resolve({"value": agg}, frame, profile)["value"]
+
+
+def _label(query: Query, capital: bool = False) -> str:
+    word = FUNC_LABELS[query.func]
+    word = word[:1].upper() + word[1:] if capital else word
+    return word if query.func == "count" else f"{word} {query.measures[0]}"
+
+
+def execute_query(df: pd.DataFrame, query: Query, profile: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    {"answer": text, "data": [records]} for a parsed Query.
+    Filters select rows first; the unfiltered frame uses the
+    profile and the per-frame aggregate memo.
+    """
+    needed = list(dict.fromkeys([*query.measures, *([query.dimension] if query.dimension else [])]))
+    if not needed and query.filters:
+        needed = [query.filters[0][0]]  # counting rows still keeps one column
+    frame = _apply_filters(df, query.filters, needed)
+    # The profile and aggregate memo describe the whole frame only
+    profile = profile_for(df, profile) if frame is df else None
+    where = _describe_filters(query.filters)
+    if not len(frame):
+        return {"answer": f"No rows match{where}.", "data": []}
+
+    if query.op == "compare":
+        needs = {(m, f): Aggregate(m, f) for m in query.measures for f in ("sum", "mean")}
+        values = resolve(needs, frame, profile)
+        rows = [
+            {"column": m, "total": float(values[m, "sum"]), "average": float(values[m, "mean"])}
+            for m in query.measures
+        ]
+        parts = [f"{r['column']}: total {_fmt(r['total'])}, average {_fmt(r['average'])}" for r in rows]
+        answer = "; ".join(parts)
+        if len(query.measures) == 2:
+            corr = frame[list(query.measures)].corr().iloc[0, 1]
+            if pd.notna(corr):
+                answer += f"; correlation {corr:.2f}"
+                rows.append({"column": "correlation", "total": None, "average": float(corr)})
+        return {"answer": f"{answer}{where}.", "data": rows}
+
+    if query.op == "extreme":
+        m = query.measures[0]
+        value = frame[m].max() if query.func == "max" else frame[m].min()
+        return {"answer": f"The {FUNC_LABELS[query.func]} {m}{where} is {_fmt(value)}.", "data": [{m: _json_value(value)}]}
+
+    if query.op == "aggregate":
+        if query.func == "count":
+            value = len(frame)
+            return {"answer": f"There are {_fmt(value)} rows{where}.", "data": [{"rows": value}]}
+        m = query.measures[0]
+        value = resolve({"value": Aggregate(m, query.func)}, frame, profile)["value"]
+        return {"answer": f"The {_label(query)}{where} is {_fmt(value)}.", "data": [{m: _json_value(value)}]}
+
+    series = _grouped(frame, profile, query)
+    value_name = query.measures[0] if query.measures else "rows"
+    if query.op in ("top", "bottom"):
+        series = series.sort_values(ascending=query.op == "bottom").head(query.k)
+    else:
+        series = series.sort_values(ascending=False)
+    data = [{query.dimension: _json_value(k), value_name: _json_value(v)} for k, v in series.items()]
+
+    if query.op in ("top", "bottom") and query.k == 1 and len(series):
+        word = "highest" if query.op == "top" else "lowest"
+        answer = (
+            f"{series.index[0]} has the {word} {_label(query)}{where} "
+            f"({_fmt(series.iloc[0])})."
+        )
+    else:
+        items = ", ".join(f"{k} ({_fmt(v)})" for k, v in series.items())
+        if query.op in ("top", "bottom"):
+            head = f"{'Top' if query.op == 'top' else 'Bottom'} {len(series)} {query.dimension} by {_label(query)}"
+        else:
+            head = f"{_label(query, capital=True)} by {query.dimension}"
+        answer = f"{head}{where}: {items}."
+    return {"answer": answer, "data": data}
+
+
+def answer_locally(
+    question: str, df: pd.DataFrame, profile: Optional[Dict[str, Any]] = None
+) -> Optional[Dict[str, Any]]:
+    """Answer + data when the question parses, else None (ask the LLM)."""
+    intent = route_question(question, df, profile)
+    if intent.kind != "query":
+        return None
+    result = execute_query(df, intent.query, profile)
+    result["intent"] = intent.query.op
+    return result
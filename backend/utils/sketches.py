@@ -0,0 +1,300 @@
+"""
+====================================================
+INSIGHTIFY – MERGEABLE STREAMING SKETCHES
+====================================================
+
+Fixed-size summaries of a column that are updated one
+chunk at a time and merged across chunks / workers
+without going back to the rows.
+
+✔ HyperLogLog      → distinct count
+    relative std. error ≈ 1.04 / sqrt(2^precision)
+    (precision 12 → ≈ 1.6%, 4KB per column)
+✔ QuantileSketch   → quantiles (KLL-style compactors)
+    rank error ≈ 1 / k of the row count in practice
+    (k = 200 → within ±0.5% rank on 1M rows)
+✔ HeavyHitters     → top-k values (Misra-Gries)
+    each count is under-estimated by at most
+    rows / (capacity + 1); exact while the column has
+    at most `capacity` distinct values
+====================================================
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from backend.utils.Config import (
+    SKETCH_HLL_PRECISION, SKETCH_QUANTILE_K, SKETCH_TOP_K_CAPACITY,
+)
+
+
+def hash_values(series: pd.Series) -> np.ndarray:
+    """64-bit hashes of the non-null values of a column."""
+    return pd.util.hash_pandas_object(series.dropna(), index=False).to_numpy(dtype=np.uint64)
+
+
+def hash_distinct(values: pd.Index) -> np.ndarray:
+    """Hashes of already-distinct values (skips pandas' factorize step)."""
+    return pd.util.hash_array(values.to_numpy(dtype=object), categorize=False)
+
+
+def value_counts(series: pd.Series) -> pd.Series:
+    try:
+        return series.value_counts()
+    except TypeError:
+        # Unhashable cells (lists / dicts from JSON uploads)
+        return series.astype(str).value_counts()
+
+
+# ============================
+# DISTINCT COUNT
+# ============================
+class HyperLogLog:
+    def __init__(self, precision: int = SKETCH_HLL_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add_hashes(self, hashes: np.ndarray) -> None:
+        if not len(hashes):
+            return
+        p = np.uint64(self.precision)
+        index = (hashes >> (np.uint64(64) - p)).astype(np.intp)
+
+        # Rank = leading zeros + 1 of the next 32 bits (exact in float64)
+        rest = ((hashes << p) >> np.uint64(32)).astype(np.float64)
+        rank = np.where(rest > 0, 32 - np.floor(np.log2(np.maximum(rest, 1))), 33).astype(np.uint8)
+
+        np.maximum.at(self.registers, index, rank)
+
+    def update(self, series: pd.Series) -> None:
+        self.add_hashes(hash_values(series))
+
+    def merge(self, other: "HyperLogLog") -> None:
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches of different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            # Small-range correction (linear counting)
+            return int(round(m * np.log(m / zeros)))
+        return int(round(raw))
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / np.sqrt(len(self.registers))
+
+
+# ============================
+# QUANTILES
+# ============================
+class QuantileSketch:
+    """
+    Levels of sorted compactors: level h holds items of weight 2^h.
+    A level that reaches `k` items is sorted and every other item
+    (random offset) is promoted to the next level.
+    """
+
+    def __init__(self, k: int = SKETCH_QUANTILE_K, seed: Optional[int] = None):
+        self.k = k
+        self.levels: List[np.ndarray] = [np.empty(0)]
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values: Iterable[float]) -> None:
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        self.count += len(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compact()
+
+    def _compact(self) -> None:
+        h = 0
+        while h < len(self.levels):
+            level = self.levels[h]
+            if len(level) >= self.k:
+                level = np.sort(level)
+                # An odd item stays behind so no weight is lost
+                keep = level[-1:] if len(level) % 2 else level[:0]
+                pairs = level[: len(level) - len(keep)]
+                promoted = pairs[self._rng.integers(2)::2]
+
+                self.levels[h] = keep
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+            h += 1
+
+    def merge(self, other: "QuantileSketch") -> None:
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for h, level in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], level])
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compact()
+
+    def quantiles(self, qs: Iterable[float]) -> Dict[float, Optional[float]]:
+        if not self.count:
+            return {q: None for q in qs}
+
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([
+            np.full(len(level), 2.0 ** h) for h, level in enumerate(self.levels)
+        ])
+        order = np.argsort(items, kind="stable")
+        items, cumulative = items[order], np.cumsum(weights[order])
+
+        result = {}
+        for q in qs:
+            if q <= 0:
+                result[q] = self.min
+            elif q >= 1:
+                result[q] = self.max
+            else:
+                pos = np.searchsorted(cumulative, q * cumulative[-1])
+                result[q] = float(items[min(pos, len(items) - 1)])
+        return result
+
+
+# ============================
+# TOP-K
+# ============================
+class HeavyHitters:
+    """Misra-Gries summary with at most `capacity` tracked values."""
+
+    def __init__(self, capacity: int = SKETCH_TOP_K_CAPACITY):
+        self.capacity = capacity
+        self.counts: Dict[Any, int] = {}
+        self.count = 0
+        self.error = 0  # upper bound on how much any count is under-estimated
+
+    def update(self, series: pd.Series) -> None:
+        self.update_counts(value_counts(series))
+
+    def update_counts(self, counts: pd.Series) -> None:
+        """Add a chunk's value_counts() (sorted, most frequent first)."""
+        total = int(counts.sum())
+        if len(counts) > self.capacity:
+            # Summarise the chunk to `capacity` counters first, so the
+            # merge below never walks every distinct value of the chunk
+            cut = int(counts.iloc[self.capacity])
+            counts = counts.iloc[: self.capacity] - cut
+            counts = counts[counts > 0]
+            self.error += cut
+        self._add(dict(zip(counts.index.tolist(), counts.tolist())), total)
+
+    def _add(self, counts: Dict[Any, int], total: int) -> None:
+        merged = dict(self.counts)
+        for value, count in counts.items():
+            merged[value] = merged.get(value, 0) + count
+        self.count += total
+
+        if len(merged) > self.capacity:
+            ranked = sorted(merged.values(), reverse=True)
+            cut = ranked[self.capacity]
+            merged = {v: c - cut for v, c in merged.items() if c > cut}
+            self.error += cut
+        self.counts = merged
+
+    def merge(self, other: "HeavyHitters") -> None:
+        self.error += other.error
+        self._add(other.counts, other.count)
+
+    def top(self, k: int) -> List[Dict[str, Any]]:
+        ranked = sorted(self.counts.items(), key=lambda item: item[1], reverse=True)
+        return [{"value": value, "count": count} for value, count in ranked[:k]]
+
+
+# ============================
+# PER-DATASET SKETCHES
+# ============================
+class ColumnSketch:
+    def __init__(self, numeric: bool):
+        self.numeric = numeric
+        self.rows = 0
+        self.nulls = 0
+        self.distinct = HyperLogLog()
+        self.quantiles = QuantileSketch() if numeric else None
+        self.top = None if numeric else HeavyHitters()
+
+    def update(self, series: pd.Series) -> None:
+        self.rows += len(series)
+        self.nulls += int(series.isna().sum())
+        if self.quantiles is not None:
+            self.distinct.update(series)
+            self.quantiles.update(series.to_numpy(dtype=np.float64, na_value=np.nan))
+        else:
+            # Hash each distinct value of the chunk once
+            counts = value_counts(series)
+            self.distinct.add_hashes(hash_distinct(counts.index))
+            self.top.update_counts(counts)
+
+    def merge(self, other: "ColumnSketch") -> None:
+        self.rows += other.rows
+        self.nulls += other.nulls
+        self.distinct.merge(other.distinct)
+        if self.quantiles is not None and other.quantiles is not None:
+            self.quantiles.merge(other.quantiles)
+        elif self.top is not None and other.top is not None:
+            self.top.merge(other.top)
+
+
+class DatasetSketch:
+    """
+    One ColumnSketch per column, fed chunk by chunk during
+    ingestion (or from a large in-memory frame in slices).
+    """
+
+    def __init__(self):
+        self.columns: Dict[str, ColumnSketch] = {}
+        self.rows = 0
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        self.rows += len(chunk)
+        for col in chunk.columns:
+            series = chunk[col]
+            sketch = self.columns.get(col)
+            if sketch is None:
+                numeric = (
+                    pd.api.types.is_numeric_dtype(series)
+                    and not pd.api.types.is_bool_dtype(series)
+                )
+                sketch = self.columns[col] = ColumnSketch(numeric)
+                # Column first seen mid-stream: earlier rows were missing
+                sketch.rows = sketch.nulls = self.rows - len(chunk)
+            sketch.update(series)
+
+        for col, sketch in self.columns.items():
+            if col not in chunk.columns:
+                sketch.rows += len(chunk)
+                sketch.nulls += len(chunk)
+
+    def merge(self, other: "DatasetSketch") -> None:
+        for col, sketch in other.columns.items():
+            if col in self.columns:
+                self.columns[col].merge(sketch)
+            else:
+                self.columns[col] = sketch
+        self.rows += other.rows
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, chunk_rows: int) -> "DatasetSketch":
+        sketch = cls()
+        for start in range(0, len(df), chunk_rows):
+            sketch.update(df.iloc[start:start + chunk_rows])
+        return sketch
@@ -0,0 +1,960 @@
+"""
+====================================================
+INSIGHTIFY – SUMMARY ANALYZER REGISTRY
+====================================================
+
+One Analyzer per dataset type (business, HR, ...):
+
+✔ Column-name triggers of every analyzer are compiled
+  once into a single regex (keyword anywhere in a name,
+  or a prefix at the start of a name)
+✔ Insight generators run lazily, in priority order,
+  one sentence (or a few) each
+✔ A per-request time budget: when it runs out, the
+  summary returns what it has so far (truncated=True)
+✔ Aggregates are declared per analyzer and computed on
+  first use by the aggregation planner
+
+Detection order = analyzer priority; types decided
+from the profile (measurements, catalog) come after
+every name trigger, and "generic" is the fallback.
+====================================================
+"""
+
+import re
+import time
+from functools import lru_cache
+from typing import (
+    Any, Callable, Dict, FrozenSet, Hashable, Iterable, List, Optional, Sequence, Set, Tuple, Union,
+)
+
+import pandas as pd
+
+from backend.utils.Config import (
+    SUMMARY_TIME_BUDGET_SECONDS, SUMMARY_FAST_SAMPLE_ROWS, SUMMARY_FAST_REPLICATES,
+    TIME_SERIES_MIN_SEASONALITY, TIME_SERIES_MAX_TREND_COLUMNS,
+)
+from backend.utils.aggregation_planner import Aggregate, resolve, served_by_profile
+from backend.utils.associations import find_associations
+from backend.utils.column_profile import (
+    profile_for, stat, quantile, top_values, non_null, value_counts, count_values,
+)
+from backend.utils.frame_cache import frame_cache
+from backend.utils.summary_sampling import annotate_errors, sample_info, stratified_sample
+from backend.utils.time_features import first_time_feature, first_time_feature_name
+from backend.utils.time_series import MIN_TREND_R2, analyze_time_series
+
+
+class SummaryContext:
+    """What an insight generator can read; aggregates resolve on first use."""
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        profile: Dict[str, Any],
+        needs: Dict[Hashable, Aggregate],
+        rows: Optional[int] = None,
+    ):
+        """
+        `rows` is the size of the full dataset when `df` is a sample
+        of it (fast mode); counts and sums computed from `df` are then
+        scaled by `scale`. The profile always describes the full data.
+        """
+        self.df = df
+        self.profile = profile
+        self.rows, self.cols = (rows if rows is not None else len(df)), len(df.columns)
+        self.scale = self.rows / len(df) if len(df) else 1.0
+        self.state: Dict[str, Any] = {}
+        self._needs = needs
+        self._agg: Optional[Dict[Hashable, Any]] = None
+
+    @property
+    def agg(self) -> Dict[Hashable, Any]:
+        if self._agg is None:
+            self._agg = resolve(self._needs, self.df, self.profile)
+            if self.scale != 1.0:
+                for name, agg in self._needs.items():
+                    if agg.func == "sum" and not served_by_profile(agg, self.profile):
+                        self._agg[name] = self._agg[name] * self.scale
+        return self._agg
+
+
+Insight = Callable[[SummaryContext], Union[str, List[str], None]]
+
+
+class Analyzer:
+    def __init__(
+        self,
+        name: str,
+        priority: int,
+        insights: Iterable[Insight],
+        closing: str = "",
+        keywords: Iterable[str] = (),
+        prefixes: Iterable[str] = (),
+        profile_rule: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        requires: Optional[Callable[[SummaryContext], bool]] = None,
+        aggregates: Optional[Callable[[pd.DataFrame, Dict[str, Any]], Dict[Hashable, Aggregate]]] = None,
+    ):
+        """
+        keywords     – lower-case substrings of a column name
+        prefixes     – lower-case column-name prefixes; a strong signal:
+                       the analyzer is tried first in the summary even
+                       when a higher-priority keyword set the type
+        profile_rule – detection from the profile when no name matches
+        requires     – the analyzer only summarizes when this holds
+                       (otherwise the summary falls back to "generic")
+        aggregates   – declared needs for the aggregation planner
+        """
+        self.name = name
+        self.priority = priority
+        self.insights = list(insights)
+        self.closing = closing
+        self.keywords = tuple(keywords)
+        self.prefixes = tuple(prefixes)
+        self.profile_rule = profile_rule
+        self.requires = requires
+        self.aggregates = aggregates
+
+
+# ============================
+# REGISTRY + COMPILED MATCHER
+# ============================
+ANALYZERS: Dict[str, Analyzer] = {}
+_matcher: Optional["re.Pattern[str]"] = None
+
+GENERIC = "generic"
+SUMMARY_MODES = ("exact", "fast")
+
+
+def register_analyzer(analyzer: Analyzer) -> Analyzer:
+    global _matcher
+    ANALYZERS[analyzer.name] = analyzer
+    _matcher = None  # recompiled on next use
+    _match_names.cache_clear()
+    return analyzer
+
+
+def _by_priority() -> List[Analyzer]:
+    return sorted(ANALYZERS.values(), key=lambda a: a.priority)
+
+
+def _compile() -> "re.Pattern[str]":
+    """
+    One zero-width alternation tried at every position of the
+    column names, each preceded by a newline. Prefixes match at
+    that newline, so they never compete with a keyword starting
+    at the first letter of the same name.
+    """
+    groups = []
+    for analyzer in _by_priority():
+        if analyzer.keywords:
+            words = "|".join(re.escape(k) for k in analyzer.keywords)
+            groups.append(f"(?P<{analyzer.name}>{words})")
+        if analyzer.prefixes:
+            starts = "|".join(re.escape(p) for p in analyzer.prefixes)
+            groups.append(f"(?P<{analyzer.name}__prefix>\n(?:{starts}))")
+    return re.compile(f"(?=(?:{'|'.join(groups) or '(?!)'}))")
+
+
+def match_columns(columns: Iterable[Any]) -> Tuple[Set[str], Set[str]]:
+    """(analyzers triggered by any trigger, analyzers triggered by a prefix)."""
+    matched, by_prefix = _match_names(tuple(str(c).lower() for c in columns))
+    return set(matched), set(by_prefix)
+
+
+@lru_cache(maxsize=256)
+def _match_names(names: Tuple[str, ...]) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+    # Memoized per column set: the same dataset is matched by every request
+    global _matcher
+    if _matcher is None:
+        _matcher = _compile()
+
+    text = "".join(f"\n{name}" for name in names)
+    matched, by_prefix = set(), set()
+    for m in _matcher.finditer(text):
+        name = m.lastgroup
+        if name.endswith("__prefix"):
+            name = name[: -len("__prefix")]
+            by_prefix.add(name)
+        matched.add(name)
+    return frozenset(matched), frozenset(by_prefix)
+
+
+def detect_type(
+    df: pd.DataFrame, profile: Optional[Dict[str, Any]] = None, matched: Optional[Set[str]] = None
+) -> str:
+    if matched is None:
+        matched, _ = match_columns(df.columns)
+    for analyzer in _by_priority():
+        if analyzer.name in matched:
+            return analyzer.name
+
+    profile = profile_for(df, profile)
+    for analyzer in _by_priority():
+        if analyzer.profile_rule is not None and analyzer.profile_rule(profile):
+            return analyzer.name
+    return GENERIC
+
+
+# ============================
+# BUDGETED EXECUTION
+# ============================
+def _sentences(out: Union[str, List[str], None]) -> List[str]:
+    if isinstance(out, str):
+        return [out]
+    return list(out) if out else []
+
+
+def run_analyzer(
+    analyzer: Analyzer, ctx: SummaryContext, deadline: float, replicates: Sequence[SummaryContext] = ()
+) -> Tuple[List[str], Dict[str, Any]]:
+    """
+    With `replicates` (fast mode), every insight also runs on each
+    replicate context and its numbers get their estimated error.
+    """
+    sentences: List[str] = []
+    skipped: List[str] = []
+
+    for insight in analyzer.insights:
+        # The first insight always runs, so there is always some text
+        if sentences and time.perf_counter() > deadline:
+            skipped.append(insight.__name__)
+            continue
+        out = _sentences(insight(ctx))
+        if out and replicates:
+            out = annotate_errors(out, [_sentences(insight(r)) for r in replicates])
+        sentences.extend(out)
+
+    if analyzer.closing:
+        sentences.append(analyzer.closing)
+    return sentences, {"skipped": skipped, "truncated": bool(skipped)}
+
+
+def summarize(
+    df: pd.DataFrame,
+    profile: Optional[Dict[str, Any]] = None,
+    budget_seconds: float = SUMMARY_TIME_BUDGET_SECONDS,
+    mode: str = "exact",
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    (summary text, info) where info has the dataset type, the
+    analyzer used, skipped insights and whether the time budget
+    truncated the summary.
+
+    mode="fast" runs the analyzers on a stratified sample of frames
+    over SUMMARY_FAST_SAMPLE_ROWS rows (info["sample"] describes it);
+    numbers estimated from the sample carry "(±error)" in the text.
+    """
+    if mode not in SUMMARY_MODES:
+        raise ValueError(f"Unknown summary mode: {mode}")
+    start = time.perf_counter()
+    deadline = start + budget_seconds
+    profile = profile_for(df, profile)
+    matched, by_prefix = match_columns(df.columns)
+    dataset_type = detect_type(df, profile, matched)
+
+    sample = None
+    if mode == "fast" and len(df) > SUMMARY_FAST_SAMPLE_ROWS:
+        sample = stratified_sample(df, SUMMARY_FAST_SAMPLE_ROWS, SUMMARY_FAST_REPLICATES)
+        for frame in [sample.frame, *sample.replicates]:
+            # Engines that look the profile up by frame get the full-data one
+            frame_cache(frame)["profile"] = profile
+
+    candidates = [a for a in _by_priority() if a.name in by_prefix]
+    candidates += [ANALYZERS[dataset_type], ANALYZERS[GENERIC]]
+
+    for analyzer in candidates:
+        data = sample.frame if sample else df
+        needs = analyzer.aggregates(data, profile) if analyzer.aggregates else {}
+        ctx = SummaryContext(data, profile, needs, rows=len(df))
+        if analyzer.requires is not None and not analyzer.requires(ctx):
+            continue
+
+        replicates = [
+            SummaryContext(frame, profile, needs, rows=len(df)) for frame in sample.replicates
+        ] if sample else []
+        sentences, info = run_analyzer(analyzer, ctx, deadline, replicates)
+        info.update({
+            "dataset_type": dataset_type,
+            "analyzer": analyzer.name,
+            "mode": "fast" if sample else "exact",
+            "seconds": round(time.perf_counter() - start, 4),
+        })
+        if sample:
+            info["sample"] = sample_info(sample)
+        return " ".join(sentences), info
+
+    raise RuntimeError("No summary analyzer applies")  # generic always does
+
+
+# ============================
+# EDUCATION
+# ============================
+def _subject_cols(ctx: SummaryContext) -> List[str]:
+    if "subject_cols" not in ctx.state:
+        ctx.state["subject_cols"] = [c for c in ctx.profile["numeric_columns"] if c.lower().startswith("sub")]
+    return ctx.state["subject_cols"]
+
+
+def _education_aggregates(df: pd.DataFrame, profile: Dict[str, Any]) -> Dict[Hashable, Aggregate]:
+    needs = {}
+    for c in [c for c in profile["numeric_columns"] if c.lower().startswith("sub")]:
+        needs[("mean", c)] = Aggregate(c, "mean")
+        needs[("std", c)] = Aggregate(c, "std")
+        if "Gender" in df.columns:
+            needs[("gender_mean", c)] = Aggregate(c, "mean", by="Gender")
+    return needs
+
+
+def education_overview(ctx: SummaryContext) -> str:
+    subject_cols = _subject_cols(ctx)
+    averages = pd.Series({c: ctx.agg[("mean", c)] for c in subject_cols}, dtype=float)
+    best_subject = averages.idxmax()
+    worst_subject = averages.idxmin()
+
+    return (
+        f"The dataset represents academic performance data for {ctx.rows} students "
+        f"across {len(subject_cols)} subjects. Performance shows clear subject-wise differentiation, "
+        f"with {best_subject} achieving the highest average scores ({averages[best_subject]:.1f}) "
+        f"and {worst_subject} showing comparatively lower results ({averages[worst_subject]:.1f})."
+    )
+
+
+def education_grade_bands(ctx: SummaryContext) -> str:
+    # Performance classification
+    overall_scores = ctx.df[_subject_cols(ctx)].mean(axis=1)
+    distinctions = int(round((overall_scores >= 85).sum() * ctx.scale))
+    passes = int(round(((overall_scores >= 40) & (overall_scores < 85)).sum() * ctx.scale))
+    fails = int(round((overall_scores < 40).sum() * ctx.scale))
+
+    return (
+        f"Student performance distribution reveals {distinctions} distinction holders (≥85%), "
+        f"{passes} passing students (40-84%), and {fails} students requiring academic support (<40%)."
+    )
+
+
+def education_variability(ctx: SummaryContext) -> str:
+    subject_std = pd.Series({c: ctx.agg[("std", c)] for c in _subject_cols(ctx)}, dtype=float)
+    most_variable = subject_std.idxmax()
+
+    return (
+        f"{most_variable} demonstrates the highest score variability (σ={subject_std[most_variable]:.1f}), "
+        f"indicating inconsistent performance patterns that may require focused teaching strategies."
+    )
+
+
+def education_gender(ctx: SummaryContext) -> Optional[str]:
+    if "Gender" not in ctx.df.columns:
+        return None
+    gender_perf = pd.DataFrame({c: ctx.agg[("gender_mean", c)] for c in _subject_cols(ctx)}).mean(axis=1)
+    if len(gender_perf) <= 1:
+        return None
+
+    top_gender = gender_perf.idxmax()
+    gender_diff = gender_perf.max() - gender_perf.min()
+    return (
+        f"Gender-based analysis shows {top_gender} students achieving higher average performance "
+        f"by {gender_diff:.1f} points, suggesting potential areas for equity-focused interventions."
+    )
+
+
+# ============================
+# BUSINESS
+# ============================
+def _business_aggregates(df: pd.DataFrame, profile: Dict[str, Any]) -> Dict[Hashable, Aggregate]:
+    if "Sales" not in df.columns:
+        return {}
+
+    needs = {
+        "total_sales": Aggregate("Sales", "sum"),
+        "avg_sale": Aggregate("Sales", "mean"),
+        "sales_std": Aggregate("Sales", "std"),
+    }
+    if "Profit" in df.columns:
+        needs["total_profit"] = Aggregate("Profit", "sum")
+        needs["profitable_share"] = Aggregate("Profit", "positive_share")
+
+    year_key = "Year" if "Year" in df.columns else first_time_feature_name(df, "year")
+    if year_key is not None:
+        needs["yearly_sales"] = Aggregate("Sales", "sum", by=year_key)
+    for name, col in (("segment_sales", "Segment"), ("country_sales", "Country"), ("product_sales", "Product")):
+        if col in df.columns:
+            needs[name] = Aggregate("Sales", "sum", by=col)
+    return needs
+
+
+def business_overview(ctx: SummaryContext) -> str:
+    return (
+        f"The dataset captures comprehensive business performance metrics across {ctx.rows} records "
+        f"and {ctx.cols} operational dimensions."
+    )
+
+
+def business_sales(ctx: SummaryContext) -> Optional[str]:
+    if "Sales" not in ctx.df.columns:
+        return None
+    total_sales = ctx.agg["total_sales"]
+    avg_sale = ctx.agg["avg_sale"]
+    sales_volatility = (ctx.agg["sales_std"] or 0) / avg_sale if avg_sale > 0 else 0
+
+    return (
+        f"Total sales volume reaches {total_sales:,.0f} with an average transaction value "
+        f"of {avg_sale:,.0f} and {sales_volatility:.1%} sales volatility."
+    )
+
+
+def business_profitability(ctx: SummaryContext) -> Optional[str]:
+    if "Profit" not in ctx.df.columns or "Sales" not in ctx.df.columns:
+        return None
+    total_sales = ctx.agg["total_sales"]
+    total_profit = ctx.agg["total_profit"]
+    profit_margin = (total_profit / total_sales) * 100 if total_sales > 0 else 0
+    profitable_pct = ctx.agg["profitable_share"] * 100
+
+    if profit_margin > 0:
+        return (
+            f"Profitability analysis shows {profit_margin:.1f}% overall margin with "
+            f"{profitable_pct:.1f}% of operations generating positive returns."
+        )
+    return (
+        f"The business operates at a loss with {profit_margin:.1f}% negative margin, "
+        f"requiring immediate profitability optimization strategies."
+    )
+
+
+def business_growth(ctx: SummaryContext) -> Optional[str]:
+    if "yearly_sales" not in ctx.agg:
+        return None
+    yearly_sales = ctx.agg["yearly_sales"].sort_index()
+    if len(yearly_sales) <= 1:
+        return None
+
+    growth_rate = ((yearly_sales.iloc[-1] - yearly_sales.iloc[0]) / yearly_sales.iloc[0]) * 100
+    cagr = (((yearly_sales.iloc[-1] / yearly_sales.iloc[0]) ** (1 / (len(yearly_sales) - 1))) - 1) * 100
+    return (
+        f"Longitudinal analysis reveals {growth_rate:.1f}% total growth and {cagr:.1f}% "
+        f"compound annual growth rate over {len(yearly_sales)} years."
+    )
+
+
+def business_segments(ctx: SummaryContext) -> Optional[str]:
+    if "segment_sales" not in ctx.agg:
+        return None
+    seg_sales = ctx.agg["segment_sales"].sort_values(ascending=False)
+    top_seg = seg_sales.idxmax()
+    concentration = (seg_sales.head(2).sum() / seg_sales.sum()) * 100
+    return (
+        f"Segment performance shows {top_seg} as the dominant contributor with "
+        f"{concentration:.1f}% market concentration in top segments."
+    )
+
+
+def business_geography(ctx: SummaryContext) -> Optional[str]:
+    if "country_sales" not in ctx.agg:
+        return None
+    geo_sales = ctx.agg["country_sales"].sort_values(ascending=False)
+    top_market = geo_sales.idxmax()
+    market_share = (geo_sales.max() / geo_sales.sum()) * 100
+    return (
+        f"Geographic distribution highlights {top_market} as the primary market "
+        f"capturing {market_share:.1f}% of total sales."
+    )
+
+
+def business_products(ctx: SummaryContext) -> Optional[str]:
+    if "product_sales" not in ctx.agg:
+        return None
+    product_perf = ctx.agg["product_sales"].sort_values(ascending=False)
+    top_product = product_perf.idxmax()
+    product_concentration = (product_perf.head(3).sum() / product_perf.sum()) * 100
+    return (
+        f"Product portfolio analysis indicates {top_product} leads performance "
+        f"with top 3 products representing {product_concentration:.1f}% of sales."
+    )
+
+
+# ============================
+# HR
+# ============================
+def _tenure_col(df: pd.DataFrame) -> Optional[str]:
+    return next((c for c in ("Tenure", "Experience") if c in df.columns), None)
+
+
+def _hr_aggregates(df: pd.DataFrame, profile: Dict[str, Any]) -> Dict[Hashable, Aggregate]:
+    needs = {}
+    if "Salary" in df.columns:
+        needs["avg_salary"] = Aggregate("Salary", "mean")
+        needs["min_salary"] = Aggregate("Salary", "min")
+        needs["max_salary"] = Aggregate("Salary", "max")
+        if "Department" in df.columns:
+            needs["dept_salary"] = Aggregate("Salary", "mean", by="Department")
+    tenure_col = _tenure_col(df)
+    if tenure_col is not None:
+        needs["avg_tenure"] = Aggregate(tenure_col, "mean")
+    return needs
+
+
+def hr_overview(ctx: SummaryContext) -> str:
+    return (
+        f"The dataset encompasses comprehensive workforce information for {ctx.rows} employees "
+        f"across {ctx.cols} organizational dimensions, enabling detailed HR analytics."
+    )
+
+
+def hr_salary(ctx: SummaryContext) -> Optional[str]:
+    if "Salary" not in ctx.df.columns:
+        return None
+    profile = ctx.profile
+    avg_salary = ctx.agg["avg_salary"]
+    median_salary = quantile(profile, "Salary", 0.5)
+    salary_range = ctx.agg["max_salary"] - ctx.agg["min_salary"]
+    salary_quartiles = {q: quantile(profile, "Salary", q) for q in (0.25, 0.75)}
+
+    return (
+        f"Compensation analysis reveals an average salary of {avg_salary:,.0f} with median "
+        f"earnings at {median_salary:,.0f}. The salary range spans {salary_range:,.0f}, "
+        f"with interquartile range from {salary_quartiles[0.25]:,.0f} to {salary_quartiles[0.75]:,.0f}."
+    )
+
+
+def hr_departments(ctx: SummaryContext) -> Optional[str]:
+    dept_top = top_values(ctx.profile, "Department")
+    if not dept_top:
+        return None
+    largest_dept = dept_top[0]["value"]
+    dept_concentration = (sum(d["count"] for d in dept_top[:3]) / non_null(ctx.profile, "Department")) * 100
+
+    return (
+        f"Workforce distribution shows {largest_dept} as the largest department with "
+        f"{dept_top[0]['count']} employees. Top 3 departments represent {dept_concentration:.1f}% "
+        f"of total headcount across {stat(ctx.profile, 'Department', 'distinct')} departments."
+    )
+
+
+def hr_department_salary(ctx: SummaryContext) -> Optional[str]:
+    if not top_values(ctx.profile, "Department") or "dept_salary" not in ctx.agg:
+        return None
+    dept_salary = ctx.agg["dept_salary"].sort_values(ascending=False)
+    highest_paid_dept = dept_salary.idxmax()
+    salary_variance = dept_salary.std() / dept_salary.mean()
+    return (
+        f"Departmental compensation varies significantly, with {highest_paid_dept} "
+        f"showing highest average pay and {salary_variance:.1%} inter-departmental variance."
+    )
+
+
+def hr_tenure(ctx: SummaryContext) -> Optional[str]:
+    tenure_col = _tenure_col(ctx.df)
+    if tenure_col is None:
+        return None
+    avg_tenure = ctx.agg["avg_tenure"]
+    tenure_distribution = {q: quantile(ctx.profile, tenure_col, q) for q in (0.25, 0.5, 0.75)}
+
+    return (
+        f"Workforce experience analysis indicates average tenure of {avg_tenure:.1f} years, "
+        f"with 25th percentile at {tenure_distribution[0.25]:.1f} years, median at "
+        f"{tenure_distribution[0.5]:.1f} years, and 75th percentile at {tenure_distribution[0.75]:.1f} years."
+    )
+
+
+def hr_gender(ctx: SummaryContext) -> Optional[str]:
+    if "Gender" not in ctx.df.columns:
+        return None
+    gender_counts = value_counts(ctx.profile, "Gender")
+    if gender_counts is None:
+        gender_counts = count_values(ctx.df["Gender"])
+    gender_dist = gender_counts / gender_counts.sum() * 100
+    diversity_index = 1 - sum((gender_dist/100)**2)  # Simpson's diversity index
+
+    return (
+        f"Workforce diversity metrics show gender distribution with "
+        f"{diversity_index:.3f} diversity index, indicating representation patterns "
+        f"across {len(gender_dist)} gender categories."
+    )
+
+
+def hr_managers(ctx: SummaryContext) -> Optional[str]:
+    if "Manager" not in ctx.df.columns:
+        return None
+    manager_ratio = non_null(ctx.profile, "Manager") / ctx.rows * 100
+    return (
+        f"Organizational structure analysis reveals {manager_ratio:.1f}% of employees "
+        f"in supervisory roles, suggesting management span of control considerations."
+    )
+
+
+# ============================
+# CUSTOMER
+# ============================
+def customer_overview(ctx: SummaryContext) -> str:
+    return (
+        f"The dataset contains comprehensive customer information for {ctx.rows} contacts "
+        f"across {ctx.cols} profile dimensions, enabling detailed customer analytics."
+    )
+
+
+def customer_geography(ctx: SummaryContext) -> Optional[str]:
+    country_top = top_values(ctx.profile, "Country")[:5]
+    if not country_top:
+        return None
+    top_country = country_top[0]["value"]
+    concentration = (country_top[0]["count"] / sum(c["count"] for c in country_top)) * 100
+    unique_countries = stat(ctx.profile, "Country", "distinct")
+
+    return (
+        f"Customer base spans {unique_countries} countries with {top_country} representing "
+        f"the largest market segment at {concentration:.1f}% of total customers."
+    )
+
+
+def customer_companies(ctx: SummaryContext) -> Optional[str]:
+    company_top = top_values(ctx.profile, "Company")
+    if not company_top:
+        return None
+    unique_companies = stat(ctx.profile, "Company", "distinct")
+    top_company = company_top[0]["value"]
+    company_concentration = (company_top[0]["count"] / non_null(ctx.profile, "Company")) * 100
+
+    return (
+        f"Business customer analysis shows {unique_companies} unique companies, "
+        f"with {top_company} being the most represented at {company_concentration:.1f}%."
+    )
+
+
+def customer_subscriptions(ctx: SummaryContext) -> Optional[str]:
+    if "Subscription Date" not in ctx.df.columns:
+        return None
+    try:
+        # Parse locally: df may be a shared frame from the dataset store
+        subscription_dates = pd.to_datetime(ctx.df["Subscription Date"])
+        subscription_trend = subscription_dates.groupby(subscription_dates.dt.year).count()
+        if len(subscription_trend) > 1:
+            growth = ((subscription_trend.iloc[-1] - subscription_trend.iloc[0]) / subscription_trend.iloc[0]) * 100
+            return (
+                f"Subscription growth analysis indicates {growth:.1f}% change in customer acquisition "
+                f"over the observation period."
+            )
+    except Exception:
+        pass
+    return None
+
+
+def customer_contact_completeness(ctx: SummaryContext) -> Optional[str]:
+    contact_cols = ["Phone 1", "Phone 2", "Email", "Website"]
+    completeness = {}
+    for col in contact_cols:
+        if col in ctx.df.columns:
+            completeness[col] = (ctx.df[col].notna() & (ctx.df[col] != "")).mean() * 100
+
+    if not completeness:
+        return None
+    avg_completeness = sum(completeness.values()) / len(completeness)
+    return (
+        f"Contact information completeness averages {avg_completeness:.1f}% across available channels, "
+        f"with Email showing the highest completion rate."
+    )
+
+
+def customer_seasonality(ctx: SummaryContext) -> Optional[str]:
+    df = ctx.df
+    month_names = df["Month Name"] if "Month Name" in df.columns else first_time_feature(df, "month_name")
+    if month_names is None:
+        return None
+    monthly_dist = count_values(month_names)
+    peak_month = monthly_dist.idxmax()
+    seasonal_concentration = (monthly_dist.max() / monthly_dist.sum()) * 100
+    return (
+        f"Customer acquisition shows seasonal patterns with {peak_month} being the peak month "
+        f"accounting for {seasonal_concentration:.1f}% of subscriptions."
+    )
+
+
+# ============================
+# TIME SERIES
+# ============================
+def time_series_overview(ctx: SummaryContext) -> str:
+    return (
+        f"The dataset contains {ctx.rows} time-series observations across {ctx.cols} dimensions, "
+        f"enabling temporal pattern analysis and trend identification."
+    )
+
+
+def time_series_coverage(ctx: SummaryContext) -> Optional[str]:
+    analysis = analyze_time_series(ctx.df, ctx.profile)
+    if not analysis or analysis["start"] is None:
+        return None
+    start, end = analysis["start"], analysis["end"]
+    return (
+        f"Temporal coverage spans {(end - start).days} days from {start.date()} "
+        f"to {end.date()}, providing comprehensive historical perspective."
+    )
+
+
+def time_series_trends(ctx: SummaryContext) -> List[str]:
+    analysis = analyze_time_series(ctx.df, ctx.profile)
+    if not analysis:
+        return []
+    basis = f"{analysis['resolution']} averages" if analysis["resolution"] else "the row order"
+    fitted = [(col, s) for col, s in analysis["columns"].items() if s["change_pct"] is not None]
+    fitted.sort(key=lambda item: item[1]["r2"], reverse=True)
+
+    insights = []
+    for col, s in fitted[:TIME_SERIES_MAX_TREND_COLUMNS]:
+        if s["r2"] < MIN_TREND_R2:
+            trend = "stable"
+        else:
+            trend = "increasing" if s["slope"] > 0 else "decreasing"
+        volatility = s["volatility"] or 0
+        insights.append(
+            f"{col} shows {trend} trend with {s['change_pct']:.1f}% change and {volatility:.1%} volatility "
+            f"over the observation period (least-squares fit on {basis}, R² {s['r2']:.2f})."
+        )
+    return insights
+
+
+def time_series_seasonality(ctx: SummaryContext) -> Optional[str]:
+    analysis = analyze_time_series(ctx.df, ctx.profile)
+    if not analysis:
+        return None
+    unit = f"{analysis['frequency']}s" if analysis["frequency"] else "rows"
+    seasonal = sorted(
+        (
+            (col, s) for col, s in analysis["columns"].items()
+            if (s["seasonality"] or 0) >= TIME_SERIES_MIN_SEASONALITY
+        ),
+        key=lambda item: item[1]["seasonality"], reverse=True,
+    )
+    if not seasonal:
+        return None
+    cycles = ", ".join(
+        f"{col} (every ~{s['period']} {unit}, autocorrelation {s['seasonality']:.2f})"
+        for col, s in seasonal[:TIME_SERIES_MAX_TREND_COLUMNS]
+    )
+    return f"Seasonal patterns detected in {cycles}, suggesting periodic fluctuations in the data."
+
+
+# ============================
+# MEASUREMENTS
+# ============================
+def measurements_overview(ctx: SummaryContext) -> str:
+    return (
+        f"The dataset contains {ctx.rows} measurement records with {len(ctx.profile['numeric_columns'])} "
+        f"quantitative metrics and {len(ctx.profile['categorical_columns'])} categorical dimensions."
+    )
+
+
+def measurements_variability(ctx: SummaryContext) -> Optional[str]:
+    high_variability = []
+    for col in ctx.profile["numeric_columns"]:
+        mean = stat(ctx.profile, col, "mean")
+        cv = (stat(ctx.profile, col, "std") or 0) / mean if mean and mean > 0 else 0
+        if cv > 0.5:  # High variability
+            high_variability.append(col)
+
+    if not high_variability:
+        return None
+    return (
+        f"High variability observed in {', '.join(high_variability)}, indicating diverse "
+        f"measurement conditions or multiple subgroups within the data."
+    )
+
+
+def measurements_correlations(ctx: SummaryContext) -> Optional[str]:
+    if len(ctx.profile["numeric_columns"]) <= 2:
+        return None
+    pairs = find_associations(ctx.df, ctx.profile, kinds=("numeric",), min_strength=0.7)
+    strong_correlations = [
+        f"{p['a']}-{p['b']} ({p['value']:.2f})" for p in pairs if p["strength"] > 0.7
+    ]
+
+    if not strong_correlations:
+        return None
+    return (
+        f"Strong correlations detected between: {', '.join(strong_correlations)}, "
+        f"suggesting underlying relationships in the measurement data."
+    )
+
+
+# ============================
+# CATALOG
+# ============================
+def catalog_overview(ctx: SummaryContext) -> str:
+    return (
+        f"The dataset represents a catalog of {ctx.rows} items with {len(ctx.profile['categorical_columns'])} "
+        f"descriptive attributes and {len(ctx.profile['numeric_columns'])} quantitative properties."
+    )
+
+
+def catalog_categories(ctx: SummaryContext) -> List[str]:
+    insights = []
+    for col in ctx.profile["categorical_columns"][:3]:  # Analyze first 3 categorical columns
+        unique_count = stat(ctx.profile, col, "distinct")
+        top = top_values(ctx.profile, col)
+        top_category = top[0]["value"] if top else "N/A"
+        concentration = (top[0]["count"] / ctx.rows) * 100 if top else 0
+
+        insights.append(
+            f"{col} contains {unique_count} unique values with '{top_category}' "
+            f"representing {concentration:.1f}% of entries."
+        )
+    return insights
+
+
+def catalog_pricing(ctx: SummaryContext) -> Optional[str]:
+    price_cols = [c for c in ctx.profile["numeric_columns"] if "price" in c.lower() or "cost" in c.lower()]
+    if not price_cols:
+        return None
+    avg_price = stat(ctx.profile, price_cols[0], "mean")
+    price_range = stat(ctx.profile, price_cols[0], "max") - stat(ctx.profile, price_cols[0], "min")
+    return (
+        f"Pricing analysis shows average {price_cols[0]} of {avg_price:,.2f} "
+        f"with range spanning {price_range:,.2f}."
+    )
+
+
+# ============================
+# GENERIC
+# ============================
+def generic_overview(ctx: SummaryContext) -> str:
+    return (
+        f"The dataset contains {ctx.rows} records with {ctx.cols} variables, comprising "
+        f"{len(ctx.profile['numeric_columns'])} numeric and {len(ctx.profile['categorical_columns'])} "
+        f"categorical attributes."
+    )
+
+
+def generic_completeness(ctx: SummaryContext) -> Optional[str]:
+    total_nulls = sum(c["nulls"] for c in ctx.profile["columns"].values())
+    missing_pct = total_nulls / (ctx.rows * ctx.cols) * 100 if ctx.rows and ctx.cols else 0
+    if missing_pct <= 0:
+        return None
+    return (
+        f"Data completeness analysis shows {missing_pct:.1f}% missing values overall, "
+        f"which may impact analysis reliability."
+    )
+
+
+def generic_skew(ctx: SummaryContext) -> Optional[str]:
+    skewed_cols = []
+    for col in ctx.profile["numeric_columns"]:
+        skewness = stat(ctx.profile, col, "skew")
+        if skewness is not None and abs(skewness) > 1:
+            skewed_cols.append(col)
+
+    if not skewed_cols:
+        return None
+    return (
+        f"Distribution analysis indicates skewed patterns in {', '.join(skewed_cols)}, "
+        f"suggesting non-normal data characteristics."
+    )
+
+
+def generic_cardinality(ctx: SummaryContext) -> List[str]:
+    insights = []
+    for col in ctx.profile["categorical_columns"][:2]:
+        unique_pct = (stat(ctx.profile, col, "distinct") / ctx.rows) * 100
+        if unique_pct > 50:
+            insights.append(
+                f"{col} shows high cardinality ({unique_pct:.1f}% unique values), "
+                f"potentially requiring grouping or encoding strategies."
+            )
+    return insights
+
+
+# ============================
+# DEFAULT ANALYZERS
+# ============================
+register_analyzer(Analyzer(
+    "customer", priority=10,
+    keywords=["customer", "client", "contact", "email", "phone", "subscription"],
+    insights=[
+        customer_overview, customer_geography, customer_companies,
+        customer_subscriptions, customer_contact_completeness, customer_seasonality,
+    ],
+    closing=(
+        "Customer insights enable targeted marketing, retention strategies, and personalized "
+        "customer relationship management initiatives."
+    ),
+))
+
+register_analyzer(Analyzer(
+    "business", priority=20,
+    keywords=["sales", "revenue", "profit", "cost", "margin", "turnover"],
+    aggregates=_business_aggregates,
+    insights=[
+        business_overview, business_sales, business_profitability, business_growth,
+        business_segments, business_geography, business_products,
+    ],
+    closing=(
+        "Strategic insights suggest focusing on high-margin segments and optimizing "
+        "underperforming areas for enhanced business performance."
+    ),
+))
+
+register_analyzer(Analyzer(
+    "education", priority=30,
+    keywords=["grade", "marks", "score", "gpa", "percentage"],
+    prefixes=["sub"],
+    requires=lambda ctx: bool(_subject_cols(ctx)),
+    aggregates=_education_aggregates,
+    insights=[education_overview, education_grade_bands, education_variability, education_gender],
+    closing=(
+        "The uneven performance distribution across subjects highlights opportunities for "
+        "personalized learning approaches and targeted academic support programs."
+    ),
+))
+
+register_analyzer(Analyzer(
+    "hr", priority=40,
+    keywords=["salary", "department", "employee", "manager", "tenure", "experience"],
+    aggregates=_hr_aggregates,
+    insights=[
+        hr_overview, hr_salary, hr_departments, hr_department_salary,
+        hr_tenure, hr_gender, hr_managers,
+    ],
+    closing=(
+        "Strategic HR insights highlight opportunities for compensation equity, "
+        "workforce planning, and organizational development initiatives."
+    ),
+))
+
+register_analyzer(Analyzer(
+    "time_series", priority=50,
+    keywords=["date", "time", "timestamp", "year", "month", "quarter"],
+    insights=[time_series_overview, time_series_coverage, time_series_trends, time_series_seasonality],
+    closing=(
+        "Time series insights enable forecasting, anomaly detection, and strategic planning "
+        "based on historical patterns and trends."
+    ),
+))
+
+# Mostly numeric with some identifiers: measurements / products
+register_analyzer(Analyzer(
+    "measurements", priority=60,
+    profile_rule=lambda p: len(p["numeric_columns"]) > len(p["categorical_columns"]) and len(p["numeric_columns"]) > 2,
+    insights=[measurements_overview, measurements_variability, measurements_correlations],
+    closing=(
+        "Measurement data analysis supports quality control, process optimization, "
+        "and performance benchmarking across different conditions."
+    ),
+))
+
+# Mostly categorical: customer / product catalog
+register_analyzer(Analyzer(
+    "catalog", priority=70,
+    profile_rule=lambda p: len(p["categorical_columns"]) > len(p["numeric_columns"]) and len(p["categorical_columns"]) > 3,
+    insights=[catalog_overview, catalog_categories, catalog_pricing],
+    closing=(
+        "Catalog analysis enables inventory management, pricing strategy, "
+        "and product portfolio optimization."
+    ),
+))
+
+register_analyzer(Analyzer(
+    GENERIC, priority=1000,
+    insights=[generic_overview, generic_completeness, generic_skew, generic_cardinality],
+    closing=(
+        "Generic dataset analysis supports exploratory data understanding, "
+        "feature engineering, and hypothesis generation for further investigation."
+    ),
+))
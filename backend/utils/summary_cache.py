@@ -0,0 +1,214 @@
+"""
+====================================================
+INSIGHTIFY – SUMMARY CACHE
+====================================================
+
+Reopening a dashboard or asking "summarize" again
+returns the summary computed last time for the same
+data instead of re-running the summary engine.
+
+Key = dataset fingerprint (schema + column contents)
+    + summarizer version (SUMMARY_VERSION and a hash of
+      the cleaning / profiling / analyzer source files,
+      so any code change invalidates old entries)
+    + profile kind (exact / sketched): a summary built from
+      sketch estimates is never served for an exact profile
+
+✔ Bounded by entry count AND bytes, LRU eviction
+✔ Entries expire after a TTL
+✔ Hit / miss / eviction / expiry counters
+====================================================
+"""
+
+import hashlib
+import importlib.util
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.utils.Config import (
+    SUMMARY_CACHE_MAX_ENTRIES, SUMMARY_CACHE_MAX_BYTES, SUMMARY_CACHE_TTL_SECONDS,
+)
+from backend.utils.column_profile import is_approximate
+from backend.utils.frame_cache import frame_cache
+
+
+# Bump for behaviour changes outside the modules hashed below
+SUMMARY_VERSION = 1
+
+# Everything the summary text depends on
+SUMMARY_CODE_MODULES = (
+    "backend.utils.Config",
+    "backend.utils.data_cleaner",
+    "backend.utils.deduplicator",
+    "backend.utils.dtype_optimizer",
+    "backend.utils.time_features",
+    "backend.utils.column_profile",
+    "backend.utils.sketches",
+    "backend.utils.aggregation_planner",
+    "backend.utils.associations",
+    "backend.utils.time_series",
+    "backend.utils.summary_sampling",
+    "backend.utils.summary_analyzers",
+    "backend.utils.ai_chat_engine",
+)
+
+
+@lru_cache(maxsize=1)
+def code_version() -> str:
+    """Hash of the source of SUMMARY_CODE_MODULES (computed once per process)."""
+    digest = hashlib.blake2b(str(SUMMARY_VERSION).encode(), digest_size=8)
+    for name in SUMMARY_CODE_MODULES:
+        spec = importlib.util.find_spec(name)
+        if spec is None or not spec.origin:
+            continue
+        with open(spec.origin, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _hash_column(series: pd.Series, digest) -> None:
+    """
+    Feed one column's values to `digest` as cheaply as its storage
+    allows. Equal bytes always mean equal values; equal values may
+    occasionally hash differently (e.g. a sliced Arrow buffer),
+    which only costs a cache miss.
+    """
+    values = series.array
+    if hasattr(values, "__arrow_array__"):
+        # Arrow-backed (the default `str` dtype): hash the raw buffers
+        arrow = values.__arrow_array__()
+        for chunk in getattr(arrow, "chunks", [arrow]):
+            digest.update(f"{chunk.offset}:{len(chunk)}".encode())
+            for buffer in chunk.buffers():
+                if buffer is not None:
+                    digest.update(buffer)
+    elif isinstance(series.dtype, pd.CategoricalDtype):
+        _hash_column(pd.Series(series.cat.categories), digest)
+        digest.update(np.ascontiguousarray(series.cat.codes.to_numpy()).view(np.uint8))
+    elif isinstance(series.dtype, np.dtype) and series.dtype != object:
+        digest.update(np.ascontiguousarray(series.to_numpy()).view(np.uint8))
+    else:
+        try:
+            hashes = pd.util.hash_pandas_object(series, index=False, categorize=False)
+        except (TypeError, ValueError):
+            # Unhashable cells (lists / dicts from JSON uploads)
+            hashes = pd.util.hash_pandas_object(series.astype(str), index=False, categorize=False)
+        digest.update(hashes.to_numpy().tobytes())
+
+
+def dataset_fingerprint(df: pd.DataFrame) -> str:
+    """
+    Schema (column names + dtypes) and the content of every
+    column; memoized per frame.
+    """
+    cache = frame_cache(df)
+    if "fingerprint" not in cache:
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{len(df)}|".encode())
+        for col, dtype in df.dtypes.items():
+            digest.update(f"|{col}:{dtype}|".encode())
+            _hash_column(df[col], digest)
+        cache["fingerprint"] = digest.hexdigest()
+    return cache["fingerprint"]
+
+
+def _profile_kind(df: pd.DataFrame, profile: Optional[Dict[str, Any]]) -> str:
+    return "sketched" if is_approximate(df, profile) else "exact"
+
+
+def summary_key(df: pd.DataFrame, profile: Optional[Dict[str, Any]] = None) -> str:
+    """`profile` is the one the summary is (or was) built from."""
+    return f"{code_version()}:{dataset_fingerprint(df)}:{_profile_kind(df, profile)}"
+
+
+def known_summary_key(df: pd.DataFrame, profile: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    """summary_key when the frame's fingerprint is already memoized, else None (no hashing)."""
+    cache = frame_cache(df)
+    if "fingerprint" not in cache:
+        return None
+    return f"{code_version()}:{cache['fingerprint']}:{_profile_kind(df, profile)}"
+
+
+class SummaryCache:
+    def __init__(
+        self,
+        max_entries: int = SUMMARY_CACHE_MAX_ENTRIES,
+        max_bytes: int = SUMMARY_CACHE_MAX_BYTES,
+        ttl_seconds: int = SUMMARY_CACHE_TTL_SECONDS,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        # key -> (summary, stored_at)
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry[1] > self.ttl_seconds:
+                self._drop(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, summary: str) -> None:
+        size = len(summary.encode())
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = (summary, time.time())
+            self._total_bytes += size
+
+            while len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= len(entry[0].encode())
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "code_version": code_version(),
+            }
+
+
+summary_cache = SummaryCache()
@@ -0,0 +1,174 @@
+"""
+====================================================
+INSIGHTIFY – FAST (SAMPLED) SUMMARY SUPPORT
+====================================================
+
+`mode=fast` summaries run the analyzers on a stratified
+sample instead of the whole frame, and mark every number
+that came from the sample with its estimated error.
+
+✔ Proportional stratified sample on the segment /
+  department / country columns, drawn from a random
+  candidate set (cost independent of the frame's length;
+  fixed seed, so the same frame gives the same text)
+✔ The sample is split into replicate groups within each
+  stratum; every insight also runs with one group left
+  out (delete-a-group jackknife)
+✔ Numbers that differ between replicates get "(±margin)"
+  appended (95%, from the jackknife standard error); numbers read from the upload-time profile
+  are identical in every replicate and stay as they are
+====================================================
+"""
+
+import re
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from backend.utils.frame_cache import frame_cache
+
+
+# Columns the sample is stratified on (lower-case names)
+STRATA_COLUMNS = ("segment", "department", "country")
+
+# Phase-one candidates per sampled row
+CANDIDATE_FACTOR = 5
+
+# "±" shows a 95% margin of error
+ERROR_Z = 1.96
+
+# A number in a sentence: not part of a word, a date or a range
+# ("Q3", "2024-01-31" and "40-84%" are left alone)
+NUMBER = re.compile(r"(?<![\w.\-])-?\d[\d,]*(?:\.\d+)?(?![\w\-]|\.\d)")
+
+
+class SummarySample(NamedTuple):
+    frame: pd.DataFrame
+    replicates: List[pd.DataFrame]  # the sample minus one replicate group each
+    rows: int  # rows of the full frame
+    strata: List[str]
+
+
+def strata_columns(df: pd.DataFrame) -> List[str]:
+    return [c for c in df.columns if str(c).lower() in STRATA_COLUMNS]
+
+
+def _strata_codes(df: pd.DataFrame, columns: List[str]) -> np.ndarray:
+    if not columns:
+        return np.zeros(len(df), dtype=np.uint8)
+    codes = np.zeros(len(df), dtype=np.int64)
+    for col in columns:
+        col_codes, uniques = pd.factorize(df[col], use_na_sentinel=False)
+        codes = codes * (len(uniques) + 1) + col_codes
+    # Small integer codes let the stable argsort use radix sort
+    return codes.astype(np.min_scalar_type(codes.max()))
+
+
+def stratified_sample(df: pd.DataFrame, rows: int, groups: int, seed: int = 0) -> SummarySample:
+    """
+    `rows` rows of `df`, allocated to the strata in proportion to
+    their size, plus `groups` jackknife replicates. Memoized per frame.
+    """
+    cache = frame_cache(df)
+    key = ("summary_sample", rows, groups, seed)
+    if key in cache:
+        return cache[key]
+
+    strata = strata_columns(df)
+    rng = np.random.default_rng(seed)
+
+    # Two phases, so only O(rows) rows are ever touched: a simple
+    # random set of candidates (in random order), then a proportional
+    # stratified pick from them
+    candidates = rng.choice(len(df), min(len(df), CANDIDATE_FACTOR * rows), replace=False)
+    codes = _strata_codes(df[strata].iloc[candidates], strata)
+    # Strata laid end to end (shuffled within, as candidates are);
+    # an evenly spaced pick is then proportional per stratum
+    order = candidates[np.argsort(codes, kind="stable")]
+    step = len(order) / rows
+    picked = order[(rng.random() * step + np.arange(rows) * step).astype(np.int64)]
+    # Consecutive picks go to different groups, so each group
+    # is itself spread over every stratum
+    group = np.arange(rows) % groups
+
+    # Back to the frame's row order (row order is the time axis
+    # when there is no date column)
+    by_row = np.argsort(picked)
+    picked, group = picked[by_row], group[by_row]
+    frame = df.iloc[picked].reset_index(drop=True)
+    replicates = [frame[group != g] for g in range(groups)]
+
+    cache[key] = SummarySample(frame, replicates, len(df), strata)
+    return cache[key]
+
+
+# ============================
+# ERROR ANNOTATION
+# ============================
+def jackknife_error(replicates: Sequence[float]) -> float:
+    """95% margin (ERROR_Z standard errors) from delete-a-group replicates."""
+    values = np.asarray(replicates, dtype=np.float64)
+    g = len(values)
+    return ERROR_Z * float(np.sqrt((g - 1) / g * ((values - values.mean()) ** 2).sum()))
+
+
+def _value(token: str) -> float:
+    return float(token.replace(",", ""))
+
+
+def _format_error(token: str, error: float, percent: bool) -> Optional[str]:
+    decimals = len(token.split(".")[1]) if "." in token else 0
+    text = f"{error:,.{decimals}f}" if "," in token or error >= 1000 else f"{error:.{decimals}f}"
+    if float(text.replace(",", "")) == 0:
+        return None  # error below the precision shown
+    return f" (±{text}{'%' if percent else ''})"
+
+
+def annotate_sentence(sentence: str, replicate_sentences: Sequence[str]) -> str:
+    """
+    Append the jackknife error to every number of `sentence` that
+    varies between the replicate versions of the same sentence.
+    Replicates whose wording differs (e.g. another top segment) are
+    not comparable and are ignored.
+    """
+    skeleton = NUMBER.sub("#", sentence)
+    matches = list(NUMBER.finditer(sentence))
+    comparable = [
+        [_value(m.group()) for m in NUMBER.finditer(r)]
+        for r in replicate_sentences if NUMBER.sub("#", r) == skeleton
+    ]
+    if not matches or len(comparable) < 2:
+        return sentence
+
+    pieces, last = [], 0
+    for i, m in enumerate(matches):
+        end = m.end()
+        percent = sentence[end:end + 1] == "%"
+        if percent:
+            end += 1
+        pieces.append(sentence[last:end])
+        error = jackknife_error([values[i] for values in comparable])
+        suffix = _format_error(m.group(), error, percent)
+        if suffix:
+            pieces.append(suffix)
+        last = end
+    pieces.append(sentence[last:])
+    return "".join(pieces)
+
+
+def annotate_errors(sentences: List[str], replicate_outputs: Sequence[List[str]]) -> List[str]:
+    """Sentence i of the sample run against sentence i of each replicate run."""
+    return [
+        annotate_sentence(s, [out[i] for out in replicate_outputs if len(out) == len(sentences)])
+        for i, s in enumerate(sentences)
+    ]
+
+
+def sample_info(sample: SummarySample) -> Dict[str, Any]:
+    return {
+        "rows": len(sample.frame),
+        "of_rows": sample.rows,
+        "strata": [str(c) for c in sample.strata],
+        "replicates": len(sample.replicates),
+    }
@@ -0,0 +1,98 @@
+"""
+====================================================
+INSIGHTIFY – LAZY TIME FEATURES
+====================================================
+
+Derived calendar fields of date columns, addressed as
+"<date column>.<feature>" (e.g. "Order Date.year").
+
+Nothing is added to the cleaned frame: a feature is
+computed the first time the summary engine or chart
+planner asks for it and then memoized for that frame.
+
+✔ One feature set per date column (no overwritten Year)
+✔ Month names as a 12-category categorical, not strings
+✔ Cache entries die with their DataFrame
+====================================================
+"""
+
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+from backend.utils.frame_cache import frame_cache
+
+
+TIME_FEATURES: Dict[str, Callable[[pd.Series], pd.Series]] = {
+    "year": lambda s: s.dt.year.astype("Int64"),
+    "quarter": lambda s: s.dt.quarter.astype("Int64"),
+    "month": lambda s: s.dt.month.astype("Int64"),
+    "month_name": lambda s: s.dt.month_name().astype("category"),
+    "weekday": lambda s: s.dt.day_name().astype("category"),
+}
+
+
+def feature_name(column: str, feature: str) -> str:
+    return f"{column}.{feature}"
+
+
+def date_columns(df: pd.DataFrame) -> List[str]:
+    return [c for c in df.columns if pd.api.types.is_datetime64_any_dtype(df[c])]
+
+
+def available_time_features(df: pd.DataFrame) -> List[str]:
+    """Every "<col>.<feature>" name that can be computed for this frame."""
+    return [feature_name(col, f) for col in date_columns(df) for f in TIME_FEATURES]
+
+
+def time_feature(df: pd.DataFrame, column: str, feature: str) -> pd.Series:
+    """Compute (once per frame) one calendar feature of a date column."""
+    if feature not in TIME_FEATURES:
+        raise KeyError(feature_name(column, feature))
+    if column not in df.columns or not pd.api.types.is_datetime64_any_dtype(df[column]):
+        raise KeyError(feature_name(column, feature))
+
+    cache = frame_cache(df)
+    key = ("time_feature", column, feature)
+    series = cache.get(key)
+    if series is None:
+        series = TIME_FEATURES[feature](df[column]).rename(feature_name(column, feature))
+        cache[key] = series
+    return series
+
+
+def get_column(df: pd.DataFrame, name: str) -> pd.Series:
+    """
+    Real columns win; otherwise "<date column>.<feature>"
+    is resolved to a lazy time feature.
+    """
+    if name in df.columns:
+        return df[name]
+
+    column, _, feature = name.rpartition(".")
+    if column:
+        return time_feature(df, column, feature)
+    raise KeyError(name)
+
+
+def has_column(df: pd.DataFrame, name: str) -> bool:
+    if name in df.columns:
+        return True
+    column, _, feature = name.rpartition(".")
+    return (
+        feature in TIME_FEATURES
+        and column in df.columns
+        and pd.api.types.is_datetime64_any_dtype(df[column])
+    )
+
+
+def first_time_feature(df: pd.DataFrame, feature: str) -> Optional[pd.Series]:
+    """`feature` of the first date column, or None when there is none."""
+    columns = date_columns(df)
+    return time_feature(df, columns[0], feature) if columns else None
+
+
+def first_time_feature_name(df: pd.DataFrame, feature: str) -> Optional[str]:
+    """"<first date column>.<feature>", or None when there is none."""
+    columns = date_columns(df)
+    return feature_name(columns[0], feature) if columns else None
@@ -0,0 +1,252 @@
+"""
+====================================================
+INSIGHTIFY – TIME-SERIES ENGINE
+====================================================
+
+Trend, seasonality and volatility of every numeric
+column of a dataset, for the time_series summary.
+
+✔ Resampled on the detected date column, at the finest
+  calendar frequency (day → year) that fits in
+  TIME_SERIES_MAX_PERIODS buckets; without a date
+  column, rows are averaged into equal positional buckets
+✔ Least-squares slope and R² for all columns at once
+✔ Dominant cycle from one FFT periodogram, its strength
+  from the FFT autocorrelation at that lag
+✔ Rolling volatility (rolling std / mean level)
+✔ O(rows × columns) resampling, then work on at most
+  TIME_SERIES_MAX_PERIODS points; memoized per frame
+====================================================
+"""
+
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.utils.Config import TIME_SERIES_MAX_PERIODS
+from backend.utils.column_profile import profile_for
+from backend.utils.frame_cache import frame_cache
+
+
+class Frequency(NamedTuple):
+    alias: str  # pandas offset alias
+    days: float  # nominal bucket length
+    unit: str
+    adjective: str
+    window: int  # rolling-volatility window, in buckets
+
+
+FREQUENCIES = [
+    Frequency("D", 1, "day", "daily", 30),
+    Frequency("W", 7, "week", "weekly", 13),
+    Frequency("MS", 30.44, "month", "monthly", 12),
+    Frequency("QS", 91.31, "quarter", "quarterly", 4),
+    Frequency("YS", 365.25, "year", "yearly", 3),
+]
+
+# Date columns stored as text are parsed when named like one
+DATE_KEYWORDS = ["date", "time", "timestamp"]
+# Numeric calendar fields are time axes, not measures
+CALENDAR_COLUMNS = {"year", "month", "quarter", "week", "day", "weekday", "hour"}
+
+MIN_PERIODS = 3
+# Fits explaining less of the variance than this are "stable"
+MIN_TREND_R2 = 0.1
+
+
+# ============================
+# RESAMPLING
+# ============================
+def detect_date_column(df: pd.DataFrame, profile: Dict[str, Any]) -> Optional[Tuple[str, pd.Series]]:
+    """First datetime column, else the first text column named like a date that parses."""
+    for col in profile["datetime_columns"]:
+        if col in df.columns and pd.api.types.is_datetime64_any_dtype(df[col]):
+            return col, df[col]
+
+    for col in df.columns:
+        if str(col).lower() not in DATE_KEYWORDS:
+            continue
+        if not (pd.api.types.is_object_dtype(df[col]) or pd.api.types.is_string_dtype(df[col])):
+            continue
+        dates = pd.to_datetime(df[col], errors="coerce", format="mixed")
+        if dates.notna().mean() >= 0.8:
+            return col, dates
+    return None
+
+
+def choose_frequency(dates: pd.Series) -> Optional[Frequency]:
+    """Finest frequency no finer than the data's spacing that fits the bucket limit."""
+    # Nanosecond integers: sorting datetime64 objects is far slower
+    ns = dates.dropna().to_numpy(dtype="datetime64[ns]").view(np.int64)
+    if not (len(ns) and dates.is_monotonic_increasing):
+        ns = np.sort(ns)
+    steps = np.diff(ns)
+    steps = steps[steps > 0]
+    if len(steps) < MIN_PERIODS - 1:
+        return None
+    day = 86_400 * 10 ** 9
+    span_days = (ns[-1] - ns[0]) / day
+    spacing_days = np.median(steps) / day
+    for freq in FREQUENCIES:
+        if freq.days >= spacing_days * 0.9 and span_days / freq.days <= TIME_SERIES_MAX_PERIODS:
+            return freq
+    return FREQUENCIES[-1]
+
+
+def resample(df: pd.DataFrame, dates: pd.Series, columns: List[str], freq: Frequency) -> pd.DataFrame:
+    """Mean of each column per calendar bucket (empty buckets are NaN)."""
+    frame = df[columns].set_axis(pd.DatetimeIndex(dates), axis=0)
+    return frame[frame.index.notna()].resample(freq.alias).mean()
+
+
+def positional_buckets(df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+    """Row order as the time axis, averaged into at most TIME_SERIES_MAX_PERIODS buckets."""
+    frame = df[columns]
+    if len(frame) <= TIME_SERIES_MAX_PERIODS:
+        return frame.reset_index(drop=True)
+    buckets = np.arange(len(frame)) * TIME_SERIES_MAX_PERIODS // len(frame)
+    return frame.groupby(buckets).mean()
+
+
+# ============================
+# MATRIX STATISTICS
+# ============================
+def trend_slopes(Y: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Least-squares fit y = intercept + slope·t of every column of Y
+    (t = 0..T-1, NaNs skipped per column): (slope, intercept, r2).
+    """
+    observed = ~np.isnan(Y)
+    t = np.arange(len(Y), dtype=np.float64)[:, None] * observed
+    y = np.where(observed, Y, 0.0)
+    n = observed.sum(axis=0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t_mean = t.sum(axis=0) / n
+        y_mean = y.sum(axis=0) / n
+        dt = (t - t_mean) * observed
+        dy = (y - y_mean) * observed
+        s_ty = (dt * dy).sum(axis=0)
+        s_tt = (dt ** 2).sum(axis=0)
+        s_yy = (dy ** 2).sum(axis=0)
+        slope = s_ty / s_tt
+        r2 = s_ty ** 2 / (s_tt * s_yy)
+    return slope, y_mean - slope * t_mean, np.nan_to_num(r2)
+
+
+def autocorrelation(R: np.ndarray) -> np.ndarray:
+    """Autocorrelation of every column at every lag (one zero-padded FFT)."""
+    T = len(R)
+    spectrum = np.fft.rfft(R, n=2 * T, axis=0)
+    acf = np.fft.irfft(spectrum * np.conj(spectrum), axis=0)[:T]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return acf / acf[0]
+
+
+def dominant_cycles(R: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Period (in buckets) of the strongest periodogram peak of every
+    column, with at least 3 full cycles in the data, and the
+    autocorrelation at that lag: (periods, strengths).
+    """
+    T = len(R)
+    power = np.abs(np.fft.rfft(R, axis=0)) ** 2
+    k_min = 3
+    if power.shape[0] <= k_min:
+        nan = np.full(R.shape[1], np.nan)
+        return nan, nan
+    k = np.argmax(power[k_min:], axis=0) + k_min
+    periods = np.maximum(np.rint(T / k).astype(int), 2)
+    strengths = autocorrelation(R)[periods, np.arange(R.shape[1])]
+    return periods, strengths
+
+
+def rolling_volatility(frame: pd.DataFrame, window: int, level: np.ndarray) -> np.ndarray:
+    """Average rolling standard deviation relative to the mean level."""
+    window = max(2, min(window, len(frame) // 2))
+    rolling = frame.rolling(window, min_periods=2).std().mean().to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return rolling / np.abs(level)
+
+
+# ============================
+# ENTRY POINT
+# ============================
+def analyze_time_series(df: pd.DataFrame, profile: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    """
+    {date_column, frequency, resolution, periods, start, end, window, columns}
+    where `columns` maps every numeric measure to
+    {slope, change_pct, r2, volatility, period, seasonality}.
+    `slope` is per bucket; `change_pct` is the fitted change over
+    the whole span relative to the mean level. None when there is
+    nothing to analyze. Memoized per frame.
+    """
+    cache = frame_cache(df)
+    if "time_series" in cache:
+        return cache["time_series"]
+
+    profile = profile_for(df, profile)
+    columns = [
+        c for c in profile["numeric_columns"]
+        if c in df.columns and str(c).lower() not in CALENDAR_COLUMNS
+    ]
+    result = None
+    if columns and len(df) >= MIN_PERIODS:
+        detected = detect_date_column(df, profile)
+        freq = choose_frequency(detected[1]) if detected else None
+        if freq is not None:
+            date_column, dates = detected
+            series = resample(df, dates, columns, freq)
+        else:
+            date_column, dates = None, None
+            series = positional_buckets(df, columns)
+        if len(series) >= MIN_PERIODS:
+            result = _analyze(series, columns, freq)
+            result["date_column"] = date_column
+            if dates is not None:
+                result["start"], result["end"] = dates.min(), dates.max()
+
+    cache["time_series"] = result
+    return result
+
+
+def _analyze(series: pd.DataFrame, columns: List[str], freq: Optional[Frequency]) -> Dict[str, Any]:
+    Y = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    T = len(Y)
+    slope, intercept, r2 = trend_slopes(Y)
+    level = np.nanmean(Y, axis=0)
+
+    # Cycles are looked for in what the trend leaves (gaps → 0)
+    residuals = Y - (intercept + slope * np.arange(T)[:, None])
+    residuals = np.nan_to_num(residuals - np.nanmean(residuals, axis=0))
+    periods, seasonality = dominant_cycles(residuals)
+
+    window = freq.window if freq else max(MIN_PERIODS, T // 20)
+    volatility = rolling_volatility(series, window, level)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change_pct = slope * (T - 1) / np.abs(level) * 100
+
+    def _num(value) -> Optional[float]:
+        return float(value) if np.isfinite(value) else None
+
+    return {
+        "frequency": freq.unit if freq else None,
+        "resolution": freq.adjective if freq else None,
+        "periods": T,
+        "start": None,
+        "end": None,
+        "window": max(2, min(window, T // 2)),
+        "columns": {
+            col: {
+                "slope": _num(slope[i]),
+                "change_pct": _num(change_pct[i]),
+                "r2": float(r2[i]),
+                "volatility": _num(volatility[i]),
+                "period": int(periods[i]) if np.isfinite(seasonality[i]) else None,
+                "seasonality": _num(seasonality[i]),
+            }
+            for i, col in enumerate(columns)
+        },
+    }
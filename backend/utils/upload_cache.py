@@ -0,0 +1,91 @@
+"""
+====================================================
+INSIGHTIFY – UPLOAD DEDUPLICATION CACHE
+====================================================
+
+Maps the content hash of an uploaded file to the
+response it produced (dataset_id, preview, report),
+so re-uploading the same workbook skips parsing and
+cleaning entirely.
+
+✔ Bounded by entry count AND approximate bytes
+✔ LRU eviction
+✔ Hit / miss / eviction counters
+====================================================
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from backend.utils.Config import UPLOAD_CACHE_MAX_ENTRIES, UPLOAD_CACHE_MAX_BYTES
+
+
+class UploadCache:
+    def __init__(self, max_entries: int = UPLOAD_CACHE_MAX_ENTRIES, max_bytes: int = UPLOAD_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: str, response: Dict[str, Any]) -> None:
+        size = len(json.dumps(response, default=str))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = response
+            self._sizes[key] = size
+            self._total_bytes += size
+
+            while len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def invalidate(self, key: str) -> None:
+        """Forget an entry whose dataset is no longer available."""
+        with self._lock:
+            self._drop(key)
+            # The lookup that found it was not a usable hit
+            self.hits -= 1
+            self.misses += 1
+
+    def _drop(self, key: str) -> None:
+        if key in self._entries:
+            del self._entries[key]
+            self._total_bytes -= self._sizes.pop(key)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+upload_cache = UploadCache()
@@ -139,21 +139,40 @@ export default function InsightifyChat() {
     return context;
   };
 
-  /* ------------------ AI ANSWER FUNCTION ------------------ */
-  const askAI = async (question) => {
-    try {
-      const res = await fetch("http://localhost:8000/api/ask", {
+  /* ------------------ DATASET REQUESTS ------------------ */
+  // A stored dataset is sent by id only; the rows go along only when
+  // there is no id, or when the server no longer knows it (expired or
+  // deleted), in which case the id is forgotten.
+  const postWithDataset = async (url, body, rowsKey) => {
+    const post = async (payload) => {
+      const res = await fetch(url, {
         method: "POST",
-        headers: {
-          "Content-Type": "application/json",
-        },
-        body: JSON.stringify({
-          question: question,
-          df: dataset,
-        }),
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ ...body, ...payload }),
       });
+      return res.json();
+    };
 
-      const data = await res.json();
+    const datasetId = localStorage.getItem("insightify_dataset_id");
+    if (datasetId) {
+      const data = await post({ dataset_id: datasetId });
+      const error = String(data.error || data.detail || "");
+      if (!error.includes("Unknown dataset_id")) {
+        return data;
+      }
+      localStorage.removeItem("insightify_dataset_id");
+    }
+    return post({ [rowsKey]: dataset });
+  };
+
+  /* ------------------ AI ANSWER FUNCTION ------------------ */
+  const askAI = async (question) => {
+    try {
+      const data = await postWithDataset(
+        "http://localhost:8000/api/ask",
+        { question: question },
+        "df"
+      );
 
       if (data.response && data.response.summary) {
         return data.response.summary;
@@ -306,12 +325,7 @@ export default function InsightifyChat() {
       q.includes("overview") ||
       q.includes("insight")
     ) {
-      fetch("http://localhost:8000/api/summary", {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ preview: dataset }),
-      })
-        .then((r) => r.json())
+      postWithDataset("http://localhost:8000/api/summary", {}, "preview")
         .then((d) => {
           const txt = d.summary || "Unable to generate summary.";
           setMessages((p) => [...p, { from: "ai", text: txt }]);
@@ -18,15 +18,21 @@ export default function Upload() {
     "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
     "application/json",
     "text/xml",
-    "application/xml"
+    "application/xml",
+    "application/x-ndjson",
+    "application/jsonl"
   ];
 
+  // Browsers often report an empty type for .jsonl / .ndjson files
+  const isAllowed = (f) =>
+    allowedTypes.includes(f.type) || /\.(jsonl|ndjson)$/i.test(f.name);
+
   const handleDragOver = (e) => e.preventDefault();
 
   const handleDrop = (e) => {
     e.preventDefault();
     const droppedFile = e.dataTransfer.files[0];
-    if (droppedFile && allowedTypes.includes(droppedFile.type)) {
+    if (droppedFile && isAllowed(droppedFile)) {
       setFile(droppedFile);
     } else {
       toast.error("Please upload a valid file: CSV, Excel, JSON, or XML");
@@ -35,7 +41,7 @@ export default function Upload() {
 
   const handleFileChange = (e) => {
     const selectedFile = e.target.files[0];
-    if (selectedFile && allowedTypes.includes(selectedFile.type)) {
+    if (selectedFile && isAllowed(selectedFile)) {
       setFile(selectedFile);
     } else {
       toast.error("Please upload a valid file: CSV, Excel, JSON, or XML");
@@ -67,6 +73,7 @@ export default function Upload() {
         setProgress(100);
         setPreview(data);
         localStorage.setItem("insightify_df", JSON.stringify(data.preview));
+        localStorage.setItem("insightify_dataset_id", data.dataset_id || "");
         toast.success("File uploaded successfully!");
         navigate("/chat", { state: { df: data.preview } });
       } else {
@@ -0,0 +1,49 @@
+import pandas as pd
+
+from backend.utils.aggregation_planner import Aggregate, AggregationPlan, resolve
+from backend.utils.column_profile import build_profile
+
+
+def _frame():
+    return pd.DataFrame({
+        "Order Date": pd.to_datetime(["2022-01-05", "2022-06-01", "2023-02-10", "2023-03-01"]),
+        "Segment": ["Consumer", "Corporate", "Consumer", "Consumer"],
+        "Sales": [100.0, 250.0, 80.0, 120.0],
+        "Profit": [10.0, -5.0, 8.0, 0.0],
+    })
+
+
+def test_plan_deduplicates_and_scans_once_per_grouping_key():
+    df = _frame()
+    plan = AggregationPlan([
+        Aggregate("Sales", "sum", "Segment"),
+        Aggregate("Profit", "mean", "Segment"),
+        Aggregate("Sales", "sum", "Segment"),
+        Aggregate("Sales", "sum", "Order Date.year"),
+        Aggregate("Profit", "positive_share"),
+        Aggregate("Sales", "mean"),
+    ])
+    results = plan.execute(df, build_profile(df))
+
+    assert plan.stats["aggregates"] == 5
+    assert plan.stats["passes"] == 3  # Segment, Order Date.year, ungrouped
+    assert plan.stats["from_profile"] == 1
+
+    pd.testing.assert_series_equal(
+        results[Aggregate("Sales", "sum", "Segment")], df.groupby("Segment")["Sales"].sum()
+    )
+    assert results[Aggregate("Sales", "sum", "Order Date.year")].to_dict() == {2022: 350.0, 2023: 200.0}
+    assert results[Aggregate("Profit", "positive_share")] == 0.5
+    assert results[Aggregate("Sales", "mean")] == df["Sales"].mean()
+
+    # Second plan over the same frame is served from the per-frame memo
+    again = AggregationPlan([Aggregate("Profit", "mean", "Segment")])
+    again.execute(df)
+    assert again.stats == {**again.stats, "from_cache": 1, "passes": 0}
+
+
+def test_resolve_returns_named_results():
+    df = _frame()
+    values = resolve({"total": Aggregate("Sales", "sum"), "by_segment": Aggregate("Sales", "max", "Segment")}, df)
+    assert values["total"] == 550.0
+    assert values["by_segment"].to_dict() == {"Consumer": 120.0, "Corporate": 250.0}
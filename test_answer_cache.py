@@ -0,0 +1,92 @@
+from types import SimpleNamespace
+
+import pandas as pd
+from fastapi.testclient import TestClient
+
+import backend.utils.ai_chat_engine as engine
+from backend.main import app
+from backend.utils.answer_cache import AnswerCache, answer_key, normalize_question
+
+client = TestClient(app)
+
+rows = [
+    {"Segment": "Consumer", "Country": "France", "Sales": 120.0},
+    {"Segment": "Corporate", "Country": "Spain", "Sales": 80.0},
+]
+
+
+class FakeGroq:
+    def __init__(self):
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        self.calls += 1
+        message = SimpleNamespace(content=f" answer {self.calls} ")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def test_key_ignores_case_whitespace_and_punctuation():
+    df = pd.DataFrame(rows)
+    assert normalize_question("  What's the WEATHER like?? ") == "whats the weather like"
+    assert answer_key(df, "Why is Spain low?", "m", 1) == answer_key(df.copy(), "why is  spain low", "m", 1)
+    assert answer_key(df, "Why is Spain low?", "m", 1) != answer_key(df, "Why is Spain low?", "m", 2)
+    assert answer_key(df, "Why is Spain low?", "m", 1) != answer_key(df, "Why is Spain low?", "other", 1)
+    assert answer_key(df, "Why is Spain low?", "m", 1) != answer_key(df.iloc[:1], "Why is Spain low?", "m", 1)
+
+
+def test_cache_persists_evicts_lru_and_expires(tmp_path, monkeypatch):
+    path = str(tmp_path / "answers.sqlite3")
+    cache = AnswerCache(path, max_entries=2, ttl_seconds=60)
+    cache.put("a", "one")
+    cache.put("b", "two")
+    assert cache.get("a") == "one"
+    cache.put("c", "three")  # evicts "b", the least recently used
+    assert cache.get("b") is None and cache.stats()["evictions"] == 1
+
+    reopened = AnswerCache(path, max_entries=2, ttl_seconds=60)
+    assert reopened.get("c") == "three"
+    assert reopened.stats()["entries"] == 2 and reopened.stats()["hit_rate"] == 1.0
+
+    import backend.utils.answer_cache as module
+    now = module.time.time()
+    monkeypatch.setattr(module.time, "time", lambda: now + 61)
+    assert reopened.get("a") is None
+    assert reopened.stats()["expirations"] == 1
+
+
+def test_repeat_llm_question_is_served_from_cache(tmp_path, monkeypatch):
+    fake = FakeGroq()
+    monkeypatch.setattr(engine, "client", fake)
+    monkeypatch.setattr(engine, "answer_cache", AnswerCache(str(tmp_path / "answers.sqlite3")))
+
+    first = engine.answer_query("Why are sales in Spain low?", rows)
+    second = engine.answer_query("why are sales in spain low", rows)
+    assert first == {"summary": "answer 1", "chart": None, "cached": False}
+    assert second == {"summary": "answer 1", "chart": None, "cached": True}
+    assert fake.calls == 1
+
+    engine.answer_query("Why are sales in Spain low?", rows[:1])  # other data
+    assert fake.calls == 2
+    assert engine.answer_cache.stats()["hits"] == 1
+
+
+def test_stats_route():
+    stats = client.get("/api/ask/cache").json()
+    assert {"entries", "hits", "misses", "evictions", "expirations", "hit_rate"} <= set(stats)
+
+
+def test_unwritable_cache_path_disables_the_cache(tmp_path, monkeypatch):
+    blocker = tmp_path / "not-a-directory"
+    blocker.write_text("")
+    cache = AnswerCache(str(blocker / "answers.sqlite3"))  # makedirs raises OSError
+
+    assert cache.get("a") is None
+    cache.put("a", "one")
+    assert cache.stats()["enabled"] is False and cache.stats()["errors"] == 2
+
+    # The LLM answer is still returned, just not cached
+    fake = FakeGroq()
+    monkeypatch.setattr(engine, "client", fake)
+    monkeypatch.setattr(engine, "answer_cache", cache)
+    assert engine.answer_query("Why are sales in Spain low?", rows)["summary"] == "answer 1"
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+import backend.utils.associations as associations
+from backend.utils.associations import find_associations
+from backend.utils.chart_planner import plan_charts_from_preview
+
+
+def _frame(n=2000):
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=n)
+    region = rng.choice(["North", "South", "East"], size=n)
+    return pd.DataFrame({
+        "x": x,
+        "y": 2 * x + rng.normal(scale=0.1, size=n),
+        "z": -x + rng.normal(scale=0.1, size=n),
+        "noise": rng.normal(size=n),
+        "Region": region,
+        "Zone": pd.Series(region).map({"North": "N", "South": "S", "East": "E"}),
+        "Shifted": np.where(region == "North", 10.0, 0.0) + rng.normal(size=n),
+    })
+
+
+def test_numeric_pairs_match_pandas_and_keep_sign():
+    df = _frame()
+    pairs = find_associations(df, kinds=("numeric",), min_strength=0.7)
+
+    found = {(p["a"], p["b"]): p["value"] for p in pairs}
+    assert set(found) == {("x", "y"), ("x", "z"), ("y", "z")}
+    assert found[("x", "z")] < 0
+    assert np.isclose(found[("x", "y")], df["x"].corr(df["y"]))
+    assert [p["strength"] for p in pairs] == sorted((p["strength"] for p in pairs), reverse=True)
+
+
+def test_categorical_and_mixed_associations():
+    df = _frame()
+    pairs = find_associations(df, kinds=("categorical", "mixed"))
+
+    region_zone = next(p for p in pairs if {p["a"], p["b"]} == {"Region", "Zone"})
+    assert region_zone["method"] == "cramers_v"
+    assert np.isclose(region_zone["value"], 1.0)
+
+    shifted = next(p for p in pairs if p["a"] == "Shifted" and p["b"] == "Region")
+    assert shifted["kind"] == "mixed"
+    assert shifted["value"] > 0.9
+
+    noise = [p for p in pairs if p["a"] == "noise"]
+    assert all(p["strength"] < 0.2 for p in noise)
+
+
+def test_tall_frames_are_sampled(monkeypatch):
+    monkeypatch.setattr(associations, "ASSOCIATION_SAMPLE_ROWS", 500)
+    seen = []
+    original = associations._sample
+    monkeypatch.setattr(associations, "_sample", lambda df, rows: seen.append(rows) or original(df, rows))
+
+    pairs = find_associations(_frame(5000), kinds=("numeric",), top_k=1)
+
+    assert seen == [500]
+    assert (pairs[0]["a"], pairs[0]["b"]) == ("x", "y")
+
+
+def test_chart_planner_adds_association_charts():
+    plans = plan_charts_from_preview(_frame(), max_charts=4)
+
+    assert plans[0]["chart_type"] == "scatter"
+    assert (plans[0]["x"], plans[0]["y"]) == ("x", "y")
+    assert {"chart_type": "bar", "x": "Region", "y": "Shifted"}.items() <= \
+        next(p for p in plans if p["y"] == "Shifted").items()
+    assert len(plans) == 4
+
+    # Name-based plans come first and are not duplicated
+    df = pd.DataFrame({"Segment": ["A", "B"] * 50, "Sales": [1.0, 100.0] * 50})
+    plans = plan_charts_from_preview(df, max_charts=4)
+    assert [(p["x"], p["y"]) for p in plans] == [("Segment", "Sales")]
@@ -0,0 +1,66 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.utils.ai_chat_engine import cached_logical_summary
+from backend.utils.batch_summary import summarize_batch
+from backend.utils.dataset_store import dataset_store
+
+client = TestClient(app)
+
+rows = [
+    {"Segment": "Consumer", "Country": "France", "Sales": 120.0, "Profit": 12.0},
+    {"Segment": "Corporate", "Country": "Spain", "Sales": 80.0, "Profit": -3.0},
+    {"Segment": "Home Office", "Country": "France", "Sales": 95.5, "Profit": 7.0},
+]
+
+
+def _uploaded_id():
+    csv = b"Department,Salary,Gender\nSales,50000,F\nIT,72000,M\nIT,68000,F\nHR,45000,M\n"
+    return client.post("/api/upload", files={"file": ("staff.csv", csv, "text/csv")}).json()["dataset_id"]
+
+
+def test_batch_endpoint_isolates_errors_and_keeps_input_order():
+    dataset_id = _uploaded_id()
+    body = client.post("/api/summary/batch", json={"datasets": [
+        {"dataset_id": dataset_id},
+        {"dataset_id": "0" * 32},
+        {"preview": rows},
+        {"preview": []},
+    ]}).json()
+
+    assert body["count"] == 4 and body["failed"] == 2
+    stored, unknown, inline, empty = body["results"]
+    assert [r["index"] for r in body["results"]] == [0, 1, 2, 3]
+
+    assert stored["ok"] and stored["dataset_id"] == dataset_id
+    df = dataset_store.get(dataset_id)
+    assert stored["summary"] == cached_logical_summary(df, dataset_store.get_profile(dataset_id))
+    assert stored["rows"] == 4 and stored["seconds"] >= 0
+
+    assert not unknown["ok"] and "Unknown dataset_id" in unknown["error"]
+    assert inline["ok"] and "Segment" in inline["summary"]
+    assert not empty["ok"] and empty["error"] == "Dataset is empty."
+
+
+def test_batch_endpoint_streams_ndjson():
+    response = client.post("/api/summary/batch", json={
+        "datasets": [{"preview": rows}, {"preview": rows[:2]}], "stream": True,
+    })
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(line["index"] for line in lines[:-1]) == [0, 1]
+    assert all(line["ok"] for line in lines[:-1])
+    assert lines[-1]["done"] and lines[-1]["count"] == 2 and lines[-1]["failed"] == 0
+
+
+def test_python_api_and_batch_limit(monkeypatch):
+    results = summarize_batch([{"preview": rows}, {"dataset_id": "not-an-id"}])
+    assert [r["ok"] for r in results] == [True, False]
+
+    import backend.routes.summary as summary_route
+    monkeypatch.setattr(summary_route, "BATCH_SUMMARY_MAX_ITEMS", 1)
+    response = client.post("/api/summary/batch", json={"datasets": [{"preview": rows}] * 2})
+    assert response.status_code == 413
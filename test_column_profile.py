@@ -0,0 +1,49 @@
+import pandas as pd
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.utils.ai_chat_engine import generate_logical_summary
+from backend.utils.column_profile import build_profile, profile_for
+from backend.utils.dataset_store import dataset_store
+
+client = TestClient(app)
+
+hr_df = pd.DataFrame({
+    "Employee": ["Ana", "Ben", "Cy", "Dee", "Eve"],
+    "Department": ["Sales", "Sales", "IT", "HR", "IT"],
+    "Salary": [40000.0, 52000.0, 61000.0, 45000.0, 70000.0],
+    "Gender": ["F", "M", "M", "F", "F"],
+})
+
+
+def test_profile_contents():
+    profile = build_profile(hr_df)
+
+    salary = profile["columns"]["Salary"]
+    assert salary["kind"] == "numeric"
+    assert salary["min"] == 40000.0 and salary["max"] == 70000.0
+    assert salary["quantiles"]["0.5"] == 52000.0
+    assert profile["columns"]["Department"]["distinct"] == 3
+    assert profile["columns"]["Department"]["top"][0]["count"] == 2
+    assert profile["numeric_columns"] == ["Salary"]
+    assert profile["memory_bytes"] > 0
+
+    # A profile for another frame shape is ignored
+    assert profile_for(hr_df.head(2), profile)["rows"] == 2
+
+
+def test_summary_from_profile_matches_rescan():
+    profile = build_profile(hr_df)
+    assert generate_logical_summary(hr_df.copy(), profile) == generate_logical_summary(hr_df.copy())
+
+
+def test_upload_stores_profile():
+    csv = hr_df.to_csv(index=False).encode()
+    body = client.post("/api/upload", files={"file": ("staff.csv", csv, "text/csv")}).json()
+
+    profile = dataset_store.get_profile(body["dataset_id"])
+    assert profile["rows"] == 5
+    assert "profile_seconds" in body["cleaning_report"]
+
+    summary = client.post("/api/summary", json={"dataset_id": body["dataset_id"]}).json()
+    assert "Sales" in summary["summary"] or "IT" in summary["summary"]
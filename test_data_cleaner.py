@@ -0,0 +1,198 @@
+import numpy as np
+import pandas as pd
+
+from backend.utils.data_cleaner import (
+    DEFAULT_STEPS, CleaningPipeline, clean_dataset, clean_dataset_streaming,
+)
+from backend.utils.deduplicator import RowDeduplicator
+from backend.utils.dtype_optimizer import optimize_dtypes
+from backend.utils.time_features import get_column, time_feature
+
+
+def _frame():
+    return pd.DataFrame({
+        "Order Date": ["05/01/2024", "13/01/2024", "28/02/2024", "01/03/2024"],
+        "Region": ["North", "South", "East", "West"],
+        "Units": [1, 2, 3, 4],
+    })
+
+
+def test_dates_are_detected_with_one_inferred_format():
+    df, report = clean_dataset(_frame())
+
+    assert report["date_columns"] == ["Order Date"]
+    assert report["date_detection"]["Order Date"]["format"] == "%d/%m/%Y"
+    assert report["date_detection"]["Region"]["is_date"] is False
+    assert "Units" not in report["date_detection"]
+    assert all(entry["seconds"] >= 0 for entry in report["date_detection"].values())
+
+    # Day-first values are not read month-first
+    assert df["Order Date"].iloc[0] == pd.Timestamp("2024-01-05")
+
+
+
+def test_time_features_are_lazy_and_memoized():
+    df, report = clean_dataset(_frame())
+
+    # Nothing is materialized on the cleaned frame
+    assert list(df.columns) == ["Order Date", "Region", "Units"]
+    assert "Order Date.year" in report["time_features"]
+
+    names = get_column(df, "Order Date.month_name")
+    assert names.tolist() == ["January", "January", "February", "March"]
+    assert time_feature(df, "Order Date", "month_name") is names
+    assert get_column(df, "Order Date.year").tolist() == [2024] * 4
+
+
+def test_streaming_reuses_the_first_chunk_format():
+    df = _frame()
+    chunks = [df.iloc[:2], df.iloc[2:]]
+
+    cleaned, report = clean_dataset_streaming(chunks)
+
+    assert report["date_columns"] == ["Order Date"]
+    assert cleaned["Order Date"].iloc[3] == pd.Timestamp("2024-03-01")
+
+
+def test_row_hash_dedup_matches_drop_duplicates_across_chunks():
+    df = pd.DataFrame({"k": [1, 2, 1, 3, 2, 4, 1], "s": list("abacbdz")})
+    dedup = RowDeduplicator()
+
+    kept = pd.concat([dedup.drop_duplicates(df.iloc[i:i + 3]) for i in range(0, len(df), 3)])
+
+    assert kept.index.equals(df.drop_duplicates().index)
+    assert dedup.stats()["rows_examined"] == 7
+    assert dedup.duplicates_removed == 2
+
+
+def test_exact_verification_keeps_colliding_rows(monkeypatch):
+    import backend.utils.deduplicator as deduplicator
+
+    # Force every row onto one hash, as a 64-bit collision would
+    monkeypatch.setattr(deduplicator, "row_hashes", lambda chunk: np.zeros(len(chunk), dtype=np.uint64))
+    df = pd.DataFrame({"v": ["a", "b", "a"]})
+
+    assert len(RowDeduplicator(verify=False).drop_duplicates(df)) == 1
+
+    dedup = RowDeduplicator(verify=True)
+    assert dedup.drop_duplicates(df).index.tolist() == [0, 1]
+    assert dedup.stats()["hash_collisions"] == 1
+
+
+def test_dedup_keeps_values_that_only_print_alike():
+    df = pd.DataFrame({
+        "v": pd.Series([1, "1", 1.0, "1.0", None, float("nan"), "1"], dtype=object),
+        "w": ["x"] * 7,
+    })
+    kept = RowDeduplicator(verify=False).drop_duplicates(df)
+    # 1 == 1.0 and None ~ NaN, as in drop_duplicates; "1" is not 1
+    assert kept.index.equals(df.drop_duplicates().index)
+    assert kept.index.tolist() == [0, 1, 3, 4]
+
+
+def test_dedup_finds_duplicates_across_chunks_with_different_dtypes():
+    first = pd.DataFrame({"k": [1, 2], "s": ["a", "b"], "c": pd.Series(["x", "y"], dtype="category")})
+    second = pd.DataFrame({  # one NaN turns k into float64; s came out as object
+        "k": [1.0, np.nan, 2.0],
+        "s": pd.Series(["a", "c", "b"], dtype=object),
+        "c": ["x", "z", "y"],
+    })
+    assert first["k"].dtype == np.int64 and second["k"].dtype == np.float64
+
+    dedup = RowDeduplicator(verify=False)
+    assert dedup.keep_mask(first).tolist() == [True, True]
+    assert dedup.keep_mask(second).tolist() == [False, True, False]
+    assert dedup.duplicates_removed == 2
+
+
+def test_pipeline_reports_steps_and_accepts_custom_steps():
+    df = pd.DataFrame({" Units ": [1.0, None, 3.0, 3.0], "Region": ["N", None, "S", "S"]})
+
+    cleaned, report = clean_dataset(df)
+    assert [s["name"] for s in report["steps"]] == ["column_names", "missing_values", "duplicates", "dates", "dtypes"]
+    assert all("seconds" in s and "memory_delta_mb" in s for s in report["steps"])
+    assert report["missing_filled"] == 2
+    assert cleaned["Units"].tolist() == [1.0, 3.0, 3.0]
+    assert report["column_types"]["numeric"] == ["Units"]
+
+    def drop_small(frame, rep):
+        rep["dropped_small"] = int((frame["Units"] < 2).sum())
+        return frame[frame["Units"] >= 2]
+
+    pipeline = CleaningPipeline(DEFAULT_STEPS[:2] + [("drop_small", drop_small)])
+    cleaned, report = pipeline.run(df)
+    assert report["dropped_small"] == 1 and report["final_rows"] == 3
+
+
+def test_chat_engine_cleaner_uses_the_pipeline():
+    from backend.utils.ai_chat_engine import clean_dataset as chat_clean
+
+    df, report = chat_clean(pd.DataFrame({"a": [1, 1, None]}))
+    assert report["missing_values_filled"] == 1
+    assert report["duplicates_removed"] == 2
+    assert [s["name"] for s in report["steps"]] == ["column_names", "missing_values", "duplicates"]
+
+
+def test_dtypes_are_compacted_without_changing_values():
+    df = pd.DataFrame({
+        "Segment": ["Consumer", "Corporate", "Consumer", "Home Office"] * 50,
+        "Customer": [f"C{i}" for i in range(200)],
+        "Units": list(range(200)),
+        "Discount": [0.0, 0.5, 0.25, 0.125] * 50,
+        "Price": [19.99, 5.1, 7.3, 2.2] * 50,
+    })
+
+    compact, report = optimize_dtypes(df)
+    assert str(compact["Segment"].dtype) == "category"
+    assert compact["Customer"].dtype == df["Customer"].dtype
+    assert compact["Units"].dtype == "int16"
+    assert compact["Discount"].dtype == "float32"
+    assert compact["Price"].dtype == "float64"  # 19.99 does not round-trip
+
+    assert set(report["columns"]) == {"Segment", "Units", "Discount"}
+    assert report["memory_after_bytes"] < report["memory_before_bytes"]
+    assert compact["Units"].sum() == df["Units"].sum()
+    pd.testing.assert_frame_equal(compact.astype(df.dtypes.to_dict()), df)
+
+    _, cleaning_report = clean_dataset(df)
+    assert cleaning_report["memory"]["saved_bytes"] > 0
+
+
+def test_streaming_assembles_columns_like_concat():
+    chunks = [
+        pd.DataFrame({"Region": ["N", "S", "N"], "Units": [1.0, None, 3.0]}),
+        pd.DataFrame({"Region": ["S", None], "Units": [5.0, 6.0], "Late": ["x", "y"]}),
+    ]
+    cleaned, report = clean_dataset_streaming(chunks)
+
+    assert list(cleaned.columns) == ["Region", "Units", "Late"]
+    assert cleaned["Units"].tolist() == [1.0, 4.0, 3.0, 5.0, 6.0]  # median fill
+    assert cleaned["Region"].astype(str).tolist() == ["N", "S", "N", "S", "Unknown"]
+    assert cleaned["Late"].astype(str).tolist() == ["Unknown"] * 3 + ["x", "y"]
+    assert report["final_rows"] == 5
+    assert report["memory"]["columns"]["Units"] == {"from": "float64", "to": "float32"}
+
+
+def test_streaming_finish_does_not_copy_the_whole_frame():
+    import gc
+    import tracemalloc
+
+    from backend.utils.data_cleaner import StreamingCleaner
+
+    rng = np.random.default_rng(0)
+    tracemalloc.start()
+    try:
+        cleaner = StreamingCleaner()
+        for _ in range(10):
+            cleaner.add_chunk(pd.DataFrame(rng.random((20_000, 8)), columns=list("abcdefgh")))
+        gc.collect()
+        held = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        cleaned, _ = cleaner.finish()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    # Chunks + a concatenated copy would be about 2x what is held
+    assert peak < 1.6 * held
+    assert cleaned.shape == (200_000, 8)
@@ -0,0 +1,81 @@
+import pandas as pd
+from backend.utils.dataset_store import DatasetStore
+
+# Small cleaned dataset
+sample_df = pd.DataFrame({
+    "Segment": ["Government", "Midmarket", "Enterprise"],
+    "Sales": [26420.0, 32343.3, 15000.0],
+})
+
+
+def test_roundtrip_and_eviction(tmp_path):
+    store = DatasetStore(max_items=1, spill_dir=str(tmp_path))
+
+    first_id = store.put(sample_df, {"filename": "sales.csv"})
+    second_id = store.put(sample_df.head(1))
+
+    # First dataset was evicted from memory but reloads from the spill
+    assert store.stats()["in_memory"] == 1
+    reloaded = store.get(first_id)
+    pd.testing.assert_frame_equal(reloaded, sample_df)
+    assert store.get_meta(first_id)["filename"] == "sales.csv"
+    assert store.stats()["disk_loads"] == 1
+
+    assert len(store.get(second_id)) == 1
+
+
+def test_unknown_and_invalid_ids(tmp_path):
+    store = DatasetStore(spill_dir=str(tmp_path))
+
+    assert store.get("0" * 32) is None
+    assert store.get("../../etc/passwd") is None
+
+
+def test_prune_by_last_use_and_size(tmp_path):
+    import os
+    import time
+
+    store = DatasetStore(spill_dir=str(tmp_path), ttl_seconds=60, max_bytes=10**9)
+    stale = store.put(sample_df)
+    fresh = store.put(sample_df)
+    # `stale` was last used two minutes ago
+    old = time.time() - 120
+    for name in os.listdir(tmp_path):
+        if name.startswith(stale):
+            os.utime(tmp_path / name, (old, old))
+
+    assert store.prune() == 1
+    assert not store.exists(stale) and store.exists(fresh)
+
+    # Size cap: the least recently used go first, the new one stays
+    one_size = sum(os.path.getsize(tmp_path / n) for n in os.listdir(tmp_path))
+    store.max_bytes = one_size * 2
+    third = store.put(sample_df)
+    recent = time.time() - 30
+    for name in os.listdir(tmp_path):
+        if name.startswith((fresh, third)):
+            os.utime(tmp_path / name, (recent, recent))
+    store.get(fresh)  # touched: now more recently used than `third`
+    fourth = store.put(sample_df)
+    assert store.exists(fresh) and store.exists(fourth) and not store.exists(third)
+    assert store.stats()["pruned"] == 2
+
+
+def test_startup_prunes_leftovers_and_delete_route(tmp_path):
+    import os
+    from fastapi.testclient import TestClient
+    from backend.main import app
+
+    leftover = DatasetStore(spill_dir=str(tmp_path)).put(sample_df)
+    for name in os.listdir(tmp_path):
+        os.utime(tmp_path / name, (0, 0))
+    assert DatasetStore(spill_dir=str(tmp_path), ttl_seconds=60).exists(leftover) is False
+
+    client = TestClient(app)
+    csv = b"Segment,Sales\nGovernment,26420\nMidmarket,32343.3\n"
+    dataset_id = client.post("/api/upload", files={"file": ("sales.csv", csv, "text/csv")}).json()["dataset_id"]
+    assert client.delete(f"/api/datasets/{dataset_id}").json() == {"dataset_id": dataset_id, "deleted": True}
+    assert client.delete(f"/api/datasets/{dataset_id}").status_code == 404
+    assert client.post("/api/ask", json={"question": "total Sales", "dataset_id": dataset_id}).json() == {
+        "error": "Unknown dataset_id. Please upload the dataset again."
+    }
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.utils.column_profile import build_profile
+from backend.utils.summary_analyzers import summarize
+from backend.utils.summary_sampling import annotate_sentence, stratified_sample
+
+client = TestClient(app)
+
+
+def _sales(n=60_000):
+    rng = np.random.default_rng(0)
+    segment = rng.choice(["Consumer", "Corporate", "Home Office"], n, p=[0.6, 0.3, 0.1])
+    return pd.DataFrame({
+        "Segment": pd.Categorical(segment),
+        "Country": rng.choice(["US", "UK", "IN", "DE"], n),
+        "Sales": rng.gamma(2, 50, n),
+        "Profit": rng.normal(5, 30, n),
+        "Order Date": pd.Timestamp("2019-01-01") + pd.to_timedelta(rng.integers(0, 4 * 365, n), unit="D"),
+    })
+
+
+def test_annotate_sentence_marks_only_varying_numbers():
+    sentence = "Sales grew 12.5% to 1,200 over 3 years since 2020-01-31 (40-84% band)."
+    replicates = [
+        "Sales grew 12.0% to 1,150 over 3 years since 2020-01-31 (40-84% band).",
+        "Sales grew 13.0% to 1,250 over 3 years since 2020-01-31 (40-84% band).",
+        "Top product changed, 99.0% of sales.",  # different wording: ignored
+    ]
+    annotated = annotate_sentence(sentence, replicates)
+
+    assert annotated.startswith("Sales grew 12.5% (±1.0%) to 1,200 (±98) over 3 years since 2020-01-31")
+    assert annotated.endswith("(40-84% band).")
+    assert annotate_sentence(sentence, replicates[:1]) == sentence  # too few to estimate
+
+
+def test_stratified_sample_is_proportional_and_deterministic():
+    df = _sales()
+    sample = stratified_sample(df, 5000, 4)
+
+    assert len(sample.frame) == 5000 and sample.rows == len(df)
+    assert sample.strata == ["Segment", "Country"]
+    full = df["Segment"].value_counts(normalize=True)
+    sampled = sample.frame["Segment"].value_counts(normalize=True)
+    assert np.allclose(full.sort_index(), sampled.sort_index(), atol=0.01)
+    assert [len(r) for r in sample.replicates] == [3750] * 4
+
+    again = stratified_sample(df.copy(), 5000, 4)
+    pd.testing.assert_frame_equal(sample.frame, again.frame)
+
+
+def test_fast_mode_keeps_profile_numbers_exact_and_bounds_the_rest():
+    df = _sales()
+    profile = build_profile(df)
+    exact, _ = summarize(df, profile)
+    fast, info = summarize(df, profile, mode="fast")
+
+    assert info["mode"] == "fast"
+    assert info["sample"] == {"rows": 20_000, "of_rows": 60_000, "strata": ["Segment", "Country"], "replicates": 8}
+    # Row count and totals come from the full-data profile
+    assert f"across {len(df)} records" in fast
+    total = next(s for s in exact.split(". ") if s.startswith("Total sales volume"))
+    assert total in fast
+    # Shares, growth and concentration are estimates with a margin
+    assert "% (±" in fast
+    assert "market concentration" in fast
+
+
+def test_fast_mode_on_small_frames_is_exact():
+    df = _sales(500)
+    text, info = summarize(df, None, mode="fast")
+    assert info["mode"] == "exact" and "sample" not in info
+    assert text == summarize(df, None)[0]
+
+
+def test_summary_route_mode():
+    rows = _sales(50).astype({"Order Date": str, "Segment": str}).to_dict("records")
+    body = client.post("/api/summary", json={"preview": rows, "mode": "fast"}).json()
+    assert body["mode"] == "exact" and "approximate" not in body
+
+    response = client.post("/api/summary", json={"preview": rows, "mode": "rough"})
+    assert response.status_code == 422
@@ -0,0 +1,96 @@
+import time
+
+from fastapi.testclient import TestClient
+from backend.main import app
+from backend.utils.job_queue import JobQueue
+
+client = TestClient(app)
+
+
+def _wait(job_id, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = client.get(f"/api/jobs/{job_id}").json()
+        if job["status"] in ("done", "failed"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError("job did not finish")
+
+
+def test_async_upload_reports_stages_and_result():
+    csv = b"Region,Units\nNorth,4\nSouth,7\nEast,1\nWest,9\n"
+
+    queued = client.post(
+        "/api/upload?async_job=true", files={"file": ("jobs.csv", csv, "text/csv")}
+    ).json()
+    assert queued["stages"] == ["parse", "clean", "profile", "store", "preview"]
+
+    job = _wait(queued["job_id"])
+    assert job["status"] == "done", job["error"]
+    assert job["progress"] == 1.0
+    assert all(s["status"] == "done" and s["seconds"] is not None for s in job["stages"])
+    assert job["result"]["rows"] == 4
+
+    # Streamed uploads report the same stages
+    streamed = client.post(
+        "/api/upload?async_job=true&stream=true", files={"file": ("jobs.csv", csv, "text/csv")}
+    ).json()
+    job = _wait(streamed["job_id"])
+    assert [(s["name"], s["status"]) for s in job["stages"]] == [
+        (name, "done") for name in ["parse", "clean", "profile", "store", "preview"]
+    ]
+
+    assert client.get("/api/jobs/" + "0" * 32).status_code == 404
+
+
+def test_failed_stage_and_ttl_expiry():
+    queue = JobQueue(max_workers=1, ttl_seconds=0)
+
+    def boom(ctx):
+        with ctx.stage("parse"):
+            raise ValueError("bad file")
+
+    job = queue.submit("test", ["parse", "store"], boom)
+    deadline = time.time() + 10
+    while job.finished_at is None and time.time() < deadline:
+        time.sleep(0.01)
+
+    assert job.status == "failed" and job.error == "bad file"
+    assert [s["status"] for s in job.stages] == ["failed", "pending"]
+
+    time.sleep(0.01)
+    assert queue.describe(job.id) is None
+    queue.shutdown()
+
+
+def test_follow_mirrors_stages_reported_by_a_task():
+    import queue as stdlib_queue
+    from concurrent.futures import ThreadPoolExecutor
+
+    jobs = JobQueue(max_workers=1)
+    channel = stdlib_queue.Queue()
+
+    def task(fail):
+        channel.put("parse")
+        time.sleep(0.1)
+        channel.put("clean")
+        if fail:
+            raise ValueError("bad rows")
+        channel.put("profile")
+        return "tables"
+
+    def job_fn(ctx, fail):
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            return ctx.follow(pool.submit(task, fail), channel)
+
+    ok = jobs.submit("test", ["parse", "clean", "profile"], job_fn, False)
+    failed = jobs.submit("test", ["parse", "clean", "profile"], job_fn, True)
+    deadline = time.time() + 10
+    while failed.finished_at is None and time.time() < deadline:
+        time.sleep(0.01)
+
+    assert ok.result == "tables" and [s["status"] for s in ok.stages] == ["done"] * 3
+    assert ok.stages[0]["seconds"] >= 0.1
+    assert failed.error == "bad rows"
+    assert [s["status"] for s in failed.stages] == ["done", "failed", "pending"]
+    jobs.shutdown()
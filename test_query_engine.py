@@ -0,0 +1,183 @@
+import numpy as np
+import pandas as pd
+
+from backend.utils.ai_chat_engine import answer_query, is_summary_intent
+from backend.utils.column_profile import build_profile
+from backend.utils.dtype_optimizer import optimize_dtypes
+from backend.utils.query_engine import answer_locally, parse_query, route_question
+
+
+def _sales(n=5000):
+    rng = np.random.default_rng(1)
+    return pd.DataFrame({
+        "Segment": rng.choice(["Consumer", "Corporate", "Home Office"], n),
+        "Country": rng.choice(["France", "Spain", "United States"], n),
+        "Sales": rng.gamma(2, 50, n).round(2),
+        "Profit": rng.normal(5, 30, n).round(2),
+        "Unit Price": rng.random(n),
+    })
+
+
+def test_router_precedence():
+    df = _sales(200)
+    assert route_question("Plot Sales by Segment", df).kind == "chart"
+    assert route_question("Show me a dashboard", df).kind == "chart"
+    # Weak chart phrases only chart when nothing parses
+    assert route_question("Show me the top 5 Country by Sales.", df).kind == "query"
+    assert route_question("Show me something nice", df).kind == "chart"
+    assert route_question("Give an overview of the dataset.", df).kind == "summary"
+    assert route_question("What's the weather like?", df).kind == "llm"
+    assert is_summary_intent("Can you analyze this?") and not is_summary_intent("Sales by Country")
+
+
+def test_parser_reads_columns_values_and_k():
+    df = _sales(200)
+    query = parse_query("Show me the bottom 2 country by average unit price in France or Spain", df)
+    assert (query.op, query.func, query.measures, query.dimension, query.k) == (
+        "bottom", "mean", ("Unit Price",), "Country", 2,
+    )
+    assert query.filters == (("Country", ("France", "Spain")),)
+    assert parse_query("Which Segment made the highest Sales?", df).k == 1
+    assert parse_query("How is the weather?", df) is None
+
+
+def test_answers_match_pandas():
+    df = _sales()
+    profile = build_profile(df)
+
+    top = answer_locally("Which Segment made the highest Sales?", df, profile)
+    by_segment = df.groupby("Segment")["Sales"].sum()
+    assert top["data"] == [{"Segment": by_segment.idxmax(), "Sales": by_segment.max()}]
+    assert top["answer"].startswith(f"{by_segment.idxmax()} has the highest total Sales")
+
+    top3 = answer_locally("Show me the top 3 Country by Profit.", df, profile)
+    expected = df.groupby("Country")["Profit"].sum().sort_values(ascending=False)
+    assert [r["Country"] for r in top3["data"]] == list(expected.index)
+
+    total = answer_locally("What is the total Sales?", df, profile)
+    assert np.isclose(total["data"][0]["Sales"], df["Sales"].sum())
+
+    filtered = answer_locally("total sales for consumer in france", df, profile)
+    mask = (df["Segment"] == "Consumer") & (df["Country"] == "France")
+    assert np.isclose(filtered["data"][0]["Sales"], df.loc[mask, "Sales"].sum())
+    assert "where Segment = Consumer and Country = France" in filtered["answer"]
+
+    counts = answer_locally("How many orders per Country?", df, profile)
+    assert {r["Country"]: r["rows"] for r in counts["data"]} == df["Country"].value_counts().to_dict()
+
+    lowest = answer_locally("What is the lowest Profit for Consumer?", df, profile)
+    assert lowest["data"][0]["Profit"] == df.loc[df["Segment"] == "Consumer", "Profit"].min()
+
+    compared = answer_locally("Compare Sales and Profit.", df, profile)
+    assert [r["column"] for r in compared["data"]] == ["Sales", "Profit", "correlation"]
+
+
+def test_answer_query_answers_locally_without_llm():
+    df = _sales(300)
+    answer = answer_query("What is the average Sales per Segment?", df)
+    assert answer["intent"] == "group" and answer["chart"] is None
+    assert answer["summary"].startswith("Average Sales by Segment: ")
+    assert len(answer["data"]) == 3
+
+    # Unparsed questions still take the LLM (or fallback) path
+    assert "intent" not in answer_query("What's the weather like?", df)
+
+
+def _cleaned_sales(n=3000):
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame({
+        "Product": rng.choice(["Velo", "Paseo", "Amarilla", "Carretera"], n, p=[0.1, 0.5, 0.2, 0.2]),
+        "Segment": rng.choice(["Consumer", "Corporate"], n),
+        "Quarter": rng.choice(["1", "2", "3", "4"], n),
+        "Churn": rng.choice(["Yes", "No"], n),
+        "Discount Band": rng.choice(["None", "Low", "High"], n),
+        "Sales": rng.gamma(2, 50, n),
+        "Year": rng.choice([2013, 2014], n),
+    })
+    optimized, _ = optimize_dtypes(df)
+    assert isinstance(optimized["Product"].dtype, pd.CategoricalDtype)
+    return df, optimized
+
+
+def test_filtered_answers_on_categorical_frames_keep_their_labels():
+    plain, df = _cleaned_sales()
+    profile = build_profile(df)
+    mask = plain["Segment"] == "Consumer"
+    expected = plain[mask].groupby("Product")["Sales"].sum().sort_values(ascending=False)
+
+    top = answer_locally("Which Product has the highest Sales for Consumer?", df, profile)
+    assert top["data"][0]["Product"] == expected.index[0] == "Paseo"
+    assert np.isclose(top["data"][0]["Sales"], expected.iloc[0])
+
+    counts = answer_locally("How many rows per Product for Consumer?", df, profile)
+    assert {r["Product"]: r["rows"] for r in counts["data"]} == plain[mask]["Product"].value_counts().to_dict()
+
+
+def test_numbers_and_common_words_are_not_taken_as_filters():
+    _, df = _cleaned_sales()
+    assert parse_query("top 3 Product by Sales", df).filters == ()
+    assert parse_query("total Sales for year 2", df) is None  # a number it cannot place
+    assert parse_query("How many products have no sales?", df) is None
+    assert parse_query("compare Low and High discount band", df) is None
+    compared = parse_query("compare Low and High discount band by Sales", df)
+    assert compared.filters == (("Discount Band", ("Low", "High")),)
+
+    # ... unless they follow a filter word or their column's name
+    assert parse_query("total Sales where Quarter = 3", df).filters == (("Quarter", ("3",)),)
+    assert parse_query("total Sales in Quarter 2", df).filters == (("Quarter", ("2",)),)
+    churned = parse_query("How many rows where Churn is No?", df)
+    assert (churned.op, churned.filters) == ("aggregate", (("Churn", ("No",)),))
+
+
+def test_conditions_the_parser_cannot_express_go_to_the_llm():
+    df = _sales(500)
+    df["Country"] = df["Country"].replace({"Spain": "Germany"})
+    df["Quantity"] = np.arange(len(df)) % 9
+    df["Order Date"] = pd.date_range("2020-01-01", periods=len(df), freq="D")
+    profile = build_profile(df)
+
+    for question in [
+        "What is the total Sales in 2020?",
+        "Total Sales where Quantity > 5",
+        "total Sales for orders above 500",
+        "average Profit last month",
+        "Which Segment had the highest Sales in Germany in 2021?",
+        "average Sales of the top 10 orders",
+    ]:
+        assert parse_query(question, df, profile) is None, question
+        assert answer_locally(question, df, profile) is None, question
+        assert route_question(question, df, profile).kind != "query", question
+
+    # Without the unparsed condition they still answer locally
+    assert parse_query("Which Segment had the highest Sales in Germany?", df, profile).filters == (
+        ("Country", ("Germany",)),
+    )
+    assert parse_query("What is the total Sales?", df, profile) is not None
+
+
+def test_ask_answers_stored_datasets_in_process_and_routes_once(monkeypatch):
+    import backend.routes.chat as chat
+    import backend.utils.ai_chat_engine as engine
+    from fastapi.testclient import TestClient
+    from backend.main import app
+
+    client = TestClient(app)
+    csv = b"Department,Salary\nSales,50000\nIT,72000\nIT,68000\nHR,45000\n"
+    dataset_id = client.post("/api/upload", files={"file": ("staff.csv", csv, "text/csv")}).json()["dataset_id"]
+
+    def unexpected(*args, **kwargs):
+        raise AssertionError("should not be called")
+
+    monkeypatch.setattr(chat, "run_cpu", unexpected)  # no pickling to a worker
+    monkeypatch.setattr(engine, "route_question", unexpected)  # the route's intent is reused
+    monkeypatch.setattr(chat, "generate_speech", lambda text: None)
+
+    body = client.post("/api/ask", json={"question": "Which Department has the highest Salary?",
+                                         "dataset_id": dataset_id}).json()
+    assert body["response"]["summary"].startswith("IT has the highest total Salary")
+
+    # Charts are planned in-process too (URL building is not under test)
+    monkeypatch.setattr(chat, "build_quickchart_url", lambda item, *a, **kw: "https://quickchart.io/x")
+    charts = client.post("/api/ask", json={"question": "Plot Salary by Department",
+                                           "dataset_id": dataset_id}).json()
+    assert charts["type"] == "charts" and charts["charts"]
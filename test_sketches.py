@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+from backend.utils.column_profile import build_profile
+from backend.utils.data_cleaner import clean_dataset_streaming
+from backend.utils.sketches import DatasetSketch, HeavyHitters, HyperLogLog, QuantileSketch
+
+rng = np.random.default_rng(7)
+
+
+def test_sketches_merge_within_documented_bounds():
+    values = pd.Series(rng.integers(0, 50_000, 200_000))
+    halves = [values.iloc[:100_000], values.iloc[100_000:]]
+
+    hll_a, hll_b = HyperLogLog(), HyperLogLog()
+    hll_a.update(halves[0])
+    hll_b.update(halves[1])
+    hll_a.merge(hll_b)
+    true_distinct = values.nunique()
+    assert abs(hll_a.estimate() - true_distinct) / true_distinct < 3 * hll_a.relative_error
+
+    q_a, q_b = QuantileSketch(seed=1), QuantileSketch(seed=2)
+    q_a.update(halves[0])
+    q_b.update(halves[1])
+    q_a.merge(q_b)
+    median = q_a.quantiles([0.5])[0.5]
+    assert abs((values < median).mean() - 0.5) < 0.02
+    assert sum(len(level) for level in q_a.levels) < 2_000
+
+    words = pd.Series(["a"] * 500 + ["b"] * 300 + [f"w{i}" for i in range(200)])
+    hh = HeavyHitters(capacity=8)
+    for start in range(0, len(words), 100):
+        hh.update(words.iloc[start:start + 100])
+    top = hh.top(2)
+    assert [t["value"] for t in top] == ["a", "b"]
+    assert all(t["count"] >= true - len(words) / 9 for t, true in zip(top, (500, 300)))
+
+
+def test_streamed_profile_uses_ingestion_sketch():
+    df = pd.DataFrame({
+        "Region": rng.choice(["N", "S", "E"], 30_000),
+        "Sales": rng.normal(100, 10, 30_000),
+    })
+    chunks = [df.iloc[i:i + 5_000] for i in range(0, len(df), 5_000)]
+
+    sketch = DatasetSketch()
+    cleaned, _ = clean_dataset_streaming(chunks, sketch=sketch)
+    profile = build_profile(cleaned, sketch=sketch)
+
+    assert profile["approximate"] is True
+    assert profile["error_bounds"]["distinct_relative_error"] > 0
+    assert profile["columns"]["Region"]["distinct"] == 3
+    assert profile["columns"]["Region"]["top"][0]["count"] == df["Region"].value_counts().iloc[0]
+    assert abs(profile["columns"]["Sales"]["quantiles"]["0.5"] - 100) < 1
@@ -0,0 +1,116 @@
+import pandas as pd
+from fastapi.testclient import TestClient
+from backend.main import app
+from backend.utils import ingestion
+from backend.utils.data_cleaner import clean_dataset_streaming
+from backend.utils.ingestion import (
+    concat_chunks,
+    iter_json_array_chunks,
+    iter_ndjson_chunks,
+    iter_xml_chunks,
+    read_xml,
+)
+
+client = TestClient(app)
+
+
+def test_streaming_cleaner_dedupes_across_chunks():
+    chunk_a = pd.DataFrame({"Country": ["Chile", None], "Sales": [10.0, None]})
+    chunk_b = pd.DataFrame({"Country": ["Chile", "Peru"], "Sales": [10.0, 30.0]})
+
+    df, report = clean_dataset_streaming([chunk_a, chunk_b])
+
+    assert report["chunks_processed"] == 2
+    assert report["duplicates_removed"] == 1
+    assert report["missing_filled"] == 2
+    assert df["Sales"].tolist() == [10.0, 20.0, 30.0]
+    assert df["Country"].tolist() == ["Chile", "Unknown", "Peru"]
+
+
+def test_stream_upload_has_no_row_cap():
+    csv = "Id,Sales\n" + "".join(f"{i},{i * 2}\n" for i in range(12000))
+
+    res = client.post(
+        "/api/upload?stream=true",
+        files={"file": ("big.csv", csv.encode(), "text/csv")},
+    ).json()
+
+    assert res["rows"] == 12000
+    assert len(res["preview"]) == 20
+
+
+def test_xml_reader_streams_records(tmp_path):
+    path = tmp_path / "people.xml"
+    path.write_text(
+        "<rows>"
+        "<row><Name>Ana</Name><Salary>100</Salary></row>"
+        "<row><Name>Bo</Name><Dept>HR</Dept></row>"
+        "<row><Name>Cy</Name></row>"
+        "</rows>"
+    )
+
+    chunks = list(iter_xml_chunks(str(path), chunk_rows=2))
+    assert [len(c) for c in chunks] == [2, 1]
+
+    df = read_xml(str(path), max_rows=2)
+    assert df.columns.tolist() == ["Name", "Salary", "Dept"]
+    assert df["Name"].tolist() == ["Ana", "Bo"]
+    assert df["Salary"].isna().tolist() == [False, True]
+    assert df["Dept"].isna().tolist() == [True, False]
+
+
+def test_json_array_and_ndjson_stop_at_row_limit(tmp_path):
+    array_path = tmp_path / "events.json"
+    array_path.write_text('[{"user": "a", "clicks": 1},\n {"user": "b"}, {"user": "c", "clicks": 3}]')
+    ndjson_path = tmp_path / "events.jsonl"
+    ndjson_path.write_text('{"user": "a", "clicks": 1}\n\n{"user": "b"}\n{"user": "c", "clicks": 3}\n')
+
+    for chunks in (
+        iter_json_array_chunks(str(array_path), chunk_rows=1, max_rows=2),
+        iter_ndjson_chunks(str(ndjson_path), chunk_rows=1, max_rows=2),
+    ):
+        df = concat_chunks(chunks)
+        assert df["user"].tolist() == ["a", "b"]
+        assert df["clicks"].isna().tolist() == [False, True]
+
+
+def test_ndjson_upload():
+    body = "".join(f'{{"event": "click", "value": {i}}}\n' for i in range(30))
+
+    res = client.post(
+        "/api/upload",
+        files={"file": ("events.jsonl", body.encode(), "application/x-ndjson")},
+    ).json()
+
+    assert res["rows"] == 30
+    assert res["columns"] == ["event", "value"]
+
+
+def test_excel_reads_every_sheet(tmp_path, monkeypatch):
+    path = str(tmp_path / "book.xlsx")
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        pd.DataFrame({"Product": ["A", "B"], "Sales": [10, 20]}).to_excel(writer, sheet_name="Sales", index=False)
+        pd.DataFrame({"Name": ["Ana"], "Salary": [100]}).to_excel(writer, sheet_name="Staff", index=False)
+
+    # Exercise the read-only openpyxl path even when calamine is installed
+    monkeypatch.setattr(ingestion, "excel_engine", lambda p: "openpyxl")
+    sheets = ingestion.read_excel_sheets(path, max_rows=1)
+
+    assert [s["name"] for s in sheets] == ["Sales", "Staff"]
+    assert sheets[0]["df"].to_dict("records") == [{"Product": "A", "Sales": 10}]
+    assert sheets[1]["df"].columns.tolist() == ["Name", "Salary"]
+    assert all(s["parse_seconds"] >= 0 for s in sheets)
+
+
+def test_large_upload_spills_to_disk(monkeypatch):
+    from backend.routes import upload
+
+    monkeypatch.setattr(upload, "UPLOAD_SPOOL_MAX_BYTES", 16)
+    csv = "Id,Region\n" + "".join(f"{i},North\n" for i in range(50))
+
+    res = client.post(
+        "/api/upload",
+        files={"file": ("spilled.csv", csv.encode(), "text/csv")},
+    ).json()
+
+    assert res["rows"] == 50
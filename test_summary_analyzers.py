@@ -0,0 +1,72 @@
+import time
+
+import pandas as pd
+
+from backend.utils import summary_analyzers
+from backend.utils.summary_analyzers import (
+    Analyzer, detect_type, match_columns, register_analyzer, summarize,
+)
+
+
+def test_single_matcher_keeps_detection_order():
+    assert match_columns(["Subscription Date", "Sub Total"]) == (
+        {"customer", "education", "time_series"}, {"education"}
+    )
+    assert match_columns(["Order Date", "Sales"])[0] == {"business", "time_series"}
+
+    df = pd.DataFrame({"Employee": ["a", "b"], "Sales": [1.0, 2.0]})
+    assert detect_type(df) == "business"
+    assert detect_type(pd.DataFrame({"x": [1.0], "y": [2.0], "z": [3.0]})) == "measurements"
+    assert detect_type(pd.DataFrame({"x": ["a"]})) == "generic"
+
+
+def test_prefix_trigger_claims_summary_before_detected_type():
+    df = pd.DataFrame({"Sales": [10.0, 20.0, 30.0], "Sub Math": [50.0, 90.0, 30.0]})
+    text, info = summarize(df)
+    assert info["dataset_type"] == "business"
+    assert info["analyzer"] == "education"
+    assert text.startswith("The dataset represents academic performance data for 3 students")
+
+
+def test_budget_returns_partial_summary(monkeypatch):
+    def slow(ctx):
+        time.sleep(0.05)
+        return "Slow insight."
+
+    def never(ctx):
+        raise AssertionError("ran after the budget was spent")
+
+    analyzer = Analyzer(
+        "slow_test", priority=1, keywords=["slowcol"],
+        insights=[slow, never], closing="Done.",
+    )
+    monkeypatch.setattr(summary_analyzers, "ANALYZERS", dict(summary_analyzers.ANALYZERS))
+    register_analyzer(analyzer)
+    try:
+        text, info = summarize(pd.DataFrame({"slowcol": [1, 2]}), budget_seconds=0.01)
+    finally:
+        monkeypatch.undo()
+        summary_analyzers._matcher = None
+        summary_analyzers._match_names.cache_clear()
+
+    assert text == "Slow insight. Done."
+    assert info["truncated"] and info["skipped"] == ["never"]
+
+
+def test_category_columns_break_count_ties_like_the_raw_text():
+    from backend.utils.data_cleaner import clean_dataset
+
+    # Ops and Eng tie on headcount; Ops appears first
+    raw = pd.DataFrame({
+        "Employee ID": range(20),
+        "Department": ["Ops", "Eng", "HR", "Ops", "Eng"] * 4,
+        "Gender": ["F", "M"] * 10,
+        "Salary": [50000.0 + 1000 * i for i in range(20)],
+    })
+    cleaned, _ = clean_dataset(raw)
+    assert isinstance(cleaned["Department"].dtype, pd.CategoricalDtype)
+
+    baseline, _ = summarize(raw)
+    summary, _ = summarize(cleaned)
+    assert "Ops as the largest department" in baseline
+    assert "Ops as the largest department" in summary
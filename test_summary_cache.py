@@ -0,0 +1,74 @@
+import pandas as pd
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.utils.summary_cache import SummaryCache, dataset_fingerprint, summary_cache
+
+client = TestClient(app)
+
+rows = [
+    {"Segment": "Consumer", "Country": "France", "Sales": 120.0, "Profit": 12.0},
+    {"Segment": "Corporate", "Country": "Spain", "Sales": 80.0, "Profit": -3.0},
+    {"Segment": "Consumer", "Country": "France", "Sales": 95.5, "Profit": 7.0},
+]
+
+
+def test_fingerprint_tracks_schema_and_content():
+    df = pd.DataFrame(rows)
+    assert dataset_fingerprint(df) == dataset_fingerprint(df.copy())
+
+    changed = df.copy()
+    changed.loc[1, "Country"] = "Italy"
+    assert dataset_fingerprint(changed) != dataset_fingerprint(df)
+    assert dataset_fingerprint(df.astype({"Segment": "category"})) != dataset_fingerprint(df)
+    assert dataset_fingerprint(df.rename(columns={"Sales": "Revenue"})) != dataset_fingerprint(df)
+
+
+def test_repeated_summary_is_served_from_cache():
+    before = summary_cache.stats()
+
+    first = client.post("/api/summary", json={"preview": rows}).json()
+    second = client.post("/api/summary", json={"preview": rows}).json()
+    assert first["summary"] == second["summary"]
+
+    stats = client.get("/api/summary/cache").json()
+    assert stats["hits"] == before["hits"] + 1
+    assert stats["misses"] == before["misses"] + 1
+    assert 0 < stats["hit_rate"] <= 1
+
+
+def test_cache_is_bounded_and_expires(monkeypatch):
+    cache = SummaryCache(max_entries=2, max_bytes=1024, ttl_seconds=60)
+    cache.put("a", "one")
+    cache.put("b", "two")
+    assert cache.get("a") == "one"
+    cache.put("c", "three")  # evicts "b", the least recently used
+    assert cache.get("b") is None and cache.stats()["evictions"] == 1
+
+    import backend.utils.summary_cache as module
+    now = module.time.time()
+    monkeypatch.setattr(module.time, "time", lambda: now + 61)
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_summaries_from_sketched_profiles_are_kept_apart():
+    from backend.utils.ai_chat_engine import logical_summary
+    from backend.utils.column_profile import build_profile
+    from backend.utils.sketches import DatasetSketch
+    from backend.utils.summary_cache import summary_key
+
+    df = pd.DataFrame(rows * 40)
+    exact = build_profile(df)
+    sketched = build_profile(df, sketch=DatasetSketch.from_frame(df, 50))
+    assert sketched["approximate"] and not exact["approximate"]
+    assert summary_key(df, sketched) != summary_key(df, exact)
+    assert summary_key(df) == summary_key(df, exact)  # no stored profile: built exactly
+
+    summary_cache.clear()
+    _, info = logical_summary(df, sketched)
+    assert not info.get("cached")
+    _, info = logical_summary(df.copy(), exact)  # same data, exact profile: not the sketched entry
+    assert not info.get("cached")
+    _, info = logical_summary(df.copy(), sketched)
+    assert info.get("cached")
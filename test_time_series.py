@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+
+from backend.utils.summary_analyzers import summarize
+from backend.utils.time_series import analyze_time_series, autocorrelation, trend_slopes
+
+
+def _frame(days=1500):
+    rng = np.random.default_rng(0)
+    t = np.arange(days)
+    return pd.DataFrame({
+        "date": pd.date_range("2020-01-01", periods=days, freq="D"),
+        "Month": pd.date_range("2020-01-01", periods=days, freq="D").month,
+        "growth": 100 + 0.5 * t + rng.normal(scale=5, size=days),
+        "cycle": 50 + 10 * np.sin(2 * np.pi * t / 30) + rng.normal(scale=1, size=days),
+        "noise": 20 + rng.normal(size=days),
+    })
+
+
+def test_trend_slopes_match_polyfit_and_skip_gaps():
+    rng = np.random.default_rng(1)
+    Y = np.column_stack([3 * np.arange(50) + rng.normal(size=50), -np.arange(50.0)])
+    Y[5, 0] = np.nan
+
+    slope, intercept, r2 = trend_slopes(Y)
+
+    observed = ~np.isnan(Y[:, 0])
+    expected = np.polyfit(np.arange(50)[observed], Y[observed, 0], 1)
+    assert np.allclose([slope[0], intercept[0]], expected)
+    assert np.isclose(slope[1], -1) and np.isclose(r2[1], 1)
+
+
+def test_autocorrelation_matches_direct_sum():
+    R = np.random.default_rng(2).normal(size=(64, 2))
+    acf = autocorrelation(R)
+    direct = (R[:-5] * R[5:]).sum(axis=0) / (R ** 2).sum(axis=0)
+    assert np.allclose(acf[5], direct)
+
+
+def test_analysis_resamples_and_finds_trend_and_cycle():
+    analysis = analyze_time_series(_frame())
+
+    assert analysis["date_column"] == "date"
+    assert analysis["frequency"] == "day"
+    assert analysis["periods"] == 1500
+    assert "Month" not in analysis["columns"]
+
+    growth, cycle, noise = (analysis["columns"][c] for c in ("growth", "cycle", "noise"))
+    assert np.isclose(growth["slope"], 0.5, atol=0.01) and growth["r2"] > 0.95
+    assert cycle["period"] == 30 and cycle["seasonality"] > 0.8
+    assert noise["r2"] < 0.01 and noise["seasonality"] < 0.3
+
+
+def test_tall_data_is_resampled_to_coarser_buckets():
+    df = _frame(5000)
+    analysis = analyze_time_series(df)
+    assert analysis["frequency"] == "week"
+    assert analysis["periods"] == len(df.set_index("date").resample("W"))
+
+
+def test_time_series_summary_reports_all_columns():
+    text, info = summarize(_frame(), None)
+
+    assert info["dataset_type"] == "time_series"
+    assert "growth shows increasing trend" in text
+    assert "noise shows stable trend" in text
+    assert "Seasonal patterns detected in cycle (every ~30 days" in text
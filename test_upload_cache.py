@@ -0,0 +1,34 @@
+from fastapi.testclient import TestClient
+from backend.main import app
+from backend.utils.upload_cache import UploadCache
+
+client = TestClient(app)
+
+
+def test_reupload_is_served_from_cache():
+    csv = b"Country,Sales\nChile,10\nPeru,20\nCuba,30\n"
+
+    first = client.post("/api/upload", files={"file": ("a.csv", csv, "text/csv")}).json()
+    second = client.post("/api/upload", files={"file": ("b.csv", csv, "text/csv")}).json()
+
+    assert "from_cache" not in first
+    assert second["from_cache"] is True
+    assert second["filename"] == "b.csv"
+    assert second["dataset_id"] == first["dataset_id"]
+    assert client.get("/api/upload/cache").json()["hits"] >= 1
+
+
+def test_cache_evicts_by_entries_and_bytes():
+    cache = UploadCache(max_entries=2, max_bytes=200)
+
+    cache.put("a", {"dataset_id": "a"})
+    cache.put("b", {"dataset_id": "b"})
+    cache.put("c", {"dataset_id": "c"})
+    assert cache.get("a") is None
+    assert cache.get("c") == {"dataset_id": "c"}
+
+    cache.put("big", {"preview": "x" * 150})
+    stats = cache.stats()
+    assert stats["bytes"] <= 200
+    assert stats["evictions"] == 2
+    assert stats["hits"] == 1 and stats["misses"] == 1